@@ -0,0 +1,49 @@
+"""
+ルート共通の依存関係
+リクエストのテナントに対応するレジストリをキャッシュから取得する
+"""
+
+from typing import Iterator, Optional
+from fastapi import HTTPException, Request
+
+from modules.etsi_crawler.driver_pool import DriverPool
+from modules.etsi_crawler.query import DEFAULT_FETCH_MODE, ETSICrawler
+from modules.standards.cache import RegistryCache
+from modules.standards.registry import StandardRegistry
+
+# テナントを指定するヘッダー
+TENANT_HEADER = "X-Tenant-ID"
+
+# プロセス内で共有するレジストリキャッシュ
+registry_cache = RegistryCache.from_env()
+
+def get_tenant(request: Request) -> Optional[str]:
+    """パスプレフィックス（/t/{tenant}/api）またはヘッダーからテナントIDを取得"""
+    return request.path_params.get("tenant") or request.headers.get(TENANT_HEADER) or None
+
+def get_driver_pool(request: Request) -> Optional[DriverPool]:
+    """アプリケーションが管理するSeleniumドライバープールを取得（lifespan外ではNone）"""
+    return getattr(request.app.state, "driver_pool", None)
+
+def get_crawler(request: Request) -> Iterator[ETSICrawler]:
+    """
+    ETSI確認用のクローラー（HTTPで取得できない場合だけプールのブラウザーを使う）
+    
+    プールがない場合の専用のドライバーはリクエストの終了時に終了する
+    """
+    with ETSICrawler(fetch_mode=DEFAULT_FETCH_MODE, driver_pool=get_driver_pool(request),
+                     fetch_stats=getattr(request.app.state, "fetch_stats", None)) as crawler:
+        yield crawler
+
+def get_registry(request: Request) -> Iterator[StandardRegistry]:
+    """リクエストのテナントのレジストリを取得（リクエスト中はキャッシュから解放しない）"""
+    tenant = get_tenant(request)
+    try:
+        registry = registry_cache.acquire(tenant)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        yield registry
+    finally:
+        registry_cache.release(tenant)
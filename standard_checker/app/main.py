@@ -24,7 +24,7 @@ def create_directories():
     """必要なディレクトリを作成"""
     directories = [
         "data/input",
-        "data/output", 
+        "data/output",
         "data/logs"
     ]
     for dir_path in directories:
@@ -35,9 +35,15 @@ async def lifespan(app: FastAPI):
     """アプリケーションのライフサイクル管理"""
     # 起動時
     create_directories()
+    # ETSI確認用のSeleniumドライバープール（ドライバーは初回の確認時に起動）
+    app.state.driver_pool = DriverPool.from_env()
+    # ETSI確認の取得方法（requests / selenium）ごとの件数
+    app.state.fetch_stats = FetchStats()
     print("Standard_Version_Checker が起動しました")
     yield
-    # シャットダウン時
+    # シャットダウン時（未保存のレジストリを書き出し、ブラウザーを終了する）
+    registry_cache.close()
+    app.state.driver_pool.close()
     print("Standard_Version_Checker がシャットダウンしました")
 
 # アプリケーション初期化
@@ -62,9 +68,14 @@ templates = Jinja2Templates(directory="templates")
 
 # ルート設定
 from app.routes import main_routes, api_routes
+from app.dependencies import registry_cache
+from modules.etsi_crawler.driver_pool import DriverPool
+from modules.etsi_crawler.query import FetchStats
 
 app.include_router(main_routes.router)
 app.include_router(api_routes.router, prefix="/api")
+# テナント別API（X-Tenant-IDヘッダーの代わりにパスで指定）
+app.include_router(api_routes.router, prefix="/t/{tenant}/api")
 
 @app.get("/")
 async def root(request: Request):
@@ -72,9 +83,16 @@ async def root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """ヘルスチェック"""
-    return {"status": "healthy", "message": "Standard_Version_Checker is running"}
+    driver_pool = getattr(request.app.state, "driver_pool", None)
+    fetch_stats = getattr(request.app.state, "fetch_stats", None)
+    return {
+        "status": "healthy",
+        "message": "Standard_Version_Checker is running",
+        "driver_pool": driver_pool.stats() if driver_pool else None,
+        "etsi_fetch": fetch_stats.to_dict() if fetch_stats else None
+    }
 
 if __name__ == "__main__":
     uvicorn.run(
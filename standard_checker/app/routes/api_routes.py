@@ -2,9 +2,12 @@
 API ルート - REST API用のルート
 """
 
-from fastapi import APIRouter, File, UploadFile, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pathlib import Path
+from datetime import datetime
+from itertools import islice
 import sys
 from typing import List, Dict, Optional
 
@@ -13,12 +16,29 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from modules.pdf_parser.parser import PDFParser
-from modules.standards.registry import StandardRegistry
+from modules.standards.registry import StandardRegistry, StandardEntry
 from modules.etsi_crawler.query import ETSICrawler
-from modules.filter.filter import StandardFilter
+from modules.etsi_crawler.driver_pool import DriverPoolTimeout
+from modules.filter.filter import StandardFilter, CompiledFilter, select_top
+from modules.filter.query import compile_query
+from modules.filter.safe_regex import regex_budget, RegexBudgetExceeded
+from modules.filter.columnar import COLUMNAR_MIN_ROWS
+from modules.filter.planner import QueryPlanner
+from modules.filter.facets import FacetCounter, registry_facets
+from modules.export.exporter import StreamingExporter, batch_chunks
+from app.dependencies import get_crawler, get_registry
 
 router = APIRouter()
 
+# エクスポート形式とメディアタイプ
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+EXPORT_FORMAT_ALIASES = {"excel": "xlsx"}
+
 @router.post("/extract")
 async def extract_standards(file: UploadFile = File(...)):
     """PDFから標準規格を抽出"""
@@ -39,124 +59,414 @@ async def extract_standards(file: UploadFile = File(...)):
             "standards_count": len(standards),
             "standards": standards
         })
-        
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/standards")
-async def get_standards():
+async def get_standards(request: Request, registry: StandardRegistry = Depends(get_registry)):
     """登録された標準規格一覧を取得"""
     try:
-        registry = StandardRegistry()
+        etag = registry.get_etag()
+        
+        # 変更がなければ本文を返さない
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        
         standards = registry.get_all_standards()
         
         return JSONResponse(content={
             "status": "success",
             "count": len(standards),
+            "sequence": registry.sequence,
             "standards": standards
+        }, headers={"ETag": etag})
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/standards/suggest")
+async def suggest_standards(q: str = "", limit: int = 10, registry: StandardRegistry = Depends(get_registry)):
+    """標準規格番号の前方一致候補を取得（入力補完用）"""
+    try:
+        suggestions = registry.suggest(q, max(1, min(limit, 100)))
+        
+        return JSONResponse(content={
+            "status": "success",
+            "query": q,
+            "count": len(suggestions),
+            "standards": suggestions
+        })
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/search")
+async def search_standards(q: str = "", limit: int = 20, registry: StandardRegistry = Depends(get_registry)):
+    """番号・ETSIタイトルのあいまい検索（得点の高い順）"""
+    try:
+        results = registry.fuzzy_search(q, max(1, min(limit, 100)))
+        
+        return JSONResponse(content={
+            "status": "success",
+            "query": q,
+            "count": len(results),
+            "standards": results
+        })
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/changes")
+async def get_changes(since: int = 0, registry: StandardRegistry = Depends(get_registry)):
+    """指定シーケンス以降の変更を取得（差分同期用）"""
+    try:
+        feed = registry.get_changes(since)
+        
+        # 追加・更新は現在の内容を添付する
+        for change in feed["changes"]:
+            if change["op"] != "remove":
+                entry = registry.get_standard(change["id"])
+                change["standard"] = entry.to_dict() if entry else None
+        
+        return JSONResponse(content={
+            "status": "success",
+            **feed
+        }, headers={"ETag": registry.get_etag()})
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/history/changes")
+async def get_history_changes(
+    start: str,
+    end: Optional[str] = None,
+    field: Optional[str] = None,
+    registry: StandardRegistry = Depends(get_registry)
+):
+    """期間内にステータス・バージョンが遷移した標準規格を取得"""
+    try:
+        changed = registry.get_changed_standards(start, end or datetime.now().isoformat(), field)
+        
+        return JSONResponse(content={
+            "status": "success",
+            "count": len(changed),
+            "standards": changed
         })
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/history/as_of")
+async def get_history_as_of(date: str, registry: StandardRegistry = Depends(get_registry)):
+    """指定時点でのレジストリの状態を取得"""
+    try:
+        states = registry.get_state_as_of(date)
         
+        return JSONResponse(content={
+            "status": "success",
+            "as_of": date,
+            "count": len(states),
+            "standards": states
+        })
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/history/{standard_id}")
+async def get_standard_history(standard_id: str, registry: StandardRegistry = Depends(get_registry)):
+    """指定した標準規格の遷移履歴を取得"""
+    try:
+        return JSONResponse(content={
+            "status": "success",
+            "standard_id": standard_id,
+            "history": registry.get_status_history(standard_id)
+        })
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/etsi/{standard_number}")
-async def get_etsi_info(standard_number: str):
-    """指定された標準規格のETSI情報を取得"""
+async def get_etsi_info(standard_number: str, crawler: ETSICrawler = Depends(get_crawler)):
+    """指定された標準規格のETSI情報を取得（HTTPで取得できない場合だけプールのブラウザーを使う）"""
     try:
-        crawler = ETSICrawler()
-        etsi_info = crawler.search_standard(standard_number)
+        # 通信・ブラウザー操作はイベントループを止めないようスレッドプールで行う
+        etsi_info = await run_in_threadpool(crawler.search_standard, standard_number)
         
         return JSONResponse(content={
             "status": "success",
             "standard_number": standard_number,
             "etsi_info": etsi_info
         })
-        
+    
+    except DriverPoolTimeout as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/filter")
-async def filter_standards(
+def filter_standards(
     status: Optional[str] = None,
     directive: Optional[str] = None,
     date_start: Optional[str] = None,
-    date_end: Optional[str] = None
+    date_end: Optional[str] = None,
+    q: Optional[str] = None,
+    limit: Optional[int] = None,
+    order_by: Optional[str] = None,
+    registry: StandardRegistry = Depends(get_registry)
 ):
-    """標準規格をフィルタリング"""
+    """
+    標準規格をフィルタリング
+    
+    qにはクエリ言語の条件式を指定できる（他のパラメータとはANDで結合）
+    例: status = Active AND (directive contains RED OR NOT type in [IEC, ISO])
+    正規表現の評価でイベントループを止めないよう、同期関数としてスレッドプールで実行する
+    
+    limitは返す件数の上限。order_byを指定すると番号順の代わりにそのフィールドで並べる
+    （先頭に - を付けると降順、例: -last_updated）。並べ替えなしのlimitは
+    limit件に達した時点で評価を打ち切るため、ファセットは返さない
+    """
+    if limit is not None and limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be a positive integer")
+    
+    descending = bool(order_by) and order_by.startswith("-")
+    order_field = order_by.lstrip("-") if order_by else None
+    if order_field is not None and order_field not in StandardEntry.FIELDS:
+        raise HTTPException(status_code=400, detail=f"Unknown order_by field: {order_field}")
+    
+    query = None
+    if q:
+        try:
+            query = compile_query(q)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
     try:
-        registry = StandardRegistry()
-        all_standards = registry.get_all_standards()
-        
-        filter_obj = StandardFilter()
-        filtered_standards = filter_obj.apply_filters(
-            all_standards,
+        compiled = StandardFilter().compile(
             status=status,
             directive=directive,
             date_start=date_start,
             date_end=date_end
         )
         
+        # 比較のANDだけのクエリは通常の条件として実行計画に含める
+        if query is not None and query.conditions is not None:
+            compiled = CompiledFilter(compiled.conditions + query.conditions)
+            query = None
+        
+        # 副索引で候補を絞り込めない大きなレジストリは列指向ビューで評価（結果はいずれも同一）
+        plan = QueryPlanner(registry).plan(compiled)
+        with regex_budget():
+            if query is not None:
+                entries = (entry for entry in plan.iter_entries() if query.matches(entry))
+            else:
+                view = None
+                if not plan.uses_index and len(registry.standards) >= COLUMNAR_MIN_ROWS:
+                    view = registry.get_columnar_view()
+                entries = view.entries(compiled) if view is not None else plan.iter_entries()
+            
+            # 条件がない場合のファセットはレジストリの副索引から求め、それ以外は結果と同じ走査で数える
+            facets = None
+            counter = None
+            matched_count = None
+            if not compiled and query is None:
+                facets = registry_facets(registry)
+                matched_count = len(registry.standards)
+            elif limit is None or order_field is not None:
+                counter = FacetCounter()
+                entries = counter.iter(entries)
+            
+            if order_field is not None:
+                # 上位limit件だけをヒープで保持
+                entries = select_top(entries, limit or len(registry.standards), order_field, descending)
+            elif limit is not None:
+                # 打ち切りの有無を知るため1件多く取得
+                entries = islice(entries, limit + 1)
+            filtered_standards = [entry.to_dict() for entry in entries]
+            
+            if counter is not None:
+                facets = counter.to_dict()
+                matched_count = counter.total
+        
+        truncated = limit is not None and (
+            len(filtered_standards) > limit if matched_count is None else matched_count > limit
+        )
+        del filtered_standards[limit or len(filtered_standards):]
+        
         return JSONResponse(content={
             "status": "success",
-            "total_count": len(all_standards),
-            "filtered_count": len(filtered_standards),
+            "total_count": len(registry.standards),
+            "filtered_count": len(filtered_standards) if matched_count is None else matched_count,
+            "truncated": truncated,
+            "facets": facets,
             "standards": filtered_standards
         })
-        
+    
+    except RegexBudgetExceeded as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/views")
+async def list_views(registry: StandardRegistry = Depends(get_registry)):
+    """保存フィルタービューの一覧（件数付き）を取得"""
+    try:
+        return JSONResponse(content={
+            "status": "success",
+            "views": registry.get_view_manager().list_views()
+        })
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/views")
+async def define_view(
+    name: str,
+    status: Optional[str] = None,
+    directive: Optional[str] = None,
+    type: Optional[str] = None,
+    source: Optional[str] = None,
+    date_start: Optional[str] = None,
+    date_end: Optional[str] = None,
+    q: Optional[str] = None,
+    registry: StandardRegistry = Depends(get_registry)
+):
+    """
+    保存フィルタービューを定義（同名のビューは置き換え）
+    
+    条件は /api/filter と同じ（qのクエリ言語の条件式と他のパラメータはANDで結合）
+    """
+    filters = {
+        "status": status,
+        "directive": directive,
+        "type": type,
+        "source": source,
+        "date_start": date_start,
+        "date_end": date_end
+    }
+    
+    try:
+        view = registry.get_view_manager().define(name, filters, q)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return JSONResponse(content={
+        "status": "success",
+        "view": view.describe()
+    })
+
+@router.get("/views/{name}")
+async def get_view(name: str, registry: StandardRegistry = Depends(get_registry)):
+    """保存フィルタービューの標準規格を取得"""
+    try:
+        views = registry.get_view_manager()
+        view = views.get(name)
+        standards = views.contents(name) if view is not None else None
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if view is None:
+        raise HTTPException(status_code=404, detail="View not found")
+    return JSONResponse(content={
+        "status": "success",
+        "view": view.describe(),
+        "standards": standards
+    })
+
+@router.delete("/views/{name}")
+async def delete_view(name: str, registry: StandardRegistry = Depends(get_registry)):
+    """保存フィルタービューを削除"""
+    try:
+        removed = registry.get_view_manager().remove(name)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    if not removed:
+        raise HTTPException(status_code=404, detail="View not found")
+    return JSONResponse(content={
+        "status": "success",
+        "message": f"View {name} deleted successfully"
+    })
 
 @router.delete("/standards/{standard_id}")
-async def delete_standard(standard_id: str):
+async def delete_standard(standard_id: str, registry: StandardRegistry = Depends(get_registry)):
     """標準規格を削除"""
     try:
-        registry = StandardRegistry()
         success = registry.remove_standard(standard_id)
         
         if success:
+            registry.save_data()
             return JSONResponse(content={
                 "status": "success",
                 "message": f"Standard {standard_id} deleted successfully"
             })
         else:
             raise HTTPException(status_code=404, detail="Standard not found")
-            
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/export/{format}")
-async def export_standards(format: str):
-    """標準規格データをエクスポート"""
+async def export_standards(
+    format: str,
+    status: Optional[str] = None,
+    directive: Optional[str] = None,
+    type: Optional[str] = None,
+    source: Optional[str] = None,
+    date_start: Optional[str] = None,
+    date_end: Optional[str] = None,
+    ids: Optional[str] = None,
+    columns: Optional[str] = None,
+    registry: StandardRegistry = Depends(get_registry)
+):
+    """標準規格データをファイルとしてストリーミングでエクスポート"""
+    export_format = EXPORT_FORMAT_ALIASES.get(format.lower(), format.lower())
+    if export_format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Unsupported format")
+    
+    # 出力列の指定（カンマ区切り）
+    selected_columns = [c.strip() for c in columns.split(",") if c.strip()] if columns else StandardEntry.FIELDS
+    unknown_columns = [c for c in selected_columns if c not in StandardEntry.FIELDS]
+    if unknown_columns:
+        raise HTTPException(status_code=400, detail=f"Unknown columns: {', '.join(unknown_columns)}")
+    
     try:
-        registry = StandardRegistry()
-        standards = registry.get_all_standards()
-        
-        if format.lower() == "csv":
-            # CSV形式でエクスポート
-            import csv
-            from io import StringIO
-            
-            output = StringIO()
-            writer = csv.DictWriter(output, fieldnames=["number", "version", "status", "directive"])
-            writer.writeheader()
-            for standard in standards:
-                writer.writerow(standard)
-            
-            return JSONResponse(content={
-                "status": "success",
-                "format": "csv",
-                "data": output.getvalue()
-            })
+        if ids:
+            # 指定したIDも番号の自然順で出力（重複は1件にする）
+            selected = dict.fromkeys(i.strip() for i in ids.split(","))
+            rows = (entry.to_dict() for entry in registry.entries_in_order(selected))
+        else:
+            rows = registry.iter_standards()
         
-        elif format.lower() == "json":
-            return JSONResponse(content={
-                "status": "success",
-                "format": "json",
-                "data": standards
-            })
+        rows = StandardFilter().iter_filters(
+            rows,
+            status=status,
+            directive=directive,
+            type=type,
+            source=source,
+            date_start=date_start,
+            date_end=date_end
+        )
         
+        exporter = StreamingExporter(columns=selected_columns)
+        if export_format == "csv":
+            body = batch_chunks(exporter.iter_csv(rows))
+        elif export_format == "json":
+            body = batch_chunks(exporter.iter_json(rows))
+        elif export_format == "ndjson":
+            body = batch_chunks(exporter.iter_ndjson(rows))
         else:
-            raise HTTPException(status_code=400, detail="Unsupported format")
-            
+            body = exporter.iter_xlsx({"Standards": rows})
+        
+        filename = f"standards_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+        
+        return StreamingResponse(
+            body,
+            media_type=EXPORT_MEDIA_TYPES[export_format],
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
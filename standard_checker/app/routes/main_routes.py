@@ -2,9 +2,10 @@
 メインルート - Web UI用のルート
 """
 
-from fastapi import APIRouter, Request, File, UploadFile, Form
+from fastapi import APIRouter, Depends, Request, File, UploadFile, Form
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
+from starlette.concurrency import run_in_threadpool
 from pathlib import Path
 import sys
 
@@ -14,7 +15,10 @@ sys.path.insert(0, str(project_root))
 
 from modules.pdf_parser.parser import PDFParser
 from modules.standards.registry import StandardRegistry
+from modules.standards.canonical import sort_key_for
 from modules.etsi_crawler.query import ETSICrawler
+from modules.filter.facets import FacetCounter, registry_facets
+from app.dependencies import get_crawler, get_registry
 
 router = APIRouter()
 templates = Jinja2Templates(directory="app/templates")
@@ -24,13 +28,17 @@ async def index(request: Request):
     """トップページ"""
     return templates.TemplateResponse("index.html", {"request": request})
 
-@router.get("/upload", response_class=HTMLResponse) 
+@router.get("/upload", response_class=HTMLResponse)
 async def upload_page(request: Request):
     """アップロードページ"""
     return templates.TemplateResponse("upload.html", {"request": request})
 
 @router.post("/upload")
-async def upload_file(request: Request, file: UploadFile = File(...)):
+async def upload_file(
+    request: Request,
+    file: UploadFile = File(...),
+    registry: StandardRegistry = Depends(get_registry)
+):
     """PDFファイルのアップロード処理"""
     try:
         # ファイル保存
@@ -43,17 +51,19 @@ async def upload_file(request: Request, file: UploadFile = File(...)):
         parser = PDFParser()
         standards = parser.extract_standards_from_pdf(file_path)
         
-        # 標準レジストリに登録
-        registry = StandardRegistry()
-        for standard in standards:
+        # 標準レジストリに登録（登録と同じ走査でファセットを集計）
+        counter = FacetCounter()
+        for standard in counter.iter(standards):
             registry.add_standard(standard)
+        registry.save_data()
         
         return templates.TemplateResponse("results.html", {
             "request": request,
-            "standards": standards,
+            "standards": sorted(standards, key=sort_key_for),
+            "facets": counter.to_dict(),
             "filename": file.filename
         })
-        
+    
     except Exception as e:
         return templates.TemplateResponse("error.html", {
             "request": request,
@@ -61,14 +71,15 @@ async def upload_file(request: Request, file: UploadFile = File(...)):
         })
 
 @router.get("/results", response_class=HTMLResponse)
-async def results_page(request: Request):
+async def results_page(request: Request, registry: StandardRegistry = Depends(get_registry)):
     """結果表示ページ"""
-    registry = StandardRegistry()
     standards = registry.get_all_standards()
     
     return templates.TemplateResponse("results.html", {
         "request": request,
-        "standards": standards
+        "standards": standards,
+        "facets": registry_facets(registry),
+        "saved_views": registry.get_view_manager().list_views()
     })
 
 @router.get("/etsi_check", response_class=HTMLResponse)
@@ -77,18 +88,18 @@ async def etsi_check_page(request: Request):
     return templates.TemplateResponse("etsi_check.html", {"request": request})
 
 @router.post("/etsi_check")
-async def etsi_check_process(request: Request, standard_number: str = Form(...)):
-    """ETSI確認処理"""
+async def etsi_check_process(request: Request, standard_number: str = Form(...),
+                             crawler: ETSICrawler = Depends(get_crawler)):
+    """ETSI確認処理（HTTPで取得できない場合だけプールのブラウザーを使う）"""
     try:
-        crawler = ETSICrawler()
-        etsi_info = crawler.search_standard(standard_number)
+        etsi_info = await run_in_threadpool(crawler.search_standard, standard_number)
         
         return templates.TemplateResponse("etsi_results.html", {
             "request": request,
             "standard_number": standard_number,
             "etsi_info": etsi_info
         })
-        
+    
     except Exception as e:
         return templates.TemplateResponse("error.html", {
             "request": request,
@@ -0,0 +1,293 @@
+"""
+Seleniumドライバープール
+起動済みのヘッドレスChromeを使い回し、対話的なETSI確認ごとのブラウザー起動を省く
+"""
+
+import os
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, Optional, Tuple
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# 同時に起動しておくドライバー数の既定値
+DEFAULT_POOL_SIZE = 2
+
+# 1つのドライバーを使い回す回数の上限（超えたら作り直す）
+DEFAULT_MAX_USES = 50
+
+# ドライバーの貸し出しを待つ時間の既定値（秒）
+DEFAULT_CHECKOUT_TIMEOUT = 30.0
+
+# ページ読み込みの待ち時間（秒、超えるとdriver.getがTimeoutExceptionを送出）
+PAGE_LOAD_TIMEOUT = float(os.getenv("ETSI_PAGE_LOAD_TIMEOUT", "30"))
+
+# 軽量モードで名前解決を許可するホスト（それ以外のホストへの通信は失敗させる）
+FIRST_PARTY_HOSTS = ('etsi.org', '*.etsi.org')
+
+# 軽量モードで読み込まないリソース（画像・スタイルシート・フォント・動画）
+BLOCKED_URL_PATTERNS = (
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.bmp',
+    '*.css', '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm',
+)
+
+
+def chrome_options(lightweight: bool = False, user_data_dir: Optional[Path] = None,
+                   first_party_hosts: Tuple[str, ...] = FIRST_PARTY_HOSTS) -> Options:
+    """
+    ヘッドレスChromeの起動オプション
+    
+    Args:
+        lightweight: 結果の表のHTMLだけを得るための軽量モード
+                     （DOM構築の完了で読み込みを終え、画像・スタイルシート・フォントと
+                     他ホストのスクリプト等を読み込まない）
+        user_data_dir: プロファイル（キャッシュを含む）のディレクトリ（実行をまたいで再利用）
+        first_party_hosts: 軽量モードで通信を許可するホスト
+    """
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--window-size=1920,1080')
+    
+    if user_data_dir is not None:
+        Path(user_data_dir).mkdir(parents=True, exist_ok=True)
+        options.add_argument(f'--user-data-dir={Path(user_data_dir).resolve()}')
+    
+    if lightweight:
+        options.page_load_strategy = 'eager'
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        # 他ホストの名前解決を失敗させる（IPアドレス指定の通信は対象外）
+        excluded = ', '.join(f'EXCLUDE {host}' for host in first_party_hosts)
+        options.add_argument(f'--host-resolver-rules=MAP * ~NOTFOUND, {excluded}')
+    
+    return options
+
+
+def create_chrome_driver(lightweight: bool = False, user_data_dir: Optional[Path] = None) -> webdriver.Chrome:
+    """
+    ヘッドレスChromeドライバーを起動
+    
+    暗黙の待機は設定しない（要素の待機は呼び出し側で条件を指定して行う）
+    """
+    driver = webdriver.Chrome(options=chrome_options(lightweight, user_data_dir))
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    
+    if lightweight:
+        # 拡張子でのリソースの遮断（同じホストのスタイルシート・フォントも対象）
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(BLOCKED_URL_PATTERNS)})
+    return driver
+
+
+class DriverPoolTimeout(TimeoutError):
+    """貸し出し待ちの時間内にドライバーが空かなかった"""
+
+
+class PooledDriver:
+    """プールが管理するドライバーと利用回数"""
+    
+    __slots__ = ('driver', 'uses', 'slot')
+    
+    def __init__(self, driver, slot: int):
+        self.driver = driver
+        self.uses = 0
+        # 起動枠の番号（プロファイルのディレクトリを同時に使うドライバーで分ける）
+        self.slot = slot
+
+
+class DriverPool:
+    """
+    Seleniumドライバーのプール
+    
+    ドライバーは初回の貸し出し時に起動し、最大size個まで増やす。
+    貸し出し時に応答を確認し、応答しないドライバーやmax_uses回使ったドライバー、
+    利用中にWebDriverException（タイムアウトを除く）を送出したドライバーは終了して作り直す
+    """
+    
+    def __init__(self, size: int = DEFAULT_POOL_SIZE, max_uses: int = DEFAULT_MAX_USES,
+                 checkout_timeout: float = DEFAULT_CHECKOUT_TIMEOUT,
+                 factory: Callable = create_chrome_driver,
+                 lightweight: bool = False, profile_dir: Optional[Path] = None):
+        """
+        Args:
+            size: 同時に起動しておくドライバー数の上限
+            max_uses: 1つのドライバーを使い回す回数の上限
+            checkout_timeout: ドライバーの貸し出しを待つ時間（秒）
+            factory: ドライバーを起動する関数（lightweight, user_data_dirを受け取る）
+            lightweight: 軽量モードで起動するか
+            profile_dir: プロファイルの親ディレクトリ（起動枠ごとにdriver-<番号>を使う）
+        """
+        self.logger = logging.getLogger(__name__)
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.checkout_timeout = checkout_timeout
+        self.factory = factory
+        self.lightweight = lightweight
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        
+        self._idle: Deque[PooledDriver] = deque()
+        self._count = 0
+        self._free_slots = set(range(self.size))
+        self._closed = False
+        self._condition = threading.Condition()
+        
+        self.checkouts = 0
+        self.started = 0
+        self.recycled = 0
+    
+    @classmethod
+    def from_env(cls) -> "DriverPool":
+        """環境変数から設定を読み込んで生成"""
+        return cls(
+            size=int(os.getenv("ETSI_DRIVER_POOL_SIZE", str(DEFAULT_POOL_SIZE))),
+            max_uses=int(os.getenv("ETSI_DRIVER_MAX_USES", str(DEFAULT_MAX_USES))),
+            checkout_timeout=float(os.getenv("ETSI_DRIVER_CHECKOUT_TIMEOUT", str(DEFAULT_CHECKOUT_TIMEOUT))),
+            lightweight=os.getenv("ETSI_BROWSER_LIGHTWEIGHT", "0").lower() in ("1", "true", "yes"),
+            profile_dir=os.getenv("ETSI_BROWSER_PROFILE_DIR") or None
+        )
+    
+    def checkout(self, timeout: Optional[float] = None) -> PooledDriver:
+        """
+        ドライバーを借りる（使用後はcheckinで返す）
+        
+        Raises:
+            DriverPoolTimeout: 待ち時間内にドライバーが空かなかった場合
+            RuntimeError: プールが閉じられている場合
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        
+        while True:
+            with self._condition:
+                while not self._idle and self._count >= self.size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise DriverPoolTimeout(f"ドライバーの貸し出し待ちがタイムアウトしました（{timeout}秒）")
+                    self._condition.wait(remaining)
+                
+                if self._closed:
+                    raise RuntimeError("ドライバープールは閉じられています")
+                
+                pooled = self._idle.popleft() if self._idle else None
+                if pooled is None:
+                    # 起動枠を確保してからロックの外で起動する（起動には数秒かかる）
+                    self._count += 1
+                    slot = min(self._free_slots)
+                    self._free_slots.discard(slot)
+            
+            if pooled is None:
+                pooled = self._start(slot)
+            elif not self._is_healthy(pooled):
+                self.logger.warning("応答しないドライバーを作り直します")
+                self._discard(pooled)
+                continue
+            
+            with self._condition:
+                pooled.uses += 1
+                self.checkouts += 1
+            return pooled
+    
+    def checkin(self, pooled: PooledDriver, broken: bool = False):
+        """借りたドライバーを返す（壊れている・使用回数の上限に達した場合は終了）"""
+        with self._condition:
+            if not (broken or pooled.uses >= self.max_uses or self._closed):
+                self._idle.append(pooled)
+                self._condition.notify()
+                return
+            if not broken and not self._closed:
+                self.recycled += 1
+        
+        self._discard(pooled)
+    
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None) -> Iterator:
+        """ドライバーを借りて使い、終わったら返す"""
+        pooled = self.checkout(timeout)
+        broken = False
+        try:
+            yield pooled.driver
+        except TimeoutException:
+            # ページの読み込み・要素の待機のタイムアウトはドライバーの異常ではない
+            raise
+        except WebDriverException:
+            # ブラウザーの異常終了等（以降の利用では作り直す）
+            broken = True
+            raise
+        finally:
+            self.checkin(pooled, broken=broken)
+    
+    def close(self):
+        """待機中のドライバーを終了（貸し出し中のものは返却時に終了）"""
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+        
+        for pooled in idle:
+            self._discard(pooled)
+        self.logger.info("ドライバープールを閉じました")
+    
+    def stats(self) -> Dict:
+        """プールの統計情報"""
+        with self._condition:
+            return {
+                'size': self.size,
+                'running': self._count,
+                'idle': len(self._idle),
+                'in_use': self._count - len(self._idle),
+                'checkouts': self.checkouts,
+                'started': self.started,
+                'recycled': self.recycled,
+                'closed': self._closed,
+            }
+    
+    def _start(self, slot: int) -> PooledDriver:
+        """ドライバーを起動（失敗した場合は起動枠を戻す）"""
+        user_data_dir = self.profile_dir / f"driver-{slot}" if self.profile_dir else None
+        try:
+            driver = self.factory(lightweight=self.lightweight, user_data_dir=user_data_dir)
+        except Exception as e:
+            self.logger.error(f"Seleniumドライバー初期化エラー: {str(e)}")
+            self._release(slot)
+            raise
+        
+        with self._condition:
+            self.started += 1
+        self.logger.info(f"Seleniumドライバーを起動しました（{self._count}/{self.size}）")
+        return PooledDriver(driver, slot)
+    
+    def _discard(self, pooled: PooledDriver):
+        """ドライバーを終了して起動枠を空ける"""
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            self.logger.warning(f"ドライバー終了エラー: {str(e)}")
+        
+        self._release(pooled.slot)
+    
+    def _release(self, slot: int):
+        """起動枠を空ける"""
+        with self._condition:
+            self._count -= 1
+            self._free_slots.add(slot)
+            self._condition.notify()
+    
+    @staticmethod
+    def _is_healthy(pooled: PooledDriver) -> bool:
+        """ドライバーが応答するか（ブラウザーが異常終了していると例外になる）"""
+        try:
+            pooled.driver.current_url
+            return True
+        except Exception:
+            return False
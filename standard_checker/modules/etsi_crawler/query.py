@@ -3,31 +3,139 @@ ETSIポータルクローラー
 ETSIのWEBポータルから標準規格の最新情報を取得する
 """
 
+import asyncio
+import os
 import time
 import logging
 import re
-from typing import Dict, List, Optional
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
 from urllib.parse import urljoin, quote
 import requests
 from bs4 import BeautifulSoup
-import pandas as pd
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+
+from modules.etsi_crawler.driver_pool import DriverPool, DriverPoolTimeout, create_chrome_driver
+from modules.etsi_crawler.rate_limit import HostRateLimiter
+from modules.export.exporter import StreamingExporter, collect_columns
+from modules.standards.canonical import parse_number
+
+# 一括検索の既定の並行数（requestsで取得する場合）
+DEFAULT_WORKERS = 4
+
+# 検索結果の取得方法（requests: HTTPのみ, selenium: ブラウザーのみ,
+# auto: HTTPで結果の表が得られなかった場合だけブラウザーで取得）
+FETCH_MODES = ('requests', 'selenium', 'auto')
+
+# アプリケーションのETSI確認で使う取得方法
+DEFAULT_FETCH_MODE = os.getenv('ETSI_FETCH_MODE', 'auto')
+
+# 検索フォーム等の要素が現れるまでの待ち時間（秒）
+ELEMENT_TIMEOUT = float(os.getenv('ETSI_ELEMENT_TIMEOUT', '10'))
+
+# 検索実行後に結果（または結果なしのページ）が表示されるまでの待ち時間（秒）
+RESULT_TIMEOUT = float(os.getenv('ETSI_RESULT_TIMEOUT', '20'))
+
+# 条件を確認する間隔（秒）
+POLL_INTERVAL = 0.1
+
+# Selenium検索の計測区間（移動・送信・描画・解析）
+SEARCH_PHASES = ('navigate', 'submit', 'render', 'parse')
+
+# DOMの構築が完了したとみなすdocument.readyState（軽量モードのeager読み込みでは
+# 画像等を待たずに"interactive"の時点で操作する）
+DOCUMENT_READY_STATES = ('interactive', 'complete')
+
+# 結果の表がないまま検索結果のページの読み込みが完了したことを表す値
+_NO_RESULTS = object()
+
+
+def _results_rendered(old_page):
+    """
+    検索結果の表示を待つ条件（WebDriverWait.untilに渡す）
+    
+    結果の表が現れればその要素を、検索前のページが破棄されて新しいページの
+    読み込みが完了しても表がなければ_NO_RESULTSを返す
+    """
+    def condition(driver):
+        tables = driver.find_elements(By.CLASS_NAME, "report-table")
+        if tables:
+            return tables[0]
+        try:
+            # 検索前のページが残っている間は遷移中
+            old_page.is_enabled()
+            return False
+        except StaleElementReferenceException:
+            pass
+        if driver.execute_script("return document.readyState") in DOCUMENT_READY_STATES:
+            return _NO_RESULTS
+        return False
+    return condition
+
+class FetchStats:
+    """検索結果を返した取得方法（requests / selenium）ごとの件数"""
+    
+    def __init__(self):
+        self.counts = Counter()
+        self._lock = threading.Lock()
+    
+    def record(self, tier: str):
+        """1件の検索を記録"""
+        with self._lock:
+            self.counts[tier] += 1
+    
+    def to_dict(self) -> Dict:
+        """取得方法ごとの件数と合計"""
+        with self._lock:
+            counts = {tier: self.counts.get(tier, 0) for tier in ('requests', 'selenium')}
+        return {**counts, 'total': sum(counts.values())}
 
 class ETSICrawler:
     """ETSIポータルクローラークラス"""
     
-    def __init__(self, use_selenium: bool = True):
+    def __init__(self, use_selenium: bool = True, rate_limiter: Optional[HostRateLimiter] = None,
+                 driver_pool: Optional[DriverPool] = None,
+                 element_timeout: float = ELEMENT_TIMEOUT, result_timeout: float = RESULT_TIMEOUT,
+                 lightweight: bool = False, profile_dir: Optional[Path] = None,
+                 fetch_mode: Optional[str] = None, fetch_stats: Optional[FetchStats] = None):
         self.logger = logging.getLogger(__name__)
-        self.use_selenium = use_selenium
+        # 取得方法（省略時はuse_seleniumに従う）
+        self.fetch_mode = fetch_mode or ('selenium' if use_selenium else 'requests')
+        if self.fetch_mode not in FETCH_MODES:
+            raise ValueError(f"不明な取得方法です: {fetch_mode}")
+        self.use_selenium = self.fetch_mode == 'selenium'
+        # 取得方法ごとの件数（アプリケーション全体で共有する場合は指定）
+        self.fetch_stats = fetch_stats or FetchStats()
+        # 専用のドライバーの起動設定（軽量モード・再利用するプロファイルの親ディレクトリ）
+        self.lightweight = lightweight
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self.element_timeout = element_timeout
+        self.result_timeout = result_timeout
+        # 共有のドライバープール（指定した場合は検索ごとに借りて返し、終了しない）
+        self.driver_pool = driver_pool
         self.base_url = "https://portal.etsi.org"
         self.search_url = "https://portal.etsi.org/webapp/workprogram/Report_WorkItem.asp"
         self.session = requests.Session()
         self.driver = None
+        # 専用のドライバーは1スレッドずつ使う（autoの並行検索でのブラウザー取得用）
+        self._driver_lock = threading.Lock()
+        
+        # 並行リクエストを含む全体のリクエスト数をホストごとに制限
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        # 一括検索のワーカースレッドごとのセッション
+        self._local = threading.local()
+        
+        # Selenium検索の区間ごとの累計時間（秒）と計測した検索数
+        self.phase_totals: Dict[str, float] = dict.fromkeys(SEARCH_PHASES, 0.0)
+        self.timed_searches = 0
+        self._timing_lock = threading.Lock()
         
         # リクエストヘッダー設定
         self.session.headers.update({
@@ -35,40 +143,47 @@ class ETSICrawler:
         })
     
     def __enter__(self):
-        if self.use_selenium:
+        if self.use_selenium and self.driver_pool is None:
             self._setup_driver()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.driver:
             self.driver.quit()
+            self.driver = None
     
     def _setup_driver(self):
         """Seleniumドライバーのセットアップ"""
         try:
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.implicitly_wait(10)
+            user_data_dir = self.profile_dir / "crawler" if self.profile_dir else None
+            self.driver = create_chrome_driver(lightweight=self.lightweight, user_data_dir=user_data_dir)
             
             self.logger.info("Seleniumドライバーを初期化しました")
-            
+        
         except Exception as e:
             self.logger.error(f"Seleniumドライバー初期化エラー: {str(e)}")
             raise
     
+    @contextmanager
+    def _selenium_driver(self) -> Iterator:
+        """検索に使うドライバー（プールがあれば借りる、なければ専用のドライバー）"""
+        if self.driver_pool is not None:
+            with self.driver_pool.driver() as driver:
+                yield driver
+            return
+        
+        with self._driver_lock:
+            if not self.driver:
+                self._setup_driver()
+            yield self.driver
+    
     def search_standard(self, standard_number: str) -> Dict:
         """
         指定された標準規格番号でETSIポータルを検索
         
         Args:
             standard_number: 標準規格番号 (例: "301 489-17")
-            
+        
         Returns:
             検索結果の辞書
         """
@@ -78,14 +193,20 @@ class ETSICrawler:
             # 標準規格番号を正規化
             normalized_number = self._normalize_standard_number(standard_number)
             
-            if self.use_selenium:
-                result = self._search_with_selenium(normalized_number)
+            if self.fetch_mode == 'auto':
+                result, tier = self._search_tiered(normalized_number)
+            elif self.use_selenium:
+                result, tier = self._search_with_selenium(normalized_number), 'selenium'
             else:
-                result = self._search_with_requests(normalized_number)
+                result, tier = self._search_with_requests(normalized_number), 'requests'
             
-            self.logger.info(f"ETSI検索完了: {standard_number}")
+            self.fetch_stats.record(tier)
+            self.logger.info(f"ETSI検索完了: {standard_number}（{tier}）")
             return result
-            
+        
+        except DriverPoolTimeout:
+            # 混雑は検索結果ではなく呼び出し側で扱う
+            raise
         except Exception as e:
             self.logger.error(f"ETSI検索エラー: {str(e)}")
             return {
@@ -102,55 +223,63 @@ class ETSICrawler:
         
         # "EN 301 489-17:2017" -> "301 489-17"
         # "ETSI EN 301 489-17" -> "301 489-17"
-        patterns = [
-            r'ETSI\s+EN\s+(\d+(?:\s+\d+)*(?:-\d+)*)',
-            r'EN\s+(\d+(?:\s+\d+)*(?:-\d+)*)',
-            r'(\d+(?:\s+\d+)*(?:-\d+)*)'
-        ]
+        key = parse_number(normalized)
+        if key is None:
+            # 先頭に未知の接頭辞がある場合は最初の数字から解釈
+            digit = re.search(r'\d', normalized)
+            key = parse_number(normalized[digit.start():]) if digit else None
         
-        for pattern in patterns:
-            match = re.search(pattern, normalized)
-            if match:
-                return match.group(1)
-        
-        return normalized
+        return key.number_part if key else normalized
     
     def _search_with_selenium(self, standard_number: str) -> Dict:
-        """Seleniumを使用してETSIポータルを検索"""
+        """
+        Seleniumを使用してETSIポータルを検索
+        
+        固定時間の待機はせず、要素・結果の表示を条件で待つ。区間ごとの所要時間をログに記録する
+        """
+        timings: Dict[str, float] = {}
         try:
-            if not self.driver:
-                self._setup_driver()
-            
-            # 検索ページに移動
-            self.driver.get(self.search_url)
-            
-            # 検索フォームの入力
-            search_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.NAME, "qETSIDeliverableNumber"))
-            )
-            search_input.clear()
-            search_input.send_keys(standard_number)
-            
-            # All Versionsをチェック
-            try:
-                all_versions_checkbox = self.driver.find_element(By.NAME, "qETSIAllVersions")
-                if not all_versions_checkbox.is_selected():
-                    all_versions_checkbox.click()
-            except NoSuchElementException:
-                self.logger.warning("All Versionsチェックボックスが見つかりません")
-            
-            # 検索実行
-            search_button = self.driver.find_element(By.NAME, "qETSISearchButton")
-            search_button.click()
-            
-            # 結果が表示されるまで待機
-            time.sleep(3)
-            
-            # 結果テーブルを解析
-            return self._parse_search_results_selenium()
+            with self._selenium_driver() as driver:
+                # 検索ページに移動
+                with self._phase(timings, 'navigate'):
+                    self.rate_limiter.acquire(self.search_url)
+                    driver.get(self.search_url)
+                    
+                    search_input = WebDriverWait(driver, self.element_timeout, poll_frequency=POLL_INTERVAL).until(
+                        EC.presence_of_element_located((By.NAME, "qETSIDeliverableNumber"))
+                    )
+                
+                with self._phase(timings, 'submit'):
+                    # 検索フォームの入力
+                    search_input.clear()
+                    search_input.send_keys(standard_number)
+                    
+                    # All Versionsをチェック
+                    try:
+                        all_versions_checkbox = driver.find_element(By.NAME, "qETSIAllVersions")
+                        if not all_versions_checkbox.is_selected():
+                            all_versions_checkbox.click()
+                    except NoSuchElementException:
+                        self.logger.warning("All Versionsチェックボックスが見つかりません")
+                    
+                    # 検索実行（遷移の検出用に検索前のページを控える）
+                    old_page = driver.find_element(By.TAG_NAME, "html")
+                    search_button = driver.find_element(By.NAME, "qETSISearchButton")
+                    search_button.click()
+                
+                # 結果の表、または結果なしのページが表示されるまで待機
+                with self._phase(timings, 'render'):
+                    table = WebDriverWait(driver, self.result_timeout, poll_frequency=POLL_INTERVAL).until(_results_rendered(old_page))
+                
+                # 結果テーブルを解析
+                with self._phase(timings, 'parse'):
+                    result = self._parse_search_results_selenium(None if table is _NO_RESULTS else table)
             
+            self._record_timings(standard_number, timings)
+            return result
+        
         except TimeoutException:
-            self.logger.error("ETSIポータルの応答がタイムアウトしました")
+            self.logger.error(f"ETSIポータルの応答がタイムアウトしました（{self._format_timings(timings)}）")
             return {
                 'standard_number': standard_number,
                 'error': 'Timeout',
@@ -161,24 +290,107 @@ class ETSICrawler:
             self.logger.error(f"Selenium検索エラー: {str(e)}")
             raise
     
+    @contextmanager
+    def _phase(self, timings: Dict[str, float], name: str) -> Iterator:
+        """区間の所要時間を計測"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings[name] = time.perf_counter() - start
+    
+    @staticmethod
+    def _format_timings(timings: Dict[str, float]) -> str:
+        """区間ごとの所要時間の表示"""
+        return ' / '.join(f"{name} {seconds:.2f}s" for name, seconds in timings.items())
+    
+    def _record_timings(self, standard_number: str, timings: Dict[str, float]):
+        """検索の区間ごとの所要時間をログに記録して累計に加える"""
+        self.logger.info(f"ETSI検索時間: {standard_number} - {self._format_timings(timings)}")
+        with self._timing_lock:
+            for name, seconds in timings.items():
+                self.phase_totals[name] += seconds
+            self.timed_searches += 1
+    
+    def timing_summary(self) -> Dict[str, float]:
+        """Selenium検索の区間ごとの平均所要時間（秒）"""
+        with self._timing_lock:
+            if not self.timed_searches:
+                return {}
+            return {name: total / self.timed_searches for name, total in self.phase_totals.items()}
+    
+    def reset_timings(self):
+        """区間ごとの累計時間を消去"""
+        with self._timing_lock:
+            self.phase_totals = dict.fromkeys(SEARCH_PHASES, 0.0)
+            self.timed_searches = 0
+    
+    def _log_timing_summary(self):
+        """Selenium検索の区間ごとの平均所要時間と、取得方法ごとの件数をログに記録"""
+        summary = self.timing_summary()
+        if summary:
+            self.logger.info(f"ETSI検索の平均時間（{self.timed_searches}件）: {self._format_timings(summary)}")
+        counts = self.fetch_stats.to_dict()
+        self.logger.info(f"ETSI検索の取得方法: requests {counts['requests']}件 / selenium {counts['selenium']}件")
+    
+    def _search_tiered(self, standard_number: str) -> Tuple[Dict, str]:
+        """
+        HTTPで検索し、結果の表が得られなかった場合だけブラウザーで検索
+        
+        Returns:
+            (検索結果, 結果を返した取得方法)
+        """
+        try:
+            soup = self._request_search_page(standard_number)
+            if self._find_results_table(soup) is not None:
+                return self._parse_search_results_requests(soup, standard_number), 'requests'
+            self.logger.info(f"HTTPの応答に結果の表がないためブラウザーで検索します: {standard_number}")
+        
+        except requests.exceptions.RequestException as e:
+            self.logger.warning(f"HTTP検索エラー（ブラウザーで再試行）: {str(e)}")
+        
+        return self._search_with_selenium(standard_number), 'selenium'
+    
+    def _request_search_page(self, standard_number: str) -> BeautifulSoup:
+        """検索結果のページをHTTPで取得"""
+        # 検索パラメータ
+        params = {
+            'qETSIDeliverableNumber': standard_number,
+            'qETSIAllVersions': 'on',
+            'qETSISearchButton': 'Search'
+        }
+        
+        # 検索実行
+        self.rate_limiter.acquire(self.search_url)
+        response = self._session().get(self.search_url, params=params, timeout=30)
+        response.raise_for_status()
+        
+        return BeautifulSoup(response.content, 'html.parser')
+    
+    @staticmethod
+    def _find_results_table(soup: BeautifulSoup):
+        """
+        検索結果の表（見出しにIDENTIFICATIONを含むreport-table）を取得
+        
+        データ行のない表は「該当なし」の結果として扱う。表がない場合（スクリプトで
+        描画するページ等）はNone
+        """
+        table = soup.find('table', class_='report-table')
+        if table is None:
+            return None
+        header_row = table.find('tr')
+        if header_row is None:
+            return None
+        headers = {cell.get_text(strip=True) for cell in header_row.find_all(['th', 'td'])}
+        return table if 'IDENTIFICATION' in headers else None
+    
     def _search_with_requests(self, standard_number: str) -> Dict:
         """requestsを使用してETSIポータルを検索"""
         try:
-            # 検索パラメータ
-            params = {
-                'qETSIDeliverableNumber': standard_number,
-                'qETSIAllVersions': 'on',
-                'qETSISearchButton': 'Search'
-            }
-            
-            # 検索実行
-            response = self.session.get(self.search_url, params=params, timeout=30)
-            response.raise_for_status()
-            
             # 結果を解析
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self._request_search_page(standard_number)
             return self._parse_search_results_requests(soup, standard_number)
-            
+        
         except requests.exceptions.RequestException as e:
             self.logger.error(f"HTTP検索エラー: {str(e)}")
             return {
@@ -188,24 +400,20 @@ class ETSICrawler:
                 'versions': []
             }
     
-    def _parse_search_results_selenium(self) -> Dict:
-        """Seleniumで取得した検索結果を解析"""
-        try:
-            # 結果テーブルを取得
-            table = self.driver.find_element(By.CLASS_NAME, "report-table")
-            
-            # HTMLを取得してBeautifulSoupで解析
-            table_html = table.get_attribute('outerHTML')
-            soup = BeautifulSoup(table_html, 'html.parser')
-            
-            return self._parse_results_table(soup)
-            
-        except NoSuchElementException:
+    def _parse_search_results_selenium(self, table) -> Dict:
+        """Seleniumで取得した検索結果の表を解析（表がない場合はNone）"""
+        if table is None:
             return {
                 'status': 'No Results',
                 'versions': [],
                 'message': '検索結果が見つかりませんでした'
             }
+        
+        # HTMLを取得してBeautifulSoupで解析
+        table_html = table.get_attribute('outerHTML')
+        soup = BeautifulSoup(table_html, 'html.parser')
+        
+        return self._parse_results_table(soup)
     
     def _parse_search_results_requests(self, soup: BeautifulSoup, standard_number: str) -> Dict:
         """requestsで取得した検索結果を解析"""
@@ -258,7 +466,7 @@ class ETSICrawler:
                 'total_versions': len(versions),
                 'last_updated': time.strftime('%Y-%m-%d %H:%M:%S')
             }
-            
+        
         except Exception as e:
             self.logger.error(f"テーブル解析エラー: {str(e)}")
             return {
@@ -270,31 +478,37 @@ class ETSICrawler:
     def get_standard_details(self, standard_url: str) -> Dict:
         """標準規格の詳細情報を取得"""
         try:
+            self.rate_limiter.acquire(standard_url)
             if self.use_selenium:
-                self.driver.get(standard_url)
-                time.sleep(2)
-                
-                # 詳細情報を取得
-                details = {}
-                
-                # 基本情報
-                try:
-                    title_element = self.driver.find_element(By.CLASS_NAME, "standard-title")
-                    details['title'] = title_element.text
-                except NoSuchElementException:
-                    pass
-                
-                # 状態情報
-                try:
-                    status_element = self.driver.find_element(By.CLASS_NAME, "standard-status")
-                    details['status'] = status_element.text
-                except NoSuchElementException:
-                    pass
-                
-                return details
-                
+                with self._selenium_driver() as driver:
+                    driver.get(standard_url)
+                    
+                    # ページの読み込み完了を待機
+                    WebDriverWait(driver, self.element_timeout, poll_frequency=POLL_INTERVAL).until(
+                        lambda d: d.execute_script("return document.readyState") in DOCUMENT_READY_STATES
+                    )
+                    
+                    # 詳細情報を取得
+                    details = {}
+                    
+                    # 基本情報
+                    try:
+                        title_element = driver.find_element(By.CLASS_NAME, "standard-title")
+                        details['title'] = title_element.text
+                    except NoSuchElementException:
+                        pass
+                    
+                    # 状態情報
+                    try:
+                        status_element = driver.find_element(By.CLASS_NAME, "standard-status")
+                        details['status'] = status_element.text
+                    except NoSuchElementException:
+                        pass
+                    
+                    return details
+            
             else:
-                response = self.session.get(standard_url, timeout=30)
+                response = self._session().get(standard_url, timeout=30)
                 response.raise_for_status()
                 
                 soup = BeautifulSoup(response.content, 'html.parser')
@@ -307,26 +521,84 @@ class ETSICrawler:
                 }
                 
                 return details
-                
+        
         except Exception as e:
             self.logger.error(f"詳細情報取得エラー: {str(e)}")
             return {'error': str(e)}
     
-    def batch_search_standards(self, standard_numbers: List[str]) -> List[Dict]:
-        """複数の標準規格を一括検索"""
-        results = []
+    def _session(self) -> requests.Session:
+        """現在のスレッドのHTTPセッション（ワーカースレッド以外は共有のセッション）"""
+        return getattr(self._local, 'session', self.session)
+    
+    def _init_worker(self):
+        """ワーカースレッドの初期化（Sessionはスレッド間で共有しない）"""
+        session = requests.Session()
+        session.headers.update(self.session.headers)
+        self._local.session = session
+    
+    def _batch_workers(self, workers: int) -> int:
+        """
+        一括検索の並行数（Seleniumは使えるドライバーの数まで）
         
-        for i, standard_number in enumerate(standard_numbers):
-            self.logger.info(f"一括検索進行中: {i+1}/{len(standard_numbers)} - {standard_number}")
-            
-            result = self.search_standard(standard_number)
-            results.append(result)
-            
-            # レート制限のための待機
-            time.sleep(2)
+        autoではHTTPの検索を並行に行い、ブラウザーでの検索はドライバーの数だけ同時に行う
+        """
+        if self.use_selenium:
+            limit = self.driver_pool.size if self.driver_pool is not None else 1
+            if workers > limit:
+                self.logger.warning(f"Selenium使用時の並行数はドライバー数（{limit}）までに制限します")
+                return limit
+        return max(1, workers)
+    
+    def batch_search_standards(self, standard_numbers: List[str], workers: int = 1) -> List[Dict]:
+        """
+        複数の標準規格を一括検索（結果は入力と同じ順序）
+        
+        workersが2以上の場合はスレッドプールで並行に検索する。
+        送信間隔はレート制限で保たれるため、並行数は応答待ちを重ねるためだけに使う
+        """
+        total = len(standard_numbers)
         
+        def search(item: Tuple[int, str]) -> Dict:
+            index, standard_number = item
+            self.logger.info(f"一括検索進行中: {index+1}/{total} - {standard_number}")
+            return self.search_standard(standard_number)
+        
+        with ThreadPoolExecutor(max_workers=self._batch_workers(workers), initializer=self._init_worker) as executor:
+            results = list(executor.map(search, enumerate(standard_numbers)))
+        
+        self._log_timing_summary()
         return results
     
+    async def iter_batch_results(self, standard_numbers: List[str],
+                                 workers: int = DEFAULT_WORKERS) -> AsyncIterator[Tuple[int, str, Dict]]:
+        """
+        複数の標準規格を並行に検索し、(入力の位置, 番号, 結果) を完了した順に返す
+        
+        検索はスレッドプールで行い、結果の受け取りはイベントループのスレッドで行うため、
+        呼び出し側はレジストリの更新等をロックなしで逐次行える
+        """
+        loop = asyncio.get_running_loop()
+        total = len(standard_numbers)
+        executor = ThreadPoolExecutor(max_workers=self._batch_workers(workers), initializer=self._init_worker)
+        
+        async def search(index: int, standard_number: str) -> Tuple[int, str, Dict]:
+            result = await loop.run_in_executor(executor, self.search_standard, standard_number)
+            return index, standard_number, result
+        
+        tasks = [asyncio.ensure_future(search(i, number)) for i, number in enumerate(standard_numbers)]
+        try:
+            for done, task in enumerate(asyncio.as_completed(tasks), 1):
+                index, standard_number, result = await task
+                self.logger.info(f"一括検索進行中: {done}/{total} - {standard_number}")
+                yield index, standard_number, result
+            
+            self._log_timing_summary()
+        finally:
+            # 途中で終了した場合は未着手の検索を取り消す
+            for task in tasks:
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+    
     def export_search_results(self, results: List[Dict], output_path: str):
         """検索結果をエクスポート"""
         try:
@@ -350,21 +622,19 @@ class ETSICrawler:
                 else:
                     flattened_results.append(base_info)
             
-            # DataFrameに変換してエクスポート
-            df = pd.DataFrame(flattened_results)
+            # 行単位でエクスポート
+            exporter = StreamingExporter(columns=collect_columns(flattened_results))
             
             if output_path.endswith('.csv'):
-                df.to_csv(output_path, index=False)
+                exporter.write_csv(flattened_results, output_path)
             elif output_path.endswith('.xlsx'):
-                df.to_excel(output_path, index=False)
+                exporter.write_xlsx({'Sheet1': flattened_results}, output_path)
             else:
                 # JSONとして保存
-                import json
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(results, f, ensure_ascii=False, indent=2)
+                StreamingExporter().write_json(results, output_path)
             
             self.logger.info(f"検索結果をエクスポートしました: {output_path}")
-            
+        
         except Exception as e:
             self.logger.error(f"エクスポートエラー: {str(e)}")
             raise
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+リクエストのレート制限モジュール
+ホストごとのトークンバケットで、並行リクエスト全体の送信間隔を一定以上に保つ
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict
+from urllib.parse import urlparse
+
+# ホストあたりの既定のリクエスト数（回/秒）
+DEFAULT_REQUEST_RATE = float(os.getenv('ETSI_REQUEST_RATE', '2'))
+
+# 連続して送信できるリクエスト数の既定値
+DEFAULT_BURST = 1
+
+
+class TokenBucket:
+    """
+    トークンバケット
+    
+    トークンはrate（個/秒）で最大burst個まで貯まり、リクエストごとに1個消費する。
+    取得時に次のトークンを予約してから待つため、複数のスレッドが同時に待っても
+    送信時刻は1/rate秒ずつずれ、到着順に送信される
+    """
+    
+    def __init__(self, rate: float = DEFAULT_REQUEST_RATE, burst: int = DEFAULT_BURST,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """トークンを1個予約し、使えるようになるまでの待ち時間（秒）を返す"""
+        if self.rate <= 0:
+            return 0.0
+        
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # 足りない分は将来のトークンを前借りする（負の値は予約済みの待ち行列）
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+    
+    def acquire(self) -> float:
+        """トークンを取得（必要なら待機）し、待った時間（秒）を返す"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """URLのホストごとにトークンバケットを持つレート制限"""
+    
+    def __init__(self, rate: float = DEFAULT_REQUEST_RATE, burst: int = DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+    
+    def bucket(self, url: str) -> TokenBucket:
+        """URLのホストのトークンバケットを取得"""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return bucket
+    
+    def acquire(self, url: str) -> float:
+        """URLへのリクエスト前に呼び出す（必要なら待機）"""
+        return self.bucket(url).acquire()
@@ -0,0 +1 @@
+# エクスポートモジュール
\ No newline at end of file
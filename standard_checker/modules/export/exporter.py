@@ -0,0 +1,214 @@
+"""
+ストリーミングエクスポートモジュール
+CSV/Excel/JSON形式で行を1件ずつ書き出し、件数によらずメモリ使用量を一定に保つ
+"""
+
+import csv
+import json
+import logging
+import tempfile
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# HTTPストリームで1回に送るバイト数
+CHUNK_SIZE = 64 * 1024
+
+
+def collect_columns(rows: List[Dict]) -> List[str]:
+    """メモリ上の行リストから出現順に列名を収集"""
+    columns = {}
+    for row in rows:
+        for key in row:
+            columns.setdefault(key, None)
+    return list(columns)
+
+
+def batch_chunks(chunks: Iterable[str], size: int = CHUNK_SIZE) -> Iterator[str]:
+    """細かいテキストチャンクを一定サイズ程度にまとめる"""
+    buffer = []
+    buffered = 0
+    
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= size:
+            yield ''.join(buffer)
+            buffer = []
+            buffered = 0
+    
+    if buffer:
+        yield ''.join(buffer)
+
+
+class _LineBuffer:
+    """csv.writerの出力を1行ずつ受け取るバッファ"""
+    
+    def write(self, line: str) -> str:
+        return line
+
+
+class StreamingExporter:
+    """行を逐次書き出すエクスポータークラス"""
+    
+    SUPPORTED_FORMATS = ('csv', 'xlsx', 'json', 'ndjson')
+    
+    def __init__(self, columns: Optional[List[str]] = None):
+        """
+        Args:
+            columns: 出力する列。未指定の場合は最初の行のキーを使用
+        """
+        self.logger = logging.getLogger(__name__)
+        self.columns = list(columns) if columns else None
+    
+    def export(self, rows: Iterable[Dict], output_path: Path, fmt: Optional[str] = None):
+        """拡張子（またはfmt）に応じた形式でファイルに書き出し"""
+        output_path = Path(output_path)
+        fmt = (fmt or output_path.suffix.lstrip('.') or 'json').lower()
+        
+        if fmt == 'csv':
+            self.write_csv(rows, output_path)
+        elif fmt == 'xlsx':
+            self.write_xlsx({'Sheet1': rows}, output_path)
+        elif fmt == 'ndjson':
+            self._write_text(self.iter_ndjson(rows), output_path)
+        else:
+            self.write_json(rows, output_path)
+    
+    def write_csv(self, rows: Iterable[Dict], output_path: Path):
+        """CSVファイルに1行ずつ書き出し"""
+        self._write_text(self.iter_csv(rows), output_path)
+    
+    def write_json(self, rows: Iterable[Dict], output_path: Path, indent: Optional[int] = 2):
+        """JSON配列としてファイルに逐次書き出し"""
+        self._write_text(self.iter_json(rows, indent=indent), output_path)
+    
+    def write_xlsx(self, sheets: Dict[str, Iterable[Dict]], output_path: Path):
+        """
+        openpyxlの書き込み専用モードでExcelファイルに書き出し
+        
+        Args:
+            sheets: シート名から行イテラブルへの辞書（挿入順にシートを作成）
+            output_path: 出力先
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        workbook = self._build_workbook(sheets)
+        workbook.save(output_path)
+    
+    def iter_csv(self, rows: Iterable[Dict]) -> Iterator[str]:
+        """CSVの行を文字列として逐次生成"""
+        writer = csv.writer(_LineBuffer())
+        rows = iter(rows)
+        first = next(rows, None)
+        
+        columns = self.columns or (list(first.keys()) if first is not None else None)
+        if not columns:
+            return
+        
+        yield writer.writerow(columns)
+        if first is None:
+            return
+        
+        for row in chain([first], rows):
+            yield writer.writerow([self._csv_cell(row.get(c)) for c in columns])
+    
+    def iter_json(self, rows: Iterable[Dict], indent: Optional[int] = None) -> Iterator[str]:
+        """JSON配列を要素単位で逐次生成"""
+        separator = '[\n' if indent else '['
+        wrote_any = False
+        
+        for row in rows:
+            item = json.dumps(self._select(row), ensure_ascii=False, indent=indent, default=str)
+            if indent:
+                item = '\n'.join(' ' * indent + line for line in item.split('\n'))
+            yield separator + item
+            separator = ',\n' if indent else ','
+            wrote_any = True
+        
+        if not wrote_any:
+            yield '[]'
+        else:
+            yield '\n]' if indent else ']'
+    
+    def iter_ndjson(self, rows: Iterable[Dict]) -> Iterator[str]:
+        """改行区切りJSONを1行ずつ生成"""
+        for row in rows:
+            yield json.dumps(self._select(row), ensure_ascii=False, default=str) + '\n'
+    
+    def iter_xlsx(self, sheets: Dict[str, Iterable[Dict]]) -> Iterator[bytes]:
+        """
+        Excelファイルをバイト列のチャンクとして生成
+        
+        xlsxはzip形式のため、一時ファイル（小さいうちはメモリ上）に書き出してから送出する
+        """
+        workbook = self._build_workbook(sheets)
+        
+        with tempfile.SpooledTemporaryFile(max_size=CHUNK_SIZE * 16) as buffer:
+            workbook.save(buffer)
+            buffer.seek(0)
+            while True:
+                chunk = buffer.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+    
+    def _build_workbook(self, sheets: Dict[str, Iterable[Dict]]):
+        """書き込み専用ワークブックを構築"""
+        from openpyxl import Workbook
+        
+        workbook = Workbook(write_only=True)
+        
+        for sheet_name, rows in sheets.items():
+            worksheet = workbook.create_sheet(title=sheet_name)
+            rows = iter(rows)
+            first = next(rows, None)
+            
+            columns = self.columns or (list(first.keys()) if first is not None else None)
+            if not columns:
+                continue
+            
+            worksheet.append(columns)
+            if first is None:
+                continue
+            
+            for row in chain([first], rows):
+                worksheet.append([self._excel_cell(row.get(c)) for c in columns])
+        
+        return workbook
+    
+    def _write_text(self, chunks: Iterable[str], output_path: Path):
+        """テキストチャンクをファイルに書き出し"""
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(output_path, 'w', encoding='utf-8', newline='') as f:
+            for chunk in chunks:
+                f.write(chunk)
+    
+    def _select(self, row: Dict) -> Dict:
+        """列指定がある場合は対象列のみに絞り込み"""
+        if self.columns is None:
+            return row
+        return {c: row.get(c) for c in self.columns}
+    
+    @staticmethod
+    def _csv_cell(value):
+        """CSVセル値に変換（ネストした値はJSON文字列）"""
+        if value is None:
+            return ''
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, ensure_ascii=False)
+        return value
+    
+    @staticmethod
+    def _excel_cell(value):
+        """Excelセル値に変換（制御文字は除去）"""
+        from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+        
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value, ensure_ascii=False)
+        if isinstance(value, str):
+            return ILLEGAL_CHARACTERS_RE.sub('', value)
+        return value
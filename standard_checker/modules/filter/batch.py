@@ -0,0 +1,193 @@
+"""
+一括フィルター評価モジュール
+多数のフィルター（顧客ごとのプロファイル等）を標準規格の1回の走査でまとめて評価する
+"""
+
+import logging
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from modules.filter.filter import CompiledFilter, StandardFilter
+from modules.filter.planner import OPERATOR_COSTS
+from modules.filter.query import CompiledQuery
+
+# 条件ごとに判定結果を記憶するフィールド値の種類の上限
+# （これを超える条件は値の種類が多いとみなして記憶せずに評価する）
+BATCH_MEMO_LIMIT = 4096
+
+# ANDに分解できないクエリの推定コスト
+OPAQUE_QUERY_COST = 50
+
+
+def _freeze(value):
+    """条件の値をハッシュ可能な形に変換（同じ条件の判定に使う）"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+class _Condition:
+    """プロファイル間で共有する1条件（フィールドがNoneの場合は標準規格全体の判定関数）"""
+    
+    __slots__ = ('field', 'predicate', 'cost', 'users', 'memo')
+    
+    def __init__(self, field: Optional[str], predicate: Callable, cost: float):
+        self.field = field
+        self.predicate = predicate
+        self.cost = cost
+        self.users = 0
+        self.memo: Optional[Dict] = {} if field is not None else None
+    
+    def test(self, standard) -> bool:
+        """標準規格が条件を満たすか（判定結果はフィールド値ごとに記憶）"""
+        if self.field is None:
+            return self.predicate(standard)
+        
+        value = standard.get(self.field)
+        memo = self.memo
+        if memo is None:
+            return self.predicate(value)
+        # True と 1 などを区別するため型も含めて記憶
+        key = (value.__class__, value)
+        try:
+            return memo[key]
+        except KeyError:
+            result = memo[key] = self.predicate(value)
+            if len(memo) >= BATCH_MEMO_LIMIT:
+                self.memo = None
+            return result
+        except TypeError:
+            # ハッシュ不可能な値は記憶しない
+            return self.predicate(value)
+
+
+class _Node:
+    """条件の木のノード（根からの経路上の条件を全て満たすとprofilesが一致）"""
+    
+    __slots__ = ('condition', 'children', 'profiles')
+    
+    def __init__(self, condition: Optional[_Condition] = None):
+        self.condition = condition
+        self.children: Dict[int, "_Node"] = {}
+        self.profiles: List[str] = []
+
+
+class BatchFilter:
+    """
+    一括フィルター
+    
+    全プロファイルの条件を同じ条件ごとにまとめ、多くのプロファイルが使う条件ほど
+    根に近くなる木を作る。標準規格ごとに木を辿り、満たさない条件の下にある
+    プロファイルはまとめて評価を省くため、共有する条件の評価は1件につき1回で済む。
+    さらに条件の判定結果をフィールド値ごとに記憶し、値の種類が少ないフィールドでは
+    判定関数の呼び出し自体を値の種類の数に抑える
+    """
+    
+    def __init__(self, profiles: Mapping[str, Union[CompiledFilter, CompiledQuery]]):
+        self.logger = logging.getLogger(__name__)
+        self.names: Tuple[str, ...] = tuple(profiles)
+        self._filter = StandardFilter()
+        self._keys: Dict[object, int] = {}
+        self.conditions: List[_Condition] = []
+        
+        paths = {name: self._register(profile) for name, profile in profiles.items()}
+        
+        # 利用するプロファイルが多い順（同数は安価な順）に条件を並べて木を作る
+        order = sorted(range(len(self.conditions)),
+                       key=lambda i: (-self.conditions[i].users, self.conditions[i].cost, i))
+        position = {index: rank for rank, index in enumerate(order)}
+        
+        self.root = _Node()
+        for name, indexes in paths.items():
+            node = self.root
+            for index in sorted(indexes, key=position.__getitem__):
+                child = node.children.get(index)
+                if child is None:
+                    child = node.children[index] = _Node(self.conditions[index])
+                node = child
+            node.profiles.append(name)
+        
+        self._children = self._flatten(self.root)
+    
+    def _register(self, profile: Union[CompiledFilter, CompiledQuery]) -> List[int]:
+        """プロファイルの条件を共有の条件表に登録し、その番号のリストを返す"""
+        if isinstance(profile, CompiledQuery):
+            if profile.conditions is None:
+                # ANDに分解できないクエリは1つの条件として扱う
+                return [self._add(('query', profile.query), None, profile.matches, OPAQUE_QUERY_COST)]
+            items = [(c, None) for c in profile.conditions]
+        else:
+            items = list(profile.items())
+        
+        indexes = []
+        for condition, predicate in items:
+            key = (condition['field'], condition['operator'], _freeze(condition['value']))
+            try:
+                hash(key)
+            except TypeError:
+                key = ('unhashable', id(condition))
+            if predicate is None and key not in self._keys:
+                predicate = self._filter._compile_condition(condition)
+            index = self._add(key, condition['field'], predicate, OPERATOR_COSTS.get(condition['operator'], 1))
+            if index not in indexes:
+                indexes.append(index)
+        return indexes
+    
+    def _add(self, key, field: Optional[str], predicate: Optional[Callable], cost: float) -> int:
+        """条件を登録（同じ条件は既存のものを共有）"""
+        index = self._keys.get(key)
+        if index is None:
+            index = self._keys[key] = len(self.conditions)
+            self.conditions.append(_Condition(field, predicate, cost))
+        self.conditions[index].users += 1
+        return index
+    
+    @staticmethod
+    def _flatten(node: _Node) -> Tuple:
+        """木を (条件, プロファイル, 子) のタプルに変換（走査時の属性参照を減らす）"""
+        return tuple(
+            (child.condition, tuple(child.profiles), BatchFilter._flatten(child))
+            for child in node.children.values()
+        )
+    
+    def evaluate(self, standards: Iterable) -> Dict[str, List[str]]:
+        """
+        標準規格（辞書またはエントリ）を1回走査し、プロファイルごとの一致IDリストを取得
+        
+        IDの並びは入力の順序と同じ
+        """
+        results: Dict[str, List[str]] = {name: [] for name in self.names}
+        appenders = {name: ids.append for name, ids in results.items()}
+        always = [appenders[name] for name in self.root.profiles]
+        top = self._children
+        
+        for standard in standards:
+            standard_id = standard.get('id')
+            for append in always:
+                append(standard_id)
+            
+            stack = [top]
+            while stack:
+                for condition, profiles, children in stack.pop():
+                    if not condition.test(standard):
+                        continue
+                    for name in profiles:
+                        appenders[name](standard_id)
+                    if children:
+                        stack.append(children)
+        
+        return results
+    
+    def execute(self, registry) -> Dict[str, List[str]]:
+        """レジストリの全エントリを番号の自然順に評価"""
+        results = self.evaluate(registry.sorted_entries())
+        self.logger.info(f"一括フィルター適用: {len(self.names)}件のプロファイル / {len(registry.standards)}件")
+        return results
+
+
+def evaluate_batch(standards: Iterable, profiles: Mapping[str, Union[CompiledFilter, CompiledQuery]]) -> Dict[str, List[str]]:
+    """多数のフィルターを1回の走査で評価し、プロファイルごとの一致IDリストを取得"""
+    return BatchFilter(profiles).evaluate(standards)
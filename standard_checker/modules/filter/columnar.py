@@ -0,0 +1,299 @@
+"""
+列指向フィルターモジュール
+レジストリのフィールドをNumPy配列として保持し、フィルター条件を配列演算で評価する
+"""
+
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPyがない環境では行単位のフィルターのみ使用する
+    np = None
+
+from modules.filter.filter import CompiledFilter, FilterOperator
+from modules.standards.schema import FIELD_SCHEMA, COERCERS
+
+COLUMNAR_AVAILABLE = np is not None
+
+# この件数以上のレジストリで列指向ビューを使う（小さい場合は構築コストの方が大きい）
+COLUMNAR_MIN_ROWS = 5000
+
+# 部分文字列系の演算子（全行を連結した文字列の検索で評価）
+TEXT_OPERATORS = (FilterOperator.CONTAINS, FilterOperator.STARTS_WITH, FilterOperator.ENDS_WITH)
+
+# 値の種類がこの比率以上に少ない（行数 / 種類数）フィールドは種類ごとに評価
+LOW_CARDINALITY_RATIO = 4
+
+# 連結文字列で行を区切る文字
+ROW_SEPARATOR = '\x00'
+
+# 大小比較系の演算子（スキーマのフィールドは型付き配列で評価）
+RANGE_OPERATORS = (FilterOperator.GREATER_THAN, FilterOperator.LESS_THAN, FilterOperator.BETWEEN)
+
+# 型付き配列のNumPy型
+TYPED_DTYPES = {
+    'datetime': 'datetime64[us]',
+    'year': 'float64',
+}
+
+
+class _Snapshot:
+    """ある時点のレジストリから作った列の集合（列は必要になった時に作成）"""
+    
+    __slots__ = ('entries', 'columns', 'nulls', 'texts', 'joined', 'factors', 'typed')
+    
+    def __init__(self, entries):
+        self.entries = entries
+        self.columns: Dict[str, "np.ndarray"] = {}
+        self.nulls: Dict[str, "np.ndarray"] = {}
+        self.texts: Dict[str, "np.ndarray"] = {}
+        self.joined: Dict[str, Tuple[str, "np.ndarray"]] = {}
+        self.factors: Dict[str, Optional[Tuple["np.ndarray", List]]] = {}
+        self.typed: Dict[str, "np.ndarray"] = {}
+
+
+class ColumnarView:
+    """
+    レジストリの列指向ビュー
+    
+    行の並びはレジストリの一覧（自然順）と同じ。レジストリの変更通知を受けると
+    現在のスナップショットを破棄し、次の検索時に作り直す。
+    検索は開始時点のスナップショットに対して行うため、並行する変更の影響を受けない。
+    """
+    
+    def __init__(self, registry):
+        if np is None:
+            raise ImportError("列指向ビューにはNumPyが必要です")
+        
+        self.logger = logging.getLogger(__name__)
+        self.registry = registry
+        self._snapshot: Optional[_Snapshot] = None
+        self.builds = 0
+        
+        registry.subscribe(self._on_change)
+    
+    def __len__(self) -> int:
+        return len(self._get_snapshot().entries)
+    
+    def close(self):
+        """変更通知の購読を解除"""
+        self.registry.unsubscribe(self._on_change)
+        self._snapshot = None
+    
+    def filter(self, compiled: CompiledFilter) -> List[Dict]:
+        """コンパイル済みフィルターを評価し、条件を満たす標準規格を辞書形式で取得"""
+        return [entry.to_dict() for entry in self.entries(compiled)]
+    
+    def entries(self, compiled: CompiledFilter) -> "np.ndarray":
+        """コンパイル済みフィルターを評価し、条件を満たすエントリを自然順に取得"""
+        snapshot = self._get_snapshot()
+        return snapshot.entries[self.mask(compiled, snapshot)]
+    
+    def mask(self, compiled: CompiledFilter, snapshot: Optional[_Snapshot] = None) -> "np.ndarray":
+        """
+        条件を満たす行の真偽値配列を取得
+        
+        配列演算で評価できる条件を先に適用し、残りの条件（行単位の判定関数）は
+        それまでに残った行に対してのみ評価する
+        """
+        snapshot = snapshot or self._get_snapshot()
+        mask = np.ones(len(snapshot.entries), dtype=bool)
+        
+        deferred = []
+        for condition, predicate in compiled.items():
+            vector_mask = self._vector_mask(snapshot, condition, predicate)
+            if vector_mask is None:
+                deferred.append((condition['field'], predicate))
+            else:
+                mask &= vector_mask
+        
+        for field, predicate in deferred:
+            rows = np.flatnonzero(mask)
+            if not len(rows):
+                break
+            mask[rows] = self._map(self._column(snapshot, field)[rows], predicate)
+        
+        return mask
+    
+    def _on_change(self, operation: str, standard_id: Optional[str]):
+        """レジストリの変更通知"""
+        self._snapshot = None
+    
+    def _get_snapshot(self) -> _Snapshot:
+        """現在のスナップショットを取得（破棄されている場合は作成）"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            entries = self.registry.sorted_entries()
+            snapshot = _Snapshot(np.fromiter(entries, dtype=object, count=len(entries)))
+            self._snapshot = snapshot
+            self.builds += 1
+        return snapshot
+    
+    def _vector_mask(self, snapshot: _Snapshot, condition: Dict, predicate: Callable) -> Optional["np.ndarray"]:
+        """配列演算で条件を評価（評価できない場合はNone）"""
+        field = condition['field']
+        operator = condition['operator']
+        filter_value = condition['value']
+        
+        # 値の種類が少ないフィールドは、種類ごとに判定関数を1回だけ評価
+        factors = self._factorize(snapshot, field)
+        if factors is not None:
+            codes, uniques = factors
+            if len(uniques) * LOW_CARDINALITY_RATIO <= len(codes) or operator in (FilterOperator.IN, FilterOperator.NOT_IN):
+                table = np.fromiter((predicate(value) for value in uniques), dtype=bool, count=len(uniques))
+                return table[codes]
+        
+        if operator == FilterOperator.EQUALS:
+            return (self._text(snapshot, field) == str(filter_value).lower()) & ~self._nulls(snapshot, field)
+        
+        if operator in TEXT_OPERATORS:
+            lowered = str(filter_value).lower()
+            if ROW_SEPARATOR in lowered:
+                return None
+            if not lowered:
+                return ~self._nulls(snapshot, field)
+            
+            # 前方一致・後方一致は行の区切り文字を含めて検索
+            if operator == FilterOperator.STARTS_WITH:
+                lowered = ROW_SEPARATOR + lowered
+            elif operator == FilterOperator.ENDS_WITH:
+                lowered = lowered + ROW_SEPARATOR
+            return self._search_joined(snapshot, field, lowered) & ~self._nulls(snapshot, field)
+        
+        if operator in RANGE_OPERATORS and field in FIELD_SCHEMA:
+            return self._range_mask(snapshot, field, operator, filter_value, predicate)
+        
+        return None
+    
+    def _range_mask(self, snapshot: _Snapshot, field: str, operator: FilterOperator,
+                    filter_value, predicate: Callable) -> Optional["np.ndarray"]:
+        """スキーマのフィールドの大小比較を型付き配列で評価"""
+        field_type = FIELD_SCHEMA[field]
+        coerce = COERCERS[field_type]
+        
+        if operator == FilterOperator.BETWEEN:
+            if not isinstance(filter_value, (list, tuple)) or len(filter_value) != 2:
+                return None
+            bounds = [coerce(v) for v in filter_value]
+        else:
+            bounds = [coerce(filter_value)]
+        if any(b is None for b in bounds):
+            # 定数を変換できない場合は行単位の比較
+            return None
+        
+        bounds = [np.array(b, dtype=TYPED_DTYPES[field_type]) for b in bounds]
+        typed = self._typed(snapshot, field)
+        
+        if operator == FilterOperator.GREATER_THAN:
+            mask = typed > bounds[0]
+        elif operator == FilterOperator.LESS_THAN:
+            mask = typed < bounds[0]
+        else:
+            mask = (typed >= bounds[0]) & (typed <= bounds[1])
+        
+        # 変換できなかった値（Noneを除く）は判定関数の文字列比較にフォールバック
+        fallback = np.flatnonzero(np.isnan(typed) & ~self._nulls(snapshot, field))
+        if len(fallback):
+            mask[fallback] = self._map(self._column(snapshot, field)[fallback], predicate)
+        return mask
+    
+    def _column(self, snapshot: _Snapshot, field: str) -> "np.ndarray":
+        """フィールド値の配列"""
+        column = snapshot.columns.get(field)
+        if column is None:
+            column = np.fromiter((entry.get(field) for entry in snapshot.entries),
+                                 dtype=object, count=len(snapshot.entries))
+            snapshot.columns[field] = column
+        return column
+    
+    def _nulls(self, snapshot: _Snapshot, field: str) -> "np.ndarray":
+        """値がNoneの行"""
+        nulls = snapshot.nulls.get(field)
+        if nulls is None:
+            column = self._column(snapshot, field)
+            nulls = np.fromiter((value is None for value in column), dtype=bool, count=len(column))
+            snapshot.nulls[field] = nulls
+        return nulls
+    
+    def _text(self, snapshot: _Snapshot, field: str) -> "np.ndarray":
+        """
+        小文字化した文字列の配列（Noneの行は空文字）
+        
+        固定長の文字列型（行数 x 最長の値の長さ）にすると長い自由記述のフィールドで
+        メモリを大量に使うため、Pythonの文字列を参照するobject型にする
+        """
+        texts = snapshot.texts.get(field)
+        if texts is None:
+            column = self._column(snapshot, field)
+            texts = np.fromiter((str(value).lower() if value is not None else '' for value in column),
+                                dtype=object, count=len(column))
+            snapshot.texts[field] = texts
+        return texts
+    
+    def _search_joined(self, snapshot: _Snapshot, field: str, needle: str) -> "np.ndarray":
+        """
+        連結文字列を検索し、needleを含む行を取得
+        
+        連結文字列は「区切り文字 + 行1 + 区切り文字 + 行2 + ... + 区切り文字」の形。
+        str.findで一致位置を集め、区切り文字の位置との二分探索でまとめて行に変換する
+        """
+        joined = snapshot.joined.get(field)
+        if joined is None:
+            texts = self._text(snapshot, field)
+            lengths = np.fromiter((len(text) + 1 for text in texts), dtype=np.int64, count=len(texts))
+            # 各行の直前の区切り文字の位置
+            starts = np.concatenate(([0], np.cumsum(lengths)))
+            joined = (ROW_SEPARATOR + ROW_SEPARATOR.join(texts) + ROW_SEPARATOR, starts)
+            snapshot.joined[field] = joined
+        
+        text, starts = joined
+        find = text.find
+        step = len(needle)
+        
+        positions = []
+        position = find(needle)
+        while position >= 0:
+            positions.append(position)
+            position = find(needle, position + step)
+        
+        mask = np.zeros(len(starts) - 1, dtype=bool)
+        if positions:
+            # 区切り文字から始まる一致（前方一致）はその区切り文字の直後の行に属する
+            mask[np.searchsorted(starts, positions, side='right') - 1] = True
+        return mask
+    
+    def _typed(self, snapshot: _Snapshot, field: str) -> "np.ndarray":
+        """スキーマに従って型変換した配列（変換できない値はNaT/NaN）"""
+        typed = snapshot.typed.get(field)
+        if typed is None:
+            # エントリが保持している変換結果を使う
+            typed = np.array([entry.get_typed(field) for entry in snapshot.entries],
+                             dtype=TYPED_DTYPES[FIELD_SCHEMA[field]])
+            snapshot.typed[field] = typed
+        return typed
+    
+    def _factorize(self, snapshot: _Snapshot, field: str) -> Optional[Tuple["np.ndarray", List]]:
+        """値を種類ごとの整数コードに変換（ハッシュ不可能な値を含む場合はNone）"""
+        if field in snapshot.factors:
+            return snapshot.factors[field]
+        
+        column = self._column(snapshot, field)
+        mapping = {}
+        try:
+            # True と 1 などを区別するため型も含めて分類
+            codes = np.fromiter(
+                (mapping.setdefault((value.__class__, value), len(mapping)) for value in column),
+                dtype=np.int64, count=len(column)
+            )
+            factors = (codes, [value for _, value in mapping])
+        except TypeError:
+            factors = None
+        
+        snapshot.factors[field] = factors
+        return factors
+    
+    @staticmethod
+    def _map(values: "np.ndarray", predicate: Callable) -> "np.ndarray":
+        """判定関数を値ごとに評価"""
+        return np.fromiter((predicate(value) for value in values), dtype=bool, count=len(values))
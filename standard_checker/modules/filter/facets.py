@@ -0,0 +1,105 @@
+"""
+ファセット集計モジュール
+フィルター結果のフィールド値ごとの件数を、結果を作るのと同じ走査で集計する
+"""
+
+from typing import Dict, Iterable, Iterator, Tuple
+
+from modules.standards.schema import coerce_field
+
+# 集計するファセット
+FACET_FIELDS = ('type', 'status', 'directive', 'source', 'version_year')
+
+# フィールド値から求めるファセット（ファセット名 -> 元のフィールド）
+DERIVED_FACETS = {
+    'version_year': 'version',
+}
+
+
+def facet_value(standard, facet: str):
+    """標準規格（辞書またはエントリ）のファセットの値"""
+    field = DERIVED_FACETS.get(facet)
+    if field is None:
+        return standard.get(facet)
+    
+    # エントリは型変換済みの値を再利用する
+    get_typed = getattr(standard, 'get_typed', None)
+    return get_typed(field) if get_typed is not None else coerce_field(field, standard.get(field))
+
+
+def _sorted_counts(counts: Dict) -> Dict:
+    """件数の多い順（同数は値の文字列順）に並べる"""
+    return dict(sorted(counts.items(), key=lambda item: (-item[1], str(item[0]))))
+
+
+class FacetCounter:
+    """
+    ファセットの件数を数えるクラス
+    
+    iter() でフィルター結果の走査に組み込むと、結果の作成と同じ1回の走査で集計できる
+    """
+    
+    def __init__(self, facets: Tuple[str, ...] = FACET_FIELDS):
+        self.facets = facets
+        self.total = 0
+        self.counts: Dict[str, Dict] = {facet: {} for facet in facets}
+    
+    def add(self, standard):
+        """1件を集計"""
+        self.total += 1
+        for facet in self.facets:
+            value = facet_value(standard, facet)
+            counts = self.counts[facet]
+            try:
+                counts[value] = counts.get(value, 0) + 1
+            except TypeError:
+                # ハッシュ不可能な値は文字列として数える
+                value = str(value)
+                counts[value] = counts.get(value, 0) + 1
+    
+    def iter(self, standards: Iterable) -> Iterator:
+        """標準規格を集計しながらそのまま返す"""
+        for standard in standards:
+            self.add(standard)
+            yield standard
+    
+    def to_dict(self) -> Dict[str, Dict]:
+        """ファセットごとの件数"""
+        return {facet: _sorted_counts(counts) for facet, counts in self.counts.items()}
+
+
+def registry_facets(registry, facets: Tuple[str, ...] = FACET_FIELDS) -> Dict[str, Dict]:
+    """
+    レジストリ全体のファセットの件数
+    
+    レジストリが差分更新している副索引（値 -> IDの集合）から求めるため、全件の走査は不要。
+    索引を持たない（またはハッシュ不可能な値を含む）フィールドは全件を数える
+    """
+    counts = {}
+    scan = []
+    
+    for facet in facets:
+        field = DERIVED_FACETS.get(facet, facet)
+        index = registry.get_field_index(field)
+        if index is None:
+            scan.append(facet)
+            continue
+        
+        if field == facet:
+            counts[facet] = {value: len(ids) for value, ids in index.items()}
+            continue
+        
+        # 派生ファセットは索引の値ごとに変換して合算（値の種類は件数よりずっと少ない）
+        derived = {}
+        for value, ids in index.items():
+            key = coerce_field(field, value)
+            derived[key] = derived.get(key, 0) + len(ids)
+        counts[facet] = derived
+    
+    if scan:
+        counter = FacetCounter(tuple(scan))
+        for entry in registry.standards.values():
+            counter.add(entry)
+        counts.update(counter.counts)
+    
+    return {facet: _sorted_counts(counts[facet]) for facet in facets}
@@ -4,10 +4,18 @@
 """
 
 import re
+import heapq
 import logging
-from typing import List, Dict, Optional, Callable
+from typing import List, Dict, Optional, Callable, Iterable, Iterator, Tuple
 from datetime import datetime, timedelta
+from operator import gt, lt, ge, le
 from enum import Enum
+from itertools import islice
+
+from modules.export.exporter import StreamingExporter, collect_columns
+from modules.standards.schema import FIELD_SCHEMA, COERCERS, coerce_datetime, coerce_field
+from modules.filter.safe_regex import compile_guarded, RegexBudgetExceeded, UnsafePatternError
+from modules.filter.facets import FacetCounter
 
 class FilterOperator(Enum):
     """フィルター演算子"""
@@ -22,6 +30,91 @@ class FilterOperator(Enum):
     NOT_IN = "not_in"
     REGEX = "regex"
 
+# 比較演算子
+COMPARATORS = {
+    '>': gt,
+    '<': lt,
+    '>=': ge,
+    '<=': le,
+}
+
+def field_sort_key(field: str, descending: bool = False) -> Callable:
+    """
+    フィールド値で並べ替えるキー関数を作成
+    
+    スキーマのフィールドは型変換した値（日時・西暦年）、それ以外は文字列で比較する。
+    値がない（変換できない）標準規格は並び順によらず末尾になる
+    """
+    typed = field in FIELD_SCHEMA
+    
+    def value_of(standard):
+        if typed:
+            get_typed = getattr(standard, 'get_typed', None)
+            return get_typed(field) if get_typed is not None else coerce_field(field, standard.get(field))
+        value = standard.get(field)
+        return None if value is None or value == '' else str(value)
+    
+    if descending:
+        def key(standard):
+            value = value_of(standard)
+            return (value is not None, value)
+    else:
+        def key(standard):
+            value = value_of(standard)
+            return (value is None, value)
+    return key
+
+def select_top(standards: Iterable, k: int, order_by: str, descending: bool = True) -> List:
+    """指定フィールドの値で上位k件を選ぶ（k件のヒープを使い、同じ値は入力の順序を保つ）"""
+    select = heapq.nlargest if descending else heapq.nsmallest
+    return select(max(k, 0), standards, key=field_sort_key(order_by, descending))
+
+class CompiledFilter:
+    """
+    コンパイル済みフィルター
+    
+    条件ごとに定数（小文字化した文字列、解析済みの日付・数値、コンパイル済み正規表現）を
+    束縛した判定関数を保持する。生成後は変更されないため、複数スレッド・リクエストで共有できる。
+    """
+    
+    __slots__ = ('conditions', '_predicates')
+    
+    def __init__(self, conditions: Iterable[Dict], filter_obj: Optional["StandardFilter"] = None):
+        filter_obj = filter_obj or StandardFilter()
+        self.conditions: Tuple[Dict, ...] = tuple(dict(c) for c in conditions)
+        self._predicates = tuple(
+            (c['field'], filter_obj._compile_condition(c)) for c in self.conditions
+        )
+    
+    def __len__(self) -> int:
+        return len(self.conditions)
+    
+    def matches(self, standard: Dict) -> bool:
+        """標準規格が全ての条件を満たすかチェック"""
+        for field, predicate in self._predicates:
+            if not predicate(standard.get(field)):
+                return False
+        return True
+    
+    __call__ = matches
+    
+    def items(self) -> Iterator[Tuple[Dict, Callable]]:
+        """条件とその判定関数の組を順に返す"""
+        for condition, (_, predicate) in zip(self.conditions, self._predicates):
+            yield condition, predicate
+    
+    def filter(self, standards: Iterable[Dict]) -> List[Dict]:
+        """条件を満たす標準規格のリストを取得"""
+        if not self._predicates:
+            return list(standards)
+        return [s for s in standards if self.matches(s)]
+    
+    def iter(self, standards: Iterable[Dict]) -> Iterator[Dict]:
+        """条件を満たす標準規格を1件ずつ返す"""
+        for standard in standards:
+            if self.matches(standard):
+                yield standard
+
 class StandardFilter:
     """標準規格フィルタークラス"""
     
@@ -31,40 +124,105 @@ class StandardFilter:
     
     def add_filter(self, field: str, operator: FilterOperator, value, label: str = None):
         """フィルター条件を追加"""
-        filter_condition = {
+        self.filters.append(self._make_condition(field, operator, value, label))
+        return self
+    
+    @staticmethod
+    def _make_condition(field: str, operator: FilterOperator, value, label: str = None) -> Dict:
+        """フィルター条件の辞書を作成"""
+        return {
             'field': field,
             'operator': operator,
             'value': value,
             'label': label or f"{field} {operator.value} {value}"
         }
-        self.filters.append(filter_condition)
-        return self
     
     def clear_filters(self):
         """全てのフィルターをクリア"""
         self.filters = []
         return self
     
+    def compile(self, **kwargs) -> CompiledFilter:
+        """
+        登録済みの条件とキーワード引数の条件をコンパイル
+        
+        キーワード引数の条件はこのフィルターには追加されない
+        """
+        return CompiledFilter(self.filters + self._create_filters_from_kwargs(**kwargs), self)
+    
     def apply_filters(self, standards: List[Dict], **kwargs) -> List[Dict]:
         """フィルターを適用"""
-        # キーワード引数からフィルターを作成
-        if kwargs:
-            self._create_filters_from_kwargs(**kwargs)
-        
-        if not self.filters:
+        compiled = self.compile(**kwargs)
+        if not compiled:
             return standards
         
-        filtered_standards = []
-        
-        for standard in standards:
-            if self._evaluate_standard(standard):
-                filtered_standards.append(standard)
+        filtered_standards = compiled.filter(standards)
         
         self.logger.info(f"フィルター適用: {len(standards)} -> {len(filtered_standards)}件")
         return filtered_standards
     
-    def _create_filters_from_kwargs(self, **kwargs):
-        """キーワード引数からフィルターを作成"""
+    def apply_with_facets(self, standards: Iterable[Dict], **kwargs) -> Tuple[List[Dict], Dict[str, Dict]]:
+        """フィルターを適用し、結果とそのファセットの件数（種類・ステータス等）を1回の走査で取得"""
+        counter = FacetCounter()
+        filtered_standards = list(counter.iter(self.iter_filters(standards, **kwargs)))
+        return filtered_standards, counter.to_dict()
+    
+    def apply_columnar(self, view, **kwargs) -> List[Dict]:
+        """列指向ビュー（ColumnarView）に対してフィルターを適用（結果はapply_filtersと同一）"""
+        filtered_standards = view.filter(self.compile(**kwargs))
+        
+        self.logger.info(f"フィルター適用（列指向）: {len(view)} -> {len(filtered_standards)}件")
+        return filtered_standards
+    
+    def apply_indexed(self, registry, **kwargs) -> List[Dict]:
+        """レジストリの副索引で候補を絞り込んでフィルターを適用（結果はapply_filtersと同一）"""
+        from modules.filter.planner import QueryPlanner
+        
+        plan = QueryPlanner(registry).plan(self.compile(**kwargs))
+        filtered_standards = plan.execute()
+        
+        self.logger.info(f"フィルター適用（索引）: {len(registry.standards)} -> {len(filtered_standards)}件")
+        return filtered_standards
+    
+    def apply_batch(self, standards: Iterable[Dict], profiles: Dict[str, Dict]) -> Dict[str, List[str]]:
+        """
+        複数のプロファイル（名前 -> キーワード引数の条件）を1回の走査でまとめて評価
+        
+        登録済みの条件は全プロファイルに共通で適用する。
+        
+        Returns:
+            プロファイルごとの条件を満たす標準規格IDのリスト
+        """
+        from modules.filter.batch import evaluate_batch
+        
+        compiled = {name: self.compile(**kwargs) for name, kwargs in profiles.items()}
+        results = evaluate_batch(standards, compiled)
+        
+        self.logger.info(f"一括フィルター適用: {len(profiles)}件のプロファイル")
+        return results
+    
+    def iter_filters(self, standards: Iterable[Dict], limit: Optional[int] = None, **kwargs) -> Iterator[Dict]:
+        """
+        フィルターを適用し、条件を満たす標準規格を1件ずつ返す
+        
+        standardsは任意のイテラブル（レジストリのiter_standards等）で、
+        limitを指定するとその件数に達した時点で走査を打ち切る
+        """
+        compiled = self.compile(**kwargs)
+        iterator = compiled.iter(standards) if compiled else iter(standards)
+        return iterator if limit is None else islice(iterator, max(limit, 0))
+    
+    def top_k(self, standards: Iterable[Dict], k: int, order_by: str, descending: bool = True,
+              **kwargs) -> List[Dict]:
+        """
+        フィルターを適用し、指定フィールドの値で上位k件を取得（例: 更新日時の新しい20件）
+        
+        条件を満たす標準規格はk件のヒープで選ぶため、全件の結果リストは作らない
+        """
+        return select_top(self.iter_filters(standards, **kwargs), k, order_by, descending)
+    
+    def _create_filters_from_kwargs(self, **kwargs) -> List[Dict]:
+        """キーワード引数からフィルター条件を作成"""
         # 一般的なフィルター条件
         filter_mappings = {
             'status': ('status', FilterOperator.EQUALS),
@@ -75,135 +233,165 @@ class StandardFilter:
             'version': ('version', FilterOperator.EQUALS),
         }
         
+        conditions = []
         for key, value in kwargs.items():
             if value is None:
                 continue
-                
+            
             if key in filter_mappings:
                 field, operator = filter_mappings[key]
-                self.add_filter(field, operator, value)
+                conditions.append(self._make_condition(field, operator, value))
             elif key == 'date_start':
-                self.add_filter('extracted_at', FilterOperator.GREATER_THAN, value)
+                conditions.append(self._make_condition('extracted_at', FilterOperator.GREATER_THAN, value))
             elif key == 'date_end':
-                self.add_filter('extracted_at', FilterOperator.LESS_THAN, value)
+                conditions.append(self._make_condition('extracted_at', FilterOperator.LESS_THAN, value))
             elif key == 'has_etsi_info':
-                self.add_filter('etsi_info', FilterOperator.NOT_IN, [None, ''])
+                conditions.append(self._make_condition('etsi_info', FilterOperator.NOT_IN, [None, '']))
             elif key == 'has_version':
-                self.add_filter('version', FilterOperator.NOT_IN, [None, ''])
-    
-    def _evaluate_standard(self, standard: Dict) -> bool:
-        """個別の標準規格がフィルター条件を満たすかチェック"""
-        for filter_condition in self.filters:
-            if not self._evaluate_filter_condition(standard, filter_condition):
-                return False
-        return True
+                conditions.append(self._make_condition('version', FilterOperator.NOT_IN, [None, '']))
+        
+        return conditions
     
-    def _evaluate_filter_condition(self, standard: Dict, filter_condition: Dict) -> bool:
-        """個別のフィルター条件を評価"""
-        field = filter_condition['field']
+    def _compile_condition(self, filter_condition: Dict) -> Callable:
+        """個別のフィルター条件を、フィールド値を受け取る判定関数にコンパイル"""
         operator = filter_condition['operator']
         filter_value = filter_condition['value']
         
-        # フィールド値を取得
-        standard_value = standard.get(field)
-        
-        # None値の処理
-        if standard_value is None:
-            return operator == FilterOperator.IN and None in filter_value
+        # None値は IN で None を含む場合のみ一致
+        none_result = operator == FilterOperator.IN and None in filter_value
         
-        # 演算子に応じた評価
         try:
-            if operator == FilterOperator.EQUALS:
-                return str(standard_value).lower() == str(filter_value).lower()
-            
-            elif operator == FilterOperator.CONTAINS:
-                return str(filter_value).lower() in str(standard_value).lower()
-            
-            elif operator == FilterOperator.STARTS_WITH:
-                return str(standard_value).lower().startswith(str(filter_value).lower())
-            
-            elif operator == FilterOperator.ENDS_WITH:
-                return str(standard_value).lower().endswith(str(filter_value).lower())
-            
-            elif operator == FilterOperator.GREATER_THAN:
-                return self._compare_values(standard_value, filter_value, '>')
-            
-            elif operator == FilterOperator.LESS_THAN:
-                return self._compare_values(standard_value, filter_value, '<')
-            
-            elif operator == FilterOperator.BETWEEN:
-                if len(filter_value) != 2:
-                    return False
-                return (self._compare_values(standard_value, filter_value[0], '>=') and 
-                        self._compare_values(standard_value, filter_value[1], '<='))
-            
-            elif operator == FilterOperator.IN:
-                return standard_value in filter_value
-            
-            elif operator == FilterOperator.NOT_IN:
-                return standard_value not in filter_value
-            
-            elif operator == FilterOperator.REGEX:
-                return bool(re.search(filter_value, str(standard_value), re.IGNORECASE))
-            
-            else:
-                self.logger.warning(f"未知のフィルター演算子: {operator}")
-                return True
-                
+            match = self._compile_operator(operator, filter_value, filter_condition['field'])
+        except UnsafePatternError:
+            # 危険な正規表現は一致なしにせず呼び出し元にエラーとして返す
+            raise
         except Exception as e:
-            self.logger.error(f"フィルター評価エラー: {str(e)}")
-            return False
+            self.logger.error(f"フィルターコンパイルエラー: {str(e)}")
+            match = lambda value: False
+        
+        logger = self.logger
+        
+        def predicate(value) -> bool:
+            if value is None:
+                return none_result
+            try:
+                return match(value)
+            except RegexBudgetExceeded:
+                raise
+            except Exception as e:
+                logger.error(f"フィルター評価エラー: {str(e)}")
+                return False
+        
+        return predicate
+    
+    def _compile_operator(self, operator: FilterOperator, filter_value, field: Optional[str] = None) -> Callable:
+        """演算子と定数から判定関数を作成（定数の変換はここで1回だけ行う）"""
+        if operator == FilterOperator.EQUALS:
+            lowered = str(filter_value).lower()
+            return lambda value: str(value).lower() == lowered
+        
+        elif operator == FilterOperator.CONTAINS:
+            lowered = str(filter_value).lower()
+            return lambda value: lowered in str(value).lower()
+        
+        elif operator == FilterOperator.STARTS_WITH:
+            lowered = str(filter_value).lower()
+            return lambda value: str(value).lower().startswith(lowered)
+        
+        elif operator == FilterOperator.ENDS_WITH:
+            lowered = str(filter_value).lower()
+            return lambda value: str(value).lower().endswith(lowered)
+        
+        elif operator == FilterOperator.GREATER_THAN:
+            return self._compile_comparison(filter_value, '>', field)
+        
+        elif operator == FilterOperator.LESS_THAN:
+            return self._compile_comparison(filter_value, '<', field)
+        
+        elif operator == FilterOperator.BETWEEN:
+            if len(filter_value) != 2:
+                return lambda value: False
+            lower = self._compile_comparison(filter_value[0], '>=', field)
+            upper = self._compile_comparison(filter_value[1], '<=', field)
+            return lambda value: lower(value) and upper(value)
+        
+        elif operator == FilterOperator.IN:
+            return self._compile_membership(filter_value)
+        
+        elif operator == FilterOperator.NOT_IN:
+            contains = self._compile_membership(filter_value)
+            return lambda value: not contains(value)
+        
+        elif operator == FilterOperator.REGEX:
+            search = compile_guarded(filter_value, re.IGNORECASE).search
+            return lambda value: search(str(value)) is not None
+        
+        else:
+            self.logger.warning(f"未知のフィルター演算子: {operator}")
+            return lambda value: True
+    
+    def _compile_comparison(self, filter_value, op: str, field: Optional[str] = None) -> Callable:
+        """
+        大小比較の判定関数を作成
+        
+        スキーマで型が決まっているフィールドは型変換済みの値同士をそのまま比較する。
+        それ以外（または変換できない値）は、定数側の日付・数値判定と変換を事前に行い、
+        両方日付 -> 両方数値 -> 文字列 の優先順で比較する
+        """
+        compare = COMPARATORS[op]
+        legacy = self._compile_untyped_comparison(filter_value, compare)
+        
+        if field not in FIELD_SCHEMA:
+            return legacy
+        
+        coerce = COERCERS[FIELD_SCHEMA[field]]
+        typed_const = coerce(filter_value)
+        if typed_const is None:
+            return legacy
+        
+        def typed_comparison(value) -> bool:
+            typed_value = coerce(value)
+            if typed_value is None:
+                return legacy(value)
+            return compare(typed_value, typed_const)
+        
+        return typed_comparison
     
-    def _compare_values(self, value1, value2, operator: str) -> bool:
-        """値を比較"""
+    def _compile_untyped_comparison(self, filter_value, compare: Callable) -> Callable:
+        """型が決まっていない値の大小比較関数を作成"""
+        const_date = self._parse_date(filter_value) if self._is_date_string(filter_value) else None
+        const_number = float(filter_value) if self._is_numeric(filter_value) else None
+        const_text = str(filter_value).lower()
+        
+        def comparison(value) -> bool:
+            if const_date is not None and self._is_date_string(value):
+                return compare(self._parse_date(value), const_date)
+            if const_number is not None and self._is_numeric(value):
+                return compare(float(value), const_number)
+            return compare(str(value).lower(), const_text)
+        
+        return comparison
+    
+    @staticmethod
+    def _compile_membership(filter_value) -> Callable:
+        """IN判定関数を作成（候補がハッシュ可能な場合は集合で判定）"""
+        if not isinstance(filter_value, (list, tuple, set, frozenset)):
+            return lambda value: value in filter_value
+        
+        items = tuple(filter_value)
         try:
-            # 日付の比較
-            if self._is_date_string(value1) and self._is_date_string(value2):
-                date1 = self._parse_date(value1)
-                date2 = self._parse_date(value2)
-                
-                if operator == '>':
-                    return date1 > date2
-                elif operator == '<':
-                    return date1 < date2
-                elif operator == '>=':
-                    return date1 >= date2
-                elif operator == '<=':
-                    return date1 <= date2
-            
-            # 数値の比較
-            elif self._is_numeric(value1) and self._is_numeric(value2):
-                num1 = float(value1)
-                num2 = float(value2)
-                
-                if operator == '>':
-                    return num1 > num2
-                elif operator == '<':
-                    return num1 < num2
-                elif operator == '>=':
-                    return num1 >= num2
-                elif operator == '<=':
-                    return num1 <= num2
-            
-            # 文字列の比較
-            else:
-                str1 = str(value1).lower()
-                str2 = str(value2).lower()
-                
-                if operator == '>':
-                    return str1 > str2
-                elif operator == '<':
-                    return str1 < str2
-                elif operator == '>=':
-                    return str1 >= str2
-                elif operator == '<=':
-                    return str1 <= str2
-            
-            return False
-            
-        except Exception as e:
-            self.logger.error(f"値比較エラー: {str(e)}")
-            return False
+            members = frozenset(items)
+        except TypeError:
+            return lambda value: value in items
+        
+        def contains(value) -> bool:
+            try:
+                return value in members
+            except TypeError:
+                # 辞書などハッシュ不可能な値は線形探索
+                return value in items
+        
+        return contains
     
     def _is_date_string(self, value: str) -> bool:
         """文字列が日付形式かチェック"""
@@ -258,19 +446,19 @@ class StandardFilter:
     def filter_by_date_range(self, standards: List[Dict], start_date: str, end_date: str) -> List[Dict]:
         """日付範囲でフィルタリング"""
         try:
-            start_dt = self._parse_date(start_date)
-            end_dt = self._parse_date(end_date)
+            start_dt = coerce_datetime(start_date) or self._parse_date(start_date)
+            end_dt = coerce_datetime(end_date) or self._parse_date(end_date)
             
             filtered = []
             for standard in standards:
                 extracted_at = standard.get('extracted_at', '')
                 if extracted_at:
-                    standard_dt = self._parse_date(extracted_at)
+                    standard_dt = coerce_datetime(extracted_at) or self._parse_date(extracted_at)
                     if start_dt <= standard_dt <= end_dt:
                         filtered.append(standard)
             
             return filtered
-            
+        
         except Exception as e:
             self.logger.error(f"日付範囲フィルターエラー: {str(e)}")
             return standards
@@ -315,21 +503,17 @@ class StandardFilter:
     def export_filtered_results(self, filtered_standards: List[Dict], output_path: str):
         """フィルタリング結果をエクスポート"""
         try:
-            import pandas as pd
-            
-            df = pd.DataFrame(filtered_standards)
+            exporter = StreamingExporter(columns=collect_columns(filtered_standards))
             
             if output_path.endswith('.csv'):
-                df.to_csv(output_path, index=False)
+                exporter.write_csv(filtered_standards, output_path)
             elif output_path.endswith('.xlsx'):
-                df.to_excel(output_path, index=False)
+                exporter.write_xlsx({'Sheet1': filtered_standards}, output_path)
             else:
-                import json
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(filtered_standards, f, ensure_ascii=False, indent=2)
+                exporter.write_json(filtered_standards, output_path)
             
             self.logger.info(f"フィルタリング結果をエクスポート: {output_path}")
-            
+        
         except Exception as e:
             self.logger.error(f"エクスポートエラー: {str(e)}")
             raise
\ No newline at end of file
@@ -0,0 +1,203 @@
+"""
+フィルター実行計画モジュール
+レジストリの副索引で候補を絞り込み、残りの条件を推定コストと選択率の順に評価する
+"""
+
+import logging
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from modules.filter.filter import CompiledFilter, FilterOperator
+
+# 演算子ごとの1行あたりの推定コスト（相対値）
+OPERATOR_COSTS = {
+    FilterOperator.EQUALS: 1,
+    FilterOperator.IN: 1,
+    FilterOperator.NOT_IN: 1,
+    FilterOperator.STARTS_WITH: 2,
+    FilterOperator.ENDS_WITH: 2,
+    FilterOperator.CONTAINS: 3,
+    FilterOperator.GREATER_THAN: 5,
+    FilterOperator.LESS_THAN: 5,
+    FilterOperator.BETWEEN: 8,
+    FilterOperator.REGEX: 20,
+}
+
+# 索引がない場合の推定選択率（条件を満たす行の割合）
+DEFAULT_SELECTIVITY = {
+    FilterOperator.EQUALS: 0.1,
+    FilterOperator.IN: 0.3,
+    FilterOperator.NOT_IN: 0.9,
+    FilterOperator.STARTS_WITH: 0.2,
+    FilterOperator.ENDS_WITH: 0.2,
+    FilterOperator.CONTAINS: 0.3,
+    FilterOperator.GREATER_THAN: 0.5,
+    FilterOperator.LESS_THAN: 0.5,
+    FilterOperator.BETWEEN: 0.3,
+    FilterOperator.REGEX: 0.3,
+}
+
+# 索引で求めた候補がこの割合を超える条件は、候補の絞り込みに使わず行ごとに評価する
+INDEX_SELECTIVITY_LIMIT = 0.5
+
+
+class _Step:
+    """計画の1条件（評価順の決定に使う推定値を保持）"""
+    
+    __slots__ = ('condition', 'predicate', 'cost', 'selectivity', 'ids')
+    
+    def __init__(self, condition: Dict, predicate: Callable, cost: float, selectivity: float,
+                 ids: Optional[Set[str]] = None):
+        self.condition = condition
+        self.predicate = predicate
+        self.cost = cost
+        self.selectivity = selectivity
+        self.ids = ids
+    
+    @property
+    def rank(self) -> float:
+        """評価順の指標（安価で多くの行を落とす条件ほど小さい）"""
+        if self.selectivity >= 1:
+            return float('inf')
+        return self.cost / (1 - self.selectivity)
+    
+    def describe(self) -> Dict:
+        """条件の推定値"""
+        return {
+            'field': self.condition['field'],
+            'operator': self.condition['operator'].value,
+            'cost': self.cost,
+            'selectivity': round(self.selectivity, 4),
+        }
+
+
+class QueryPlan:
+    """
+    フィルターの実行計画
+    
+    候補ID（索引で絞り込んだ結果、索引を使わない場合はNone）と、
+    候補に対して評価する残りの条件（評価順）を保持する
+    """
+    
+    def __init__(self, registry, index_steps: List[_Step], residual_steps: List[_Step],
+                 candidate_ids: Optional[Set[str]]):
+        self.registry = registry
+        self.index_steps = index_steps
+        self.residual_steps = residual_steps
+        self.candidate_ids = candidate_ids
+        self._predicates: Tuple[Tuple[str, Callable], ...] = tuple(
+            (step.condition['field'], step.predicate) for step in residual_steps
+        )
+    
+    @property
+    def uses_index(self) -> bool:
+        """索引で候補を絞り込むか"""
+        return self.candidate_ids is not None
+    
+    def iter_entries(self) -> Iterator:
+        """条件を満たすエントリを番号の自然順に返す"""
+        if self.candidate_ids is None:
+            entries = self.registry.sorted_entries()
+        else:
+            entries = self.registry.entries_in_order(self.candidate_ids)
+        
+        predicates = self._predicates
+        for entry in entries:
+            for field, predicate in predicates:
+                if not predicate(entry.get(field)):
+                    break
+            else:
+                yield entry
+    
+    def execute(self) -> List[Dict]:
+        """計画を実行し、条件を満たす標準規格を辞書形式で取得"""
+        return [entry.to_dict() for entry in self.iter_entries()]
+    
+    def describe(self) -> Dict:
+        """計画の内容（索引で処理する条件、候補件数、残りの条件の評価順）"""
+        return {
+            'total': len(self.registry.standards),
+            'candidates': None if self.candidate_ids is None else len(self.candidate_ids),
+            'index_conditions': [step.describe() for step in self.index_steps],
+            'residual_conditions': [step.describe() for step in self.residual_steps],
+        }
+
+
+class QueryPlanner:
+    """レジストリの副索引を使ってフィルターの実行計画を作成するクラス"""
+    
+    def __init__(self, registry):
+        self.logger = logging.getLogger(__name__)
+        self.registry = registry
+    
+    def plan(self, compiled: CompiledFilter) -> QueryPlan:
+        """
+        実行計画を作成
+        
+        副索引を持つフィールドの条件は、索引の値ごとに判定関数を評価して該当IDを求める。
+        該当IDが十分少ない条件は候補の絞り込み（集合の積）に使い、それ以外の条件は
+        推定コスト / (1 - 選択率) の小さい順に並べて候補ごとに評価する
+        """
+        total = len(self.registry.standards)
+        index_steps = []
+        residual_steps = []
+        
+        for condition, predicate in compiled.items():
+            operator = condition['operator']
+            cost = OPERATOR_COSTS.get(operator, 1)
+            ids = self._lookup(condition, predicate)
+            
+            if ids is None:
+                selectivity = DEFAULT_SELECTIVITY.get(operator, 1.0)
+                residual_steps.append(_Step(condition, predicate, cost, selectivity))
+                continue
+            
+            # 索引で求めた件数から正確な選択率がわかる
+            step = _Step(condition, predicate, cost, len(ids) / total if total else 0.0, ids)
+            if step.selectivity <= INDEX_SELECTIVITY_LIMIT:
+                index_steps.append(step)
+            else:
+                residual_steps.append(step)
+        
+        candidate_ids = None
+        if index_steps:
+            # 小さい集合から順に積をとる
+            index_steps.sort(key=lambda step: len(step.ids))
+            candidate_ids = set(index_steps[0].ids)
+            for step in index_steps[1:]:
+                if not candidate_ids:
+                    break
+                candidate_ids &= step.ids
+        
+        residual_steps.sort(key=lambda step: step.rank)
+        return QueryPlan(self.registry, index_steps, residual_steps, candidate_ids)
+    
+    def execute(self, compiled: CompiledFilter) -> List[Dict]:
+        """実行計画を作成して実行"""
+        return self.plan(compiled).execute()
+    
+    def _lookup(self, condition: Dict, predicate: Callable) -> Optional[Set[str]]:
+        """副索引から条件を満たすIDの集合を求める（索引がない場合はNone）"""
+        index = self.registry.get_field_index(condition['field'])
+        if index is None:
+            return None
+        
+        operator = condition['operator']
+        filter_value = condition['value']
+        
+        if operator == FilterOperator.IN and isinstance(filter_value, (list, tuple, set, frozenset)):
+            groups = []
+            for value in filter_value:
+                try:
+                    ids = index.get(value)
+                except TypeError:
+                    # ハッシュ不可能な候補は索引の値と一致しない
+                    continue
+                if ids:
+                    groups.append(ids)
+        else:
+            # 索引の値ごとに判定関数を評価（値の種類は行数よりずっと少ない）
+            groups = [ids for value, ids in index.items() if predicate(value)]
+        
+        if len(groups) == 1:
+            return groups[0]
+        return set().union(*groups)
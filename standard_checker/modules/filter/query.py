@@ -0,0 +1,369 @@
+"""
+フィルタークエリ言語モジュール
+AND/OR/NOT・括弧・ネストしたフィールドパスを持つ条件式を解析し、判定関数にコンパイルする
+
+例:
+    status = Active AND (directive contains RED OR NOT type in [IEC, ISO])
+    etsi_info.versions.status = Published AND extracted_at between ["2024-01-01", "2024-06-30"]
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from modules.filter.filter import FilterOperator, StandardFilter
+from modules.filter.safe_regex import validate_pattern, UnsafePatternError
+from modules.standards.registry import StandardEntry
+
+# 解析・コンパイル結果のキャッシュ上限（クエリ文字列ごと）
+QUERY_CACHE_SIZE = 256
+
+# クエリ文字列の最大長と、NOT・括弧の最大の入れ子の深さ
+MAX_QUERY_LENGTH = 4096
+MAX_QUERY_DEPTH = 32
+
+# 記号の演算子（!= は等価の否定）
+SYMBOL_OPERATORS = {
+    '=': FilterOperator.EQUALS,
+    '==': FilterOperator.EQUALS,
+    '!=': FilterOperator.EQUALS,
+    '>': FilterOperator.GREATER_THAN,
+    '<': FilterOperator.LESS_THAN,
+    '~': FilterOperator.REGEX,
+}
+
+# 単語の演算子（FilterOperatorの値、大文字小文字を区別しない）
+WORD_OPERATORS = {operator.value: operator for operator in FilterOperator}
+
+# 値にリストを取る演算子
+LIST_OPERATORS = (FilterOperator.IN, FilterOperator.NOT_IN, FilterOperator.BETWEEN)
+
+TOKEN_PATTERN = re.compile(r'''
+    \s*(?:
+        (?P<punct>[()\[\],])
+      | (?P<symbol>==|!=|=|>|<|~)
+      | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<word>[^\s()\[\],=!<>~"']+)
+    )
+''', re.VERBOSE)
+
+FIELD_PATTERN = re.compile(r'^[A-Za-z_]\w*(\.[A-Za-z_]\w*)*$')
+
+
+class QuerySyntaxError(ValueError):
+    """クエリの構文エラー"""
+    
+    def __init__(self, message: str, position: int):
+        super().__init__(f"{message}（位置 {position}）")
+        self.position = position
+
+
+def _unescape(text: str) -> str:
+    """
+    引用符付き文字列の中身（バックスラッシュで外すのはバックスラッシュ自身と引用符だけ）
+    
+    それ以外のバックスラッシュは残すため、正規表現のエスケープ（\\s など）をそのまま書ける
+    """
+    quote = text[0]
+    return re.sub(r'\\([\\' + quote + '])', r'\1', text[1:-1])
+
+
+def tokenize(query: str) -> List[Tuple[str, object, int]]:
+    """クエリを (種類, 値, 位置) のトークン列に分割"""
+    tokens = []
+    position = 0
+    end = len(query.rstrip())
+    
+    while position < end:
+        match = TOKEN_PATTERN.match(query, position)
+        if match is None:
+            raise QuerySyntaxError("不正な文字があります", position)
+        
+        kind = match.lastgroup
+        start = match.start(kind)
+        text = match.group(kind)
+        if kind == 'string':
+            tokens.append(('string', _unescape(text), start))
+        else:
+            tokens.append((kind, text, start))
+        position = match.end()
+    
+    return tokens
+
+
+class _Parser:
+    """再帰下降パーサー（AST はタプルで表す）"""
+    
+    def __init__(self, query: str):
+        self.tokens = tokenize(query)
+        self.index = 0
+        self.length = len(query)
+        self.depth = 0
+    
+    def parse(self):
+        """トークン列全体を条件式として解析"""
+        if not self.tokens:
+            raise QuerySyntaxError("クエリが空です", 0)
+        node = self._or()
+        if self.index < len(self.tokens):
+            raise QuerySyntaxError(f"不要なトークン '{self.tokens[self.index][1]}'", self.tokens[self.index][2])
+        return node
+    
+    def _peek(self) -> Optional[Tuple[str, object, int]]:
+        """次のトークン（終端ではNone）"""
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+    
+    def _next(self, expected: str) -> Tuple[str, object, int]:
+        """次のトークンを読み進める（終端では構文エラー）"""
+        token = self._peek()
+        if token is None:
+            raise QuerySyntaxError(f"{expected}が必要です", self.length)
+        self.index += 1
+        return token
+    
+    def _keyword(self, word: str) -> bool:
+        """次のトークンが指定のキーワード（引用符なし）なら読み進める"""
+        token = self._peek()
+        if token is not None and token[0] == 'word' and token[1].upper() == word:
+            self.index += 1
+            return True
+        return False
+    
+    def _punct(self, char: str) -> bool:
+        """次のトークンが指定の記号なら読み進める"""
+        token = self._peek()
+        if token is not None and token[0] == 'punct' and token[1] == char:
+            self.index += 1
+            return True
+        return False
+    
+    def _or(self):
+        """OR で結ばれた式"""
+        children = [self._and()]
+        while self._keyword('OR'):
+            children.append(self._and())
+        return children[0] if len(children) == 1 else ('or', tuple(children))
+    
+    def _and(self):
+        """AND で結ばれた式"""
+        children = [self._not()]
+        while self._keyword('AND'):
+            children.append(self._not())
+        return children[0] if len(children) == 1 else ('and', tuple(children))
+    
+    def _not(self):
+        """NOT・括弧・比較"""
+        token = self._peek()
+        if self._keyword('NOT'):
+            return ('not', self._nested(self._not, token))
+        if self._punct('('):
+            node = self._nested(self._or, token)
+            if not self._punct(')'):
+                token = self._peek()
+                raise QuerySyntaxError("')' が必要です", token[2] if token else self.length)
+            return node
+        return self._comparison()
+    
+    def _nested(self, parse: Callable, token: Tuple[str, object, int]):
+        """入れ子の深さを制限して解析"""
+        self.depth += 1
+        if self.depth > MAX_QUERY_DEPTH:
+            raise QuerySyntaxError(f"入れ子が深すぎます（最大{MAX_QUERY_DEPTH}）", token[2])
+        node = parse()
+        self.depth -= 1
+        return node
+    
+    def _comparison(self):
+        """比較 フィールド 演算子 値"""
+        kind, field, position = self._next("フィールド名")
+        if kind != 'word' or not FIELD_PATTERN.match(field) or field.upper() in ('AND', 'OR', 'NOT'):
+            raise QuerySyntaxError(f"フィールド名が不正です: '{field}'", position)
+        if field.split('.')[0] not in StandardEntry.FIELDS:
+            raise QuerySyntaxError(f"未知のフィールドです: '{field}'", position)
+        
+        kind, text, position = self._next("演算子")
+        if kind == 'symbol':
+            operator = SYMBOL_OPERATORS[text]
+        elif kind == 'word' and text.lower() in WORD_OPERATORS:
+            operator = WORD_OPERATORS[text.lower()]
+        else:
+            raise QuerySyntaxError(f"演算子が不正です: '{text}'", position)
+        
+        if operator in LIST_OPERATORS:
+            value = self._list()
+            if operator == FilterOperator.BETWEEN and len(value) != 2:
+                raise QuerySyntaxError("between には2つの値が必要です", position)
+        else:
+            value = self._scalar()
+        
+        if operator == FilterOperator.REGEX:
+            try:
+                validate_pattern(str(value), re.IGNORECASE)
+            except (re.error, UnsafePatternError) as e:
+                raise QuerySyntaxError(f"正規表現が不正です: {str(e)}", position)
+        
+        if operator == FilterOperator.EQUALS and value is None:
+            # = null / != null は値の有無の判定（等価の文字列比較では None に一致しない）
+            operator = FilterOperator.NOT_IN if text == '!=' else FilterOperator.IN
+            return ('cmp', field, operator, [None])
+        
+        node = ('cmp', field, operator, value)
+        return ('not', node) if text == '!=' else node
+    
+    def _scalar(self):
+        """値（引用符付き文字列・単語、null は None）"""
+        kind, text, position = self._next("値")
+        if kind == 'string':
+            return text
+        if kind != 'word':
+            raise QuerySyntaxError(f"値が不正です: '{text}'", position)
+        return None if text.lower() == 'null' else text
+    
+    def _list(self) -> List:
+        """値のリスト [a, b, ...]"""
+        kind, text, position = self._next("'['")
+        if kind != 'punct' or text != '[':
+            raise QuerySyntaxError("値のリスト '[...]' が必要です", position)
+        
+        values = []
+        if self._punct(']'):
+            return values
+        while True:
+            values.append(self._scalar())
+            if self._punct(']'):
+                return values
+            if not self._punct(','):
+                token = self._peek()
+                raise QuerySyntaxError("',' または ']' が必要です", token[2] if token else self.length)
+
+
+def parse_query(query: str):
+    """クエリを解析してASTを取得"""
+    if len(query) > MAX_QUERY_LENGTH:
+        raise QuerySyntaxError(f"クエリが長すぎます（最大{MAX_QUERY_LENGTH}文字）", MAX_QUERY_LENGTH)
+    return _Parser(query).parse()
+
+
+def resolve_path(standard, path: Tuple[str, ...]) -> List:
+    """
+    ネストしたフィールドパスの値を取得
+    
+    途中のリストは要素ごとに辿るため、該当する全ての値のリストを返す
+    （例: etsi_info.versions.status は全バージョンのステータス）
+    """
+    values = [standard.get(path[0])]
+    for segment in path[1:]:
+        found = []
+        for value in _flatten(values):
+            if isinstance(value, dict) and segment in value:
+                found.append(value[segment])
+        values = found
+    return list(_flatten(values))
+
+
+def _flatten(values: Iterable) -> Iterator:
+    """リストの要素を展開"""
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            yield from value
+        else:
+            yield value
+
+
+class CompiledQuery:
+    """
+    コンパイル済みクエリ
+    
+    conditions はクエリが最上位フィールドの比較のANDだけで構成される場合の条件リストで、
+    CompiledFilter と同じ形のため実行計画・列指向ビューでそのまま評価できる（それ以外はNone）
+    """
+    
+    __slots__ = ('query', 'conditions', '_match')
+    
+    def __init__(self, query: str, tree, filter_obj: Optional[StandardFilter] = None):
+        filter_obj = filter_obj or StandardFilter()
+        self.query = query
+        self.conditions: Optional[Tuple[Dict, ...]] = self._conjunction(tree)
+        self._match = self._compile(tree, filter_obj)
+    
+    def matches(self, standard) -> bool:
+        """標準規格（辞書またはエントリ）がクエリを満たすかチェック"""
+        return self._match(standard)
+    
+    __call__ = matches
+    
+    def filter(self, standards: Iterable[Dict]) -> List[Dict]:
+        """クエリを満たす標準規格のリストを取得"""
+        match = self._match
+        return [s for s in standards if match(s)]
+    
+    def iter(self, standards: Iterable[Dict]) -> Iterator[Dict]:
+        """クエリを満たす標準規格を1件ずつ返す"""
+        match = self._match
+        for standard in standards:
+            if match(standard):
+                yield standard
+    
+    @staticmethod
+    def _conjunction(tree) -> Optional[Tuple[Dict, ...]]:
+        """ANDだけで結ばれた最上位フィールドの比較を条件リストに変換"""
+        nodes = tree[1] if tree[0] == 'and' else (tree,)
+        conditions = []
+        for node in nodes:
+            if node[0] != 'cmp' or '.' in node[1]:
+                return None
+            conditions.append(StandardFilter._make_condition(node[1], node[2], node[3]))
+        return tuple(conditions)
+    
+    def _compile(self, node, filter_obj: StandardFilter) -> Callable:
+        """ASTを判定関数にコンパイル"""
+        kind = node[0]
+        
+        if kind == 'and':
+            children = tuple(self._compile(child, filter_obj) for child in node[1])
+            
+            def match_all(standard) -> bool:
+                for child in children:
+                    if not child(standard):
+                        return False
+                return True
+            return match_all
+        
+        if kind == 'or':
+            children = tuple(self._compile(child, filter_obj) for child in node[1])
+            
+            def match_any(standard) -> bool:
+                for child in children:
+                    if child(standard):
+                        return True
+                return False
+            return match_any
+        
+        if kind == 'not':
+            child = self._compile(node[1], filter_obj)
+            return lambda standard: not child(standard)
+        
+        _, field, operator, value = node
+        predicate = filter_obj._compile_condition(StandardFilter._make_condition(field, operator, value))
+        path = tuple(field.split('.'))
+        
+        if len(path) == 1:
+            return lambda standard: predicate(standard.get(field))
+        
+        def match_path(standard) -> bool:
+            values = resolve_path(standard, path)
+            if not values:
+                return predicate(None)
+            return any(predicate(v) for v in values)
+        return match_path
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def compile_query(query: str) -> CompiledQuery:
+    """
+    クエリを解析・コンパイル（結果はクエリ文字列ごとにキャッシュ）
+    
+    Raises:
+        QuerySyntaxError: 構文エラーの場合
+    """
+    return CompiledQuery(query, parse_query(query))
@@ -0,0 +1,324 @@
+"""
+安全な正規表現モジュール
+利用者が指定する正規表現を検証・コンパイルし、評価時間を問い合わせ単位で制限する
+
+Pythonのreは1回の照合を途中で中断できないため、指数的なバックトラックを起こす構文
+（入れ子の量指定子、量指定子内の重なりのある選択、後方参照）と、高次の多項式時間になる
+重なりのある上限なしの繰り返しの並び（例: .*.*）はコンパイル前に拒否する。
+残る遅さは照合する文字列の長さの上限と、問い合わせ全体の時間予算で抑える
+"""
+
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Optional
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # Python 3.10以前
+    import sre_parse
+    import sre_constants
+
+# パターンの最大長
+MAX_PATTERN_LENGTH = 512
+
+# {m,n} の上限（これを超える回数指定は拒否）
+MAX_REPEAT_COUNT = 1000
+
+# searchで照合する文字列の最大長（これを超える部分は照合しない）
+MAX_SUBJECT_LENGTH = int(os.getenv('REGEX_MAX_SUBJECT_LENGTH', '4096'))
+
+# 問い合わせ1回あたりの正規表現評価の時間予算（秒）
+DEFAULT_TIME_BUDGET = float(os.getenv('REGEX_TIME_BUDGET_MS', '2000')) / 1000
+
+MAXREPEAT = sre_constants.MAXREPEAT
+REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+POSSESSIVE_REPEAT = getattr(sre_constants, 'POSSESSIVE_REPEAT', None)
+ATOMIC_GROUP = getattr(sre_constants, 'ATOMIC_GROUP', None)
+GROUP_REFERENCES = (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS)
+
+# 先頭文字の集合を求められない場合の印（任意の文字と重なるものとして扱う）
+ANY_CHAR = None
+
+# 文字クラス（\d \s \w）を表す印（先頭文字の集合に負の値として入れる）
+CATEGORY_MARKERS = {
+    sre_constants.CATEGORY_DIGIT: -1,
+    sre_constants.CATEGORY_SPACE: -2,
+    sre_constants.CATEGORY_WORD: -3,
+}
+_MARKER_CLASSES = {-1: re.compile(r'\d'), -2: re.compile(r'\s'), -3: re.compile(r'\w')}
+# 互いに重なる印の組（数字は単語構成文字に含まれる）
+_OVERLAPPING_MARKERS = {frozenset((-1, -3))}
+
+# 評価中の問い合わせの期限（time.monotonicの値、予算なしはNone）
+_deadline: ContextVar[Optional[float]] = ContextVar('regex_deadline', default=None)
+
+
+class UnsafePatternError(ValueError):
+    """安全でない（または長すぎる）正規表現"""
+
+
+class RegexBudgetExceeded(RuntimeError):
+    """正規表現の評価が問い合わせの時間予算を超えた"""
+
+
+@contextmanager
+def regex_budget(seconds: Optional[float] = None):
+    """
+    このブロック内での正規表現評価の時間予算を設定
+    
+    予算を超えると次の照合でRegexBudgetExceededを送出する
+    """
+    seconds = DEFAULT_TIME_BUDGET if seconds is None else seconds
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def validate_pattern(pattern: str, flags: int = 0):
+    """
+    正規表現を検証
+    
+    Raises:
+        re.error: 構文エラーの場合
+        UnsafePatternError: 指数的なバックトラックを起こしうる構文を含む場合
+    """
+    if len(pattern) > MAX_PATTERN_LENGTH:
+        raise UnsafePatternError(f"正規表現が長すぎます（最大{MAX_PATTERN_LENGTH}文字）")
+    
+    tree = sre_parse.parse(pattern, flags)
+    _check_sequence(list(tree), outer=None, ignore_case=bool(flags & re.IGNORECASE))
+
+
+def _check_sequence(items, outer: Optional[str], ignore_case: bool):
+    """
+    構文木を走査して危険な構文を検出
+    
+    outer: 外側にある2回以上繰り返しうる量指定子の種類
+           （None: なし, 'bounded': 上限あり, 'unbounded': 上限なし）
+    """
+    if _unbounded_overlap(items, ignore_case):
+        raise UnsafePatternError("先頭文字の重なる上限なしの繰り返しを並べることはできません（例: .*.*）")
+    
+    if outer is not None and _optional_overlap(items, ignore_case):
+        raise UnsafePatternError("繰り返しの中で省略可能な要素の後に重なる要素は使用できません（例: (a?a)+）")
+    
+    for op, av in items:
+        if op in GROUP_REFERENCES:
+            raise UnsafePatternError("後方参照は使用できません")
+        
+        if op in REPEATS or op == POSSESSIVE_REPEAT:
+            low, high, item = av
+            if high != MAXREPEAT and high > MAX_REPEAT_COUNT:
+                raise UnsafePatternError(f"繰り返し回数が多すぎます（最大{MAX_REPEAT_COUNT}）")
+            
+            if op == POSSESSIVE_REPEAT:
+                # 強欲な量指定子はバックトラックしないため内側は独立に検査
+                _check_sequence(list(item), outer=None, ignore_case=ignore_case)
+                continue
+            
+            if high > 1:
+                unbounded = high == MAXREPEAT
+                # 繰り返しの入れ子は、どちらかに上限がなければ照合の分け方が指数的に増える
+                if outer == 'unbounded' or (outer == 'bounded' and unbounded):
+                    raise UnsafePatternError("量指定子の入れ子は使用できません（例: (a+)+）")
+                # 末尾の省略可能な要素と次の繰り返しの先頭が重なる場合（例: (a[ab]?)+）
+                body = list(item)
+                if _optional_overlap(body, ignore_case, _first_chars(body, ignore_case)):
+                    raise UnsafePatternError("繰り返しの中で省略可能な要素の後に重なる要素は使用できません（例: (a?a)+）")
+                inner = 'unbounded' if unbounded else 'bounded'
+            else:
+                inner = outer
+            _check_sequence(list(item), inner, ignore_case)
+        
+        elif op == sre_constants.SUBPATTERN:
+            _check_sequence(list(av[-1]), outer, ignore_case)
+        
+        elif op == sre_constants.BRANCH:
+            alternatives = av[1]
+            if outer is not None and _alternatives_overlap(alternatives, ignore_case):
+                raise UnsafePatternError("繰り返しの中で重なりのある選択は使用できません（例: (a|aa)+）")
+            for alternative in alternatives:
+                _check_sequence(list(alternative), outer, ignore_case)
+        
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            _check_sequence(list(av[1]), outer, ignore_case)
+        
+        elif op == ATOMIC_GROUP:
+            # アトミックグループの内側はバックトラックしない
+            _check_sequence(list(av), outer=None, ignore_case=ignore_case)
+
+
+def _optional_overlap(items, ignore_case: bool, wrap_chars=frozenset()) -> bool:
+    """
+    省略可能な要素（x? など）の直後に、先頭文字が重なる要素が続くか
+    
+    wrap_chars: 列の末尾の後に続く文字の集合（繰り返しの本体では次の繰り返しの先頭）
+    """
+    items = _inline_groups(items)
+    for index, (op, av) in enumerate(items):
+        if op not in REPEATS or av[0] != 0:
+            continue
+        rest = items[index + 1:]
+        following = _first_chars(rest, ignore_case) if rest else wrap_chars
+        if _overlap(_first_chars(list(av[2]), ignore_case), following):
+            return True
+    return False
+
+
+def _unbounded_overlap(items, ignore_case: bool) -> bool:
+    """
+    先頭文字の重なる上限なしの繰り返しが、区切りなしに並ぶか
+    
+    間に前の繰り返しと重ならない必須の要素があれば、前の繰り返しの終わる位置は1通りに決まる。
+    それがない並びは分け方の数だけ照合を試すため、繰り返しの数を次数とする多項式時間になる
+    """
+    pending = []
+    for op, av in _inline_groups(items):
+        if op in REPEATS and av[1] == MAXREPEAT:
+            chars = _first_chars(list(av[2]), ignore_case)
+            if any(_overlap(previous, chars) for previous in pending):
+                return True
+            if av[0] > 0:
+                pending = []
+            pending.append(chars)
+        elif _is_required(op, av):
+            chars = _first_chars([(op, av)], ignore_case)
+            pending = [previous for previous in pending if _overlap(previous, chars)]
+    return False
+
+
+def _is_required(op, av) -> bool:
+    """1文字以上に必ず一致する要素か"""
+    if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL, sre_constants.IN, sre_constants.ANY):
+        return True
+    return (op in REPEATS or op == POSSESSIVE_REPEAT) and av[0] > 0
+
+
+def _inline_groups(items) -> list:
+    """グループを展開した要素の列（照合の上では連結と同じ）"""
+    inlined = []
+    for op, av in items:
+        if op == sre_constants.SUBPATTERN:
+            inlined.extend(_inline_groups(list(av[-1])))
+        else:
+            inlined.append((op, av))
+    return inlined
+
+
+def _overlap(chars, other) -> bool:
+    """先頭文字の集合が重なるか"""
+    if chars is ANY_CHAR or other is ANY_CHAR:
+        return True
+    if chars & other:
+        return True
+    return _marker_overlap(chars, other) or _marker_overlap(other, chars)
+
+
+def _marker_overlap(chars, other) -> bool:
+    """文字クラスの印がもう一方の文字（または印）と重なるか"""
+    for marker in chars:
+        if marker >= 0:
+            continue
+        for code in other:
+            if code < 0:
+                if frozenset((marker, code)) in _OVERLAPPING_MARKERS:
+                    return True
+            elif _MARKER_CLASSES[marker].match(chr(code)):
+                return True
+    return False
+
+
+def _alternatives_overlap(alternatives, ignore_case: bool) -> bool:
+    """選択肢の先頭文字の集合が重なるか（求められない場合は重なるものとする）"""
+    seen = set()
+    for alternative in alternatives:
+        chars = _first_chars(list(alternative), ignore_case)
+        if chars is ANY_CHAR or _overlap(chars, seen):
+            return True
+        seen |= chars
+    return False
+
+
+def _first_chars(items, ignore_case: bool):
+    """パターン列の先頭に来うる文字コードの集合（求められない場合はANY_CHAR）"""
+    if not items:
+        # 空の選択肢は他の選択肢と常に重なる
+        return ANY_CHAR
+    
+    op, av = items[0]
+    if op == sre_constants.LITERAL:
+        chars = {av}
+    elif op == sre_constants.IN:
+        chars = set()
+        for item_op, item_av in av:
+            if item_op == sre_constants.LITERAL:
+                chars.add(item_av)
+            elif item_op == sre_constants.RANGE and item_av[1] - item_av[0] < 256:
+                chars.update(range(item_av[0], item_av[1] + 1))
+            elif item_op == sre_constants.CATEGORY and item_av in CATEGORY_MARKERS:
+                chars.add(CATEGORY_MARKERS[item_av])
+            else:
+                return ANY_CHAR
+    elif op == sre_constants.SUBPATTERN:
+        return _first_chars(list(av[-1]), ignore_case)
+    elif op in REPEATS and av[0] > 0:
+        return _first_chars(list(av[2]), ignore_case)
+    else:
+        return ANY_CHAR
+    
+    if ignore_case:
+        letters = {chr(c) for c in chars if c >= 0}
+        chars |= {ord(c.lower()) for c in letters} | {ord(c.upper()) for c in letters if len(c.upper()) == 1}
+    return chars
+
+
+class GuardedPattern:
+    """検証済みの正規表現（照合ごとに問い合わせの時間予算を確認）"""
+    
+    __slots__ = ('pattern', '_regex')
+    
+    def __init__(self, pattern: str, flags: int = 0):
+        validate_pattern(pattern, flags)
+        self.pattern = pattern
+        self._regex = re.compile(pattern, flags)
+    
+    def search(self, text: str):
+        """
+        re.searchと同じ（時間予算を超えた場合はRegexBudgetExceeded）
+        
+        1回の照合は中断できないため、先頭MAX_SUBJECT_LENGTH文字だけを照合する
+        """
+        self._check_budget()
+        result = self._regex.search(text[:MAX_SUBJECT_LENGTH])
+        self._check_budget()
+        return result
+    
+    def finditer(self, text: str):
+        """
+        re.finditerと同じ（一致ごとに時間予算を確認）
+        
+        PDFの本文など長い文字列を走査するため長さは制限しない
+        """
+        self._check_budget()
+        for match in self._regex.finditer(text):
+            self._check_budget()
+            yield match
+    
+    def _check_budget(self):
+        """時間予算を超えていればRegexBudgetExceeded"""
+        deadline = _deadline.get()
+        if deadline is not None and time.monotonic() > deadline:
+            raise RegexBudgetExceeded(f"正規表現の評価が時間予算を超えました: {self.pattern}")
+
+
+@lru_cache(maxsize=256)
+def compile_guarded(pattern: str, flags: int = 0) -> GuardedPattern:
+    """検証してコンパイル（結果はパターンごとにキャッシュ）"""
+    return GuardedPattern(pattern, flags)
@@ -0,0 +1,234 @@
+"""
+保存フィルタービューモジュール
+名前付きのフィルター（ウォッチリスト）の該当IDをレジストリの変更通知で差分更新し、
+件数・内容の取得を再評価なしで行う
+"""
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from modules.filter.filter import StandardFilter
+from modules.filter.query import compile_query
+
+# ビューの条件に指定できるキーワード（StandardFilter.compileと同じ）
+VIEW_FILTER_KEYS = (
+    'status', 'directive', 'type', 'source', 'number', 'version',
+    'date_start', 'date_end', 'has_etsi_info', 'has_version',
+)
+
+# ビュー名の最大長
+MAX_VIEW_NAME_LENGTH = 100
+
+
+class SavedView:
+    """
+    保存フィルタービュー
+    
+    条件（キーワード引数の条件とクエリ言語の条件式のAND）を満たすIDの集合を保持する。
+    自然順の一覧は読み出し時に作成してキャッシュし、該当エントリが変わった時だけ破棄する
+    """
+    
+    def __init__(self, name: str, filters: Optional[Dict] = None, query: Optional[str] = None,
+                 created_at: Optional[str] = None):
+        self.name = name
+        self.filters = {key: value for key, value in (filters or {}).items() if value is not None}
+        self.query = query or None
+        self.created_at = created_at or datetime.now().isoformat()
+        self.predicate = self._compile()
+        
+        self.ids: Set[str] = set()
+        self._ordered: Optional[List] = None
+    
+    def _compile(self) -> Callable:
+        """条件を判定関数にコンパイル"""
+        unknown = set(self.filters) - set(VIEW_FILTER_KEYS)
+        if unknown:
+            raise ValueError(f"未知のフィルター条件です: {', '.join(sorted(unknown))}")
+        
+        compiled = StandardFilter().compile(**self.filters)
+        if self.query is None:
+            return compiled.matches
+        
+        query = compile_query(self.query)
+        return lambda standard: compiled.matches(standard) and query.matches(standard)
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def refresh(self, entries):
+        """全エントリを評価して該当IDを作り直す"""
+        predicate = self.predicate
+        self.ids = {entry.id for entry in entries if predicate(entry)}
+        self._ordered = None
+    
+    def apply(self, standard_id: str, entry) -> bool:
+        """
+        1件の変更を反映（entryは削除の場合None）
+        
+        Returns:
+            ビューの内容が変わった可能性があるか
+        """
+        was_member = standard_id in self.ids
+        is_member = entry is not None and self.predicate(entry)
+        
+        if is_member:
+            self.ids.add(standard_id)
+        else:
+            self.ids.discard(standard_id)
+        
+        # 該当エントリの更新は一覧の内容・並び順を変えうる
+        if was_member or is_member:
+            self._ordered = None
+            return True
+        return False
+    
+    def entries(self, registry) -> List:
+        """該当エントリを自然順に取得"""
+        if self._ordered is None:
+            self._ordered = registry.entries_in_order(self.ids)
+        return self._ordered
+    
+    def definition(self) -> Dict:
+        """保存用の定義"""
+        return {
+            'name': self.name,
+            'filters': self.filters,
+            'query': self.query,
+            'created_at': self.created_at,
+        }
+    
+    def describe(self) -> Dict:
+        """定義と件数"""
+        return {**self.definition(), 'count': len(self.ids)}
+
+
+class ViewManager:
+    """
+    レジストリの保存フィルタービューを管理するクラス
+    
+    ビューの定義はレジストリのデータファイルの隣（*.views.json）に保存する。
+    追加・更新・削除の通知では変更されたエントリだけを各ビューの条件で評価し、
+    再読み込みの通知では全ビューを次の読み出し時に作り直す
+    """
+    
+    def __init__(self, registry, views_file: Optional[Path] = None):
+        self.logger = logging.getLogger(__name__)
+        self.registry = registry
+        self.views_file = views_file or registry.views_file
+        self.views: Dict[str, SavedView] = {}
+        self._stale = False
+        
+        self._load()
+        registry.subscribe(self._on_change)
+    
+    def close(self):
+        """変更通知の購読を解除"""
+        self.registry.unsubscribe(self._on_change)
+    
+    def define(self, name: str, filters: Optional[Dict] = None, query: Optional[str] = None,
+               save: bool = True) -> SavedView:
+        """
+        ビューを定義（同名のビューは置き換え）
+        
+        Raises:
+            ValueError: 名前・条件が不正な場合（クエリの構文エラーを含む）
+        """
+        name = (name or '').strip()
+        if not name or len(name) > MAX_VIEW_NAME_LENGTH:
+            raise ValueError(f"ビュー名は1〜{MAX_VIEW_NAME_LENGTH}文字で指定してください")
+        
+        view = SavedView(name, filters, query)
+        if not view.filters and view.query is None:
+            raise ValueError("ビューの条件を指定してください")
+        
+        view.refresh(self.registry.standards.values())
+        self.views[name] = view
+        if save:
+            self.save()
+        return view
+    
+    def remove(self, name: str, save: bool = True) -> bool:
+        """ビューを削除"""
+        if self.views.pop(name, None) is None:
+            return False
+        if save:
+            self.save()
+        return True
+    
+    def get(self, name: str) -> Optional[SavedView]:
+        """ビューを取得（存在しない場合はNone）"""
+        self._ensure_fresh()
+        return self.views.get(name)
+    
+    def count(self, name: str) -> Optional[int]:
+        """ビューの件数を取得"""
+        view = self.get(name)
+        return None if view is None else len(view)
+    
+    def contents(self, name: str) -> Optional[List[Dict]]:
+        """ビューの標準規格を自然順に辞書形式で取得"""
+        view = self.get(name)
+        if view is None:
+            return None
+        return [entry.to_dict() for entry in view.entries(self.registry)]
+    
+    def list_views(self) -> List[Dict]:
+        """全ビューの定義と件数"""
+        self._ensure_fresh()
+        return [view.describe() for view in self.views.values()]
+    
+    def save(self):
+        """ビューの定義を保存"""
+        try:
+            self.views_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.views_file, 'w', encoding='utf-8') as f:
+                json.dump([view.definition() for view in self.views.values()], f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            self.logger.error(f"ビュー保存エラー: {str(e)}")
+            raise
+    
+    def _load(self):
+        """保存されたビューの定義を読み込み（不正な定義は読み飛ばす）"""
+        try:
+            if not self.views_file.exists() or self.views_file.stat().st_size == 0:
+                return
+            with open(self.views_file, 'r', encoding='utf-8') as f:
+                definitions = json.load(f)
+        except Exception as e:
+            self.logger.error(f"ビュー読み込みエラー: {str(e)}")
+            return
+        
+        entries = list(self.registry.standards.values())
+        for definition in definitions:
+            try:
+                view = SavedView(definition['name'], definition.get('filters'), definition.get('query'),
+                                 definition.get('created_at'))
+            except Exception as e:
+                self.logger.error(f"ビュー定義エラー: {definition.get('name')}: {str(e)}")
+                continue
+            view.refresh(entries)
+            self.views[view.name] = view
+        
+        self.logger.info(f"{len(self.views)}件のビューを読み込みました")
+    
+    def _on_change(self, operation: str, standard_id: Optional[str]):
+        """レジストリの変更通知"""
+        if operation == 'reload' or self._stale:
+            self._stale = True
+            return
+        
+        entry = self.registry.standards.get(standard_id)
+        for view in self.views.values():
+            view.apply(standard_id, entry)
+    
+    def _ensure_fresh(self):
+        """再読み込み後の初回アクセス時に全ビューを作り直す"""
+        if not self._stale:
+            return
+        entries = list(self.registry.standards.values())
+        for view in self.views.values():
+            view.refresh(entries)
+        self._stale = False
@@ -8,20 +8,33 @@ import logging
 from pathlib import Path
 from typing import List, Dict, Optional
 import pdfplumber
-import pandas as pd
 from datetime import datetime
 
+from modules.export.exporter import StreamingExporter, collect_columns
+from modules.standards.canonical import parse_number, identity_key
+from modules.filter.safe_regex import compile_guarded
+
+# 標準規格番号の抽出パターン（既定値）
+DEFAULT_STANDARD_PATTERNS = [
+    r'(?:ETSI\s+)?EN\s+([\d.-][\d\s.-]*)(?::(\d{4}))?',  # EN 301 489-17:2017 or ETSI EN 301 489-17:2017
+    r'IEC\s+([\d.-]+)(?::(\d{4}))?',  # IEC 62368-1:2014
+    r'ISO(?:/IEC)?\s+([\d.-]+)(?::(\d{4}))?',  # ISO 9001:2015 or ISO/IEC 17025:2017
+    r'CISPR\s+([\d.-]+)(?::(\d{4}))?',  # CISPR 11:2015
+]
+
 class PDFParser:
     """PDF解析クラス"""
     
-    def __init__(self):
+    def __init__(self, standard_patterns: Optional[List[str]] = None):
+        """
+        Args:
+            standard_patterns: 標準規格番号の抽出パターン（未指定の場合は既定値）。
+                フィルターの正規表現と同じ検証を行い、危険な構文はUnsafePatternErrorとなる
+        """
         self.logger = logging.getLogger(__name__)
-        self.standard_patterns = [
-            r'(?:ETSI\s+)?EN\s+([\d\s.-]+)(?::(\d{4}))?',  # EN 301 489-17:2017 or ETSI EN 301 489-17:2017
-            r'IEC\s+([\d.-]+)(?::(\d{4}))?',  # IEC 62368-1:2014
-            r'ISO(?:/IEC)?\s+([\d.-]+)(?::(\d{4}))?',  # ISO 9001:2015 or ISO/IEC 17025:2017
-            r'CISPR\s+([\d.-]+)(?::(\d{4}))?',  # CISPR 11:2015
-        ]
+        self.standard_patterns = list(standard_patterns or DEFAULT_STANDARD_PATTERNS)
+        for pattern in self.standard_patterns:
+            compile_guarded(pattern, re.IGNORECASE)
     
     def extract_standards_from_pdf(self, file_path: Path) -> List[Dict]:
         """
@@ -29,7 +42,7 @@ class PDFParser:
         
         Args:
             file_path: PDFファイルのパス
-            
+        
         Returns:
             抽出された標準規格のリスト
         """
@@ -60,7 +73,7 @@ class PDFParser:
                 self.logger.info(f"PDFから{len(standards)}件の標準規格を抽出しました")
                 
                 return standards
-                
+        
         except Exception as e:
             self.logger.error(f"PDF解析エラー: {str(e)}")
             raise
@@ -82,7 +95,7 @@ class PDFParser:
         standards = []
         
         for pattern in self.standard_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+            matches = compile_guarded(pattern, re.IGNORECASE).finditer(text)
             for match in matches:
                 standard = self._parse_standard_match(match, pattern)
                 if standard:
@@ -97,14 +110,14 @@ class PDFParser:
         for row in table_data:
             if not row:
                 continue
-                
+            
             # 各セルを検査
             for cell in row:
                 if not cell:
                     continue
-                    
+                
                 for pattern in self.standard_patterns:
-                    matches = re.finditer(pattern, str(cell), re.IGNORECASE)
+                    matches = compile_guarded(pattern, re.IGNORECASE).finditer(str(cell))
                     for match in matches:
                         standard = self._parse_standard_match(match, pattern)
                         if standard:
@@ -135,17 +148,29 @@ class PDFParser:
             else:
                 standard_type = "Unknown"
             
-            # 番号部分を抽出
-            number_part = match.group(1).strip() if match.groups() else ""
+            # 番号部分・年度は正規化キーで解釈（パターンの捕捉範囲に依存しない）
+            context = match.string[match.start():match.start() + 64].split('\n', 1)[0]
+            key = parse_number(context)
+            amendment = None
             
-            # 年度部分を抽出
-            year_part = match.group(2) if len(match.groups()) >= 2 and match.group(2) else None
+            if key is not None:
+                number_part = key.number_part
+                year_part = key.year or None
+                amendment = key.amendment or None
+            else:
+                # 番号部分を抽出
+                number_part = match.group(1).strip() if match.groups() else ""
+                
+                # 年度部分を抽出
+                year_part = match.group(2) if len(match.groups()) >= 2 and match.group(2) else None
             
             # 標準規格番号を構築
             if number_part:
                 standard_number = f"{standard_type} {number_part}"
                 if year_part:
                     standard_number += f":{year_part}"
+                if amendment:
+                    standard_number += f"+{amendment}"
             else:
                 standard_number = full_match
             
@@ -160,7 +185,7 @@ class PDFParser:
                 "extracted_at": datetime.now().isoformat(),
                 "source": "PDF"
             }
-            
+        
         except Exception as e:
             self.logger.warning(f"標準規格解析エラー: {str(e)}")
             return None
@@ -170,7 +195,7 @@ class PDFParser:
         # 状態情報を検索
         status_keywords = {
             "withdrawn": "Withdrawn",
-            "superseded": "Superseded", 
+            "superseded": "Superseded",
             "current": "Current",
             "active": "Active",
             "published": "Published"
@@ -204,8 +229,8 @@ class PDFParser:
         unique_standards = []
         
         for standard in standards:
-            # 識別子を生成
-            identifier = f"{standard['type']}_{standard['number_part']}_{standard.get('version', 'null')}"
+            # 識別子を生成（"ETSI EN" と "EN" などの表記揺れは同一とみなす）
+            identifier = identity_key(standard) or f"{standard['type']}_{standard['number_part']}_{standard.get('version', 'null')}"
             
             if identifier not in seen:
                 seen.add(identifier)
@@ -217,18 +242,15 @@ class PDFParser:
         """抽出結果をファイルに保存"""
         try:
             # CSVとして保存
-            df = pd.DataFrame(standards)
             csv_path = output_path.with_suffix('.csv')
-            df.to_csv(csv_path, index=False)
+            StreamingExporter(columns=collect_columns(standards)).write_csv(standards, csv_path)
             
             # JSONとして保存
-            import json
             json_path = output_path.with_suffix('.json')
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(standards, f, ensure_ascii=False, indent=2)
+            StreamingExporter().write_json(standards, json_path)
             
             self.logger.info(f"抽出結果を保存しました: {csv_path}, {json_path}")
-            
+        
         except Exception as e:
             self.logger.error(f"結果保存エラー: {str(e)}")
             raise
\ No newline at end of file
@@ -0,0 +1,276 @@
+"""
+レジストリキャッシュ
+テナント（ラボ）ごとのStandardRegistryを1プロセス内でLRU管理する
+"""
+
+import os
+import re
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from modules.standards.registry import StandardRegistry
+
+# テナントIDとして許可する文字列（パストラバーサル防止）
+TENANT_ID_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$')
+
+# 1エントリあたりの推定メモリ使用量（バイト）
+# エントリ本体と識別子・フィールドの索引の目安で、トライグラム・接頭辞の索引、
+# 列指向ビュー、変更ログ・ステータス履歴は含まない（これらを多用する場合は
+# REGISTRY_CACHE_MAX_MB を実測に合わせて小さめに設定する）
+ESTIMATED_BYTES_PER_ENTRY = 2048
+
+class RegistryCache:
+    """
+    テナント別レジストリのLRUキャッシュクラス
+    
+    ファイルからの読み込みと保存はキャッシュ全体のロックの外で行い、他のテナントの取得を止めない。
+    use() で利用中のレジストリは上限を超えても解放せず、返却後に解放・保存する
+    """
+    
+    def __init__(self, base_dir: Path = Path("data/tenants"),
+                 default_data_file: Path = Path("data/output/standards_registry.json"),
+                 max_bytes: int = 512 * 1024 * 1024,
+                 max_registries: int = 100):
+        """
+        Args:
+            base_dir: テナント別レジストリの格納ディレクトリ
+            default_data_file: テナント指定がない場合のレジストリファイル
+            max_bytes: 読み込み済みレジストリの推定メモリ使用量の上限
+            max_registries: 同時に保持するレジストリ数の上限
+        """
+        self.logger = logging.getLogger(__name__)
+        self.base_dir = Path(base_dir)
+        self.default_data_file = Path(default_data_file)
+        self.max_bytes = max_bytes
+        self.max_registries = max_registries
+        
+        self._registries: "OrderedDict[str, StandardRegistry]" = OrderedDict()
+        self._lock = threading.RLock()
+        # 読み込み中のテナントのロック（同じテナントの読み込みを1回にする）
+        self._loading: Dict[str, threading.Lock] = {}
+        # 利用中の参照数と、返却後に解放するテナント
+        self._refs: Dict[str, int] = {}
+        self._pending_evict: Set[str] = set()
+        # 利用中に閉じられたレジストリ（返却時に保存する）
+        self._detached: Dict[str, StandardRegistry] = {}
+        # 解放して保存中のレジストリ（保存が終わるまでは読み込み直さずにこれを使う）
+        self._saving: Dict[str, StandardRegistry] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @classmethod
+    def from_env(cls) -> "RegistryCache":
+        """環境変数から設定を読み込んで生成"""
+        return cls(
+            base_dir=Path(os.getenv("TENANT_DATA_DIR", "data/tenants")),
+            max_bytes=int(os.getenv("REGISTRY_CACHE_MAX_MB", "512")) * 1024 * 1024,
+            max_registries=int(os.getenv("REGISTRY_CACHE_MAX_TENANTS", "100"))
+        )
+    
+    def data_file_for(self, tenant: Optional[str]) -> Path:
+        """テナントのレジストリファイルパスを取得"""
+        if not tenant:
+            return self.default_data_file
+        
+        if not TENANT_ID_PATTERN.match(tenant):
+            raise ValueError(f"不正なテナントID: {tenant}")
+        
+        return self.base_dir / tenant / "standards_registry.json"
+    
+    def get(self, tenant: Optional[str] = None) -> StandardRegistry:
+        """テナントのレジストリを取得（未読み込みの場合は読み込む）"""
+        return self._lookup(tenant, reference=False)
+    
+    def acquire(self, tenant: Optional[str] = None) -> StandardRegistry:
+        """利用中として取得（releaseで返すまで解放しない）"""
+        return self._lookup(tenant, reference=True)
+    
+    def release(self, tenant: Optional[str] = None):
+        """acquireで取得したレジストリを返す（解放待ちなら解放し、閉じられていれば保存）"""
+        key = tenant or ""
+        to_save = []
+        with self._lock:
+            refs = self._refs.get(key, 0) - 1
+            if refs > 0:
+                self._refs[key] = refs
+                return
+            self._refs.pop(key, None)
+            
+            detached = self._detached.pop(key, None)
+            if detached is not None:
+                to_save.append((key, detached))
+            elif key in self._pending_evict:
+                self._evict_locked(key, False, to_save)
+            else:
+                self._evict_over_budget(key, to_save)
+        self._save(to_save)
+    
+    @contextmanager
+    def use(self, tenant: Optional[str] = None) -> Iterator[StandardRegistry]:
+        """レジストリを利用中として取得し、終わったら返す"""
+        registry = self.acquire(tenant)
+        try:
+            yield registry
+        finally:
+            self.release(tenant)
+    
+    def _lookup(self, tenant: Optional[str], reference: bool) -> StandardRegistry:
+        """キャッシュから取得し、なければテナントごとのロックの下で読み込む"""
+        data_file = self.data_file_for(tenant)
+        key = tenant or ""
+        to_save = []
+        
+        with self._lock:
+            registry = self._hit(key, reference, to_save)
+            if registry is None:
+                guard = self._loading.setdefault(key, threading.Lock())
+        if registry is not None:
+            self._save(to_save)
+            return registry
+        
+        with guard:
+            with self._lock:
+                # 待っている間に他のスレッドが読み込んだ場合
+                registry = self._hit(key, reference, to_save)
+            if registry is not None:
+                self._save(to_save)
+                return registry
+            
+            # ファイルの読み込みは全体のロックの外で行う
+            registry = StandardRegistry(data_file=data_file)
+            self.logger.info(f"レジストリを読み込みました: {key or '(default)'} ({len(registry.standards)}件)")
+            
+            with self._lock:
+                self.misses += 1
+                self._registries[key] = registry
+                self._loading.pop(key, None)
+                if reference:
+                    self._refs[key] = self._refs.get(key, 0) + 1
+                self._evict_over_budget(key, to_save)
+        self._save(to_save)
+        return registry
+    
+    def _hit(self, key: str, reference: bool, to_save: List) -> Optional[StandardRegistry]:
+        """キャッシュにあれば最近使ったものとして取得（全体のロックを保持して呼ぶ）"""
+        registry = self._registries.get(key)
+        if registry is None:
+            # 保存中のレジストリは読み込み直すと保存前の内容になるため、そのまま戻す
+            registry = self._saving.get(key)
+            if registry is None:
+                return None
+            self._registries[key] = registry
+        
+        self._registries.move_to_end(key)
+        self._pending_evict.discard(key)
+        self.hits += 1
+        if reference:
+            self._refs[key] = self._refs.get(key, 0) + 1
+        self._evict_over_budget(key, to_save)
+        return registry
+    
+    def flush(self, tenant: Optional[str] = None):
+        """未保存の変更をファイルに書き出し（テナント未指定の場合は全て）"""
+        with self._lock:
+            keys = [tenant or ""] if tenant is not None else list(self._registries)
+            to_save = [(key, self._registries[key]) for key in keys if key in self._registries]
+        self._save(to_save)
+    
+    def evict(self, tenant: Optional[str] = None, force: bool = False) -> bool:
+        """
+        保存してからキャッシュから取り除く
+        
+        利用中のレジストリは保存だけ行い、返却時に解放する（force=True の場合は
+        直ちに取り除き、返却時に改めて保存する）
+        """
+        to_save = []
+        with self._lock:
+            evicted = self._evict_locked(tenant or "", force, to_save)
+        self._save(to_save)
+        return evicted
+    
+    def close(self):
+        """全てのレジストリを保存して解放（利用中のものは返却時にも保存）"""
+        to_save = []
+        with self._lock:
+            for key in list(self._registries):
+                self._evict_locked(key, True, to_save)
+        self._save(to_save)
+    
+    def _evict_locked(self, key: str, force: bool, to_save: List) -> bool:
+        """
+        キャッシュから切り離し、保存するものをto_saveに追加（全体のロックを保持して呼ぶ）
+        
+        保存は呼び出し側が全体のロックを外してから_saveで行う
+        """
+        registry = self._registries.get(key)
+        if registry is None:
+            return False
+        
+        to_save.append((key, registry))
+        if self._refs.get(key):
+            if not force:
+                self._pending_evict.add(key)
+                return False
+            self._detached[key] = registry
+        
+        del self._registries[key]
+        self._pending_evict.discard(key)
+        self._saving[key] = registry
+        self.evictions += 1
+        self.logger.info(f"レジストリを解放しました: {key or '(default)'}")
+        return True
+    
+    def _save(self, to_save: List[Tuple[str, StandardRegistry]]):
+        """未保存の変更を書き出し（全体のロックの外で呼ぶ）"""
+        for key, registry in to_save:
+            try:
+                if registry.is_dirty():
+                    registry.save_data()
+            finally:
+                with self._lock:
+                    if self._saving.get(key) is registry:
+                        del self._saving[key]
+    
+    def estimated_bytes(self) -> int:
+        """読み込み済みレジストリの推定メモリ使用量"""
+        with self._lock:
+            return sum(self._estimate(r) for r in self._registries.values())
+    
+    def get_statistics(self) -> Dict:
+        """キャッシュの統計情報を取得"""
+        with self._lock:
+            return {
+                'loaded': len(self._registries),
+                'tenants': [key or '(default)' for key in self._registries],
+                'in_use': sum(1 for refs in self._refs.values() if refs > 0),
+                'estimated_bytes': self.estimated_bytes(),
+                'max_bytes': self.max_bytes,
+                'max_registries': self.max_registries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+    
+    def _evict_over_budget(self, keep: str, to_save: List):
+        """上限を超えている間、利用中でないレジストリを最も古く使われたものから解放"""
+        while len(self._registries) > 1:
+            over_count = len(self._registries) > self.max_registries
+            over_bytes = self.estimated_bytes() > self.max_bytes
+            if not (over_count or over_bytes):
+                break
+            
+            oldest = next((key for key in self._registries
+                           if key != keep and not self._refs.get(key)), None)
+            if oldest is None:
+                break
+            self._evict_locked(oldest, False, to_save)
+    
+    @staticmethod
+    def _estimate(registry: StandardRegistry) -> int:
+        """レジストリの推定メモリ使用量"""
+        return max(1, len(registry.standards)) * ESTIMATED_BYTES_PER_ENTRY
@@ -0,0 +1,189 @@
+"""
+標準規格番号の正規化
+番号を同一性判定用のキーや、比較・索引用のトークン列に変換する
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+
+# 先頭の規格種別（"ETSI EN" は "EN" と同一視する）
+FAMILY_PATTERN = re.compile(r'^\s*(?:ETSI\s+)?(ISO/IEC|IEC|ISO|CISPR|EN|TS|TR|ES|EG)(?=[\s\d]|$)\s*', re.IGNORECASE)
+
+# 年度・追補などの接尾辞（"301 489-17:2017" の ":2017"）
+SUFFIX_PATTERN = re.compile(r'\s*:.*$')
+
+# トークンの区切り文字
+TOKEN_SEPARATOR = re.compile(r'[\s.\-]+')
+
+# 番号に含まれる年度（":2017"）
+YEAR_PATTERN = re.compile(r':\s*(\d{4})')
+
+# 番号部分の構造（系列-部番:年度+追補）
+# 系列の空白区切りは3桁単位のみ（"300 328 2019" の年度を取り込まない）
+NUMBER_PATTERN = re.compile(
+    r'(?P<series>\d+(?: \d{3}(?!\d))*)'
+    r'(?: ?- ?(?P<part>\d+(?:-\d+)*))?'
+    r'(?: ?: ?(?P<year>\d{4}))?'
+    r'(?: ?[+/] ?(?P<amendment>A\d+)(?: ?: ?\d{4})?)?'
+)
+
+
+class CanonicalKey(NamedTuple):
+    """
+    標準規格の同一性キー
+    
+    表記揺れ（"ETSI EN" と "EN"、空白の違いなど）を吸収した値で、
+    同じ内容のキーは同一オブジェクトに集約される。
+    """
+    family: str
+    series: str
+    part: str
+    amendment: str
+    year: str
+    
+    @property
+    def number_part(self) -> str:
+        """番号部分（"301 489-17"）"""
+        return f"{self.series}-{self.part}" if self.part else self.series
+    
+    def __str__(self) -> str:
+        text = f"{self.family} {self.number_part}".strip()
+        if self.year:
+            text += f":{self.year}"
+        if self.amendment:
+            text += f"+{self.amendment}"
+        return text
+
+
+@lru_cache(maxsize=65536)
+def _intern(key: CanonicalKey) -> CanonicalKey:
+    """同一内容のキーを共有する（表の大きさは上限付きで、古いキーから外れる）"""
+    return key
+
+
+@lru_cache(maxsize=65536)
+def split_family(text: str) -> Tuple[Optional[str], str]:
+    """
+    先頭の規格種別と残りの番号部分に分ける
+    
+    "ETSI EN 301 489-17:2017" -> ("EN", "301 489-17:2017")
+    """
+    text = text or ''
+    match = FAMILY_PATTERN.match(text)
+    if not match:
+        return None, text.strip()
+    return match.group(1).upper(), text[match.end():].strip()
+
+
+@lru_cache(maxsize=65536)
+def parse_number(text: str, family: Optional[str] = None, year: Optional[str] = None) -> Optional[CanonicalKey]:
+    """
+    番号文字列から同一性キーを生成（番号を解釈できない場合はNone）
+    
+    "ETSI EN 301 489-17:2017" -> CanonicalKey('EN', '301 489', '17', '', '2017')
+    
+    Args:
+        text: 番号（規格種別付きでも番号部分のみでもよい）
+        family: 規格種別（指定した場合は番号中の種別より優先）
+        year: 年度（指定した場合は番号中の年度より優先）
+    """
+    parsed_family, rest = split_family(text or '')
+    match = NUMBER_PATTERN.match(' '.join(rest.upper().split()))
+    if not match:
+        return None
+    
+    key = CanonicalKey(
+        normalize_family(family) or parsed_family or '',
+        match.group('series'),
+        match.group('part') or '',
+        match.group('amendment') or '',
+        year or match.group('year') or ''
+    )
+    return _intern(key)
+
+
+def identity_key(data: Dict) -> Optional[CanonicalKey]:
+    """辞書形式の標準規格の同一性キー（number_partを優先し、なければnumberから求める）"""
+    number = str(data.get('number') or '')
+    number_part = str(data.get('number_part') or '')
+    version = data.get('version')
+    
+    family = data.get('type') or split_family(number)[0]
+    year = str(version) if version not in (None, '') else None
+    return parse_number(number_part or number, family, year)
+
+
+def normalize_family(family: Optional[str]) -> Optional[str]:
+    """規格種別を正規化（"ETSI EN" -> "EN"）"""
+    if not family:
+        return None
+    parsed, rest = split_family(family)
+    return parsed if parsed and not rest else family.strip().upper()
+
+
+@lru_cache(maxsize=65536)
+def number_tokens(number_part: str) -> Tuple[str, ...]:
+    """
+    番号部分を比較用のトークン列に分解
+    
+    "301 489-17" -> ("301", "489", "17")
+    """
+    text = SUFFIX_PATTERN.sub('', (number_part or '').upper())
+    return tuple(token for token in TOKEN_SEPARATOR.split(text) if token)
+
+
+def entry_tokens(number_part: str, number: str = '') -> Tuple[str, ...]:
+    """エントリのトークン列（number_partがない場合はnumberから求める）"""
+    if number_part:
+        return number_tokens(number_part)
+    return number_tokens(split_family(number)[1])
+
+
+def natural_token_key(token: str) -> Tuple:
+    """トークンの自然順ソートキー（数値は数値として比較）"""
+    if token.isdigit():
+        return (0, int(token), token)
+    return (1, 0, token)
+
+
+@lru_cache(maxsize=65536)
+def _token_sort_key(tokens: Tuple[str, ...]) -> Tuple:
+    """トークン列を比較用の平坦なタプルに変換（数値は整数、末尾に終端-1）"""
+    key = []
+    for token in tokens:
+        if token.isdigit():
+            key.extend((0, int(token)))
+        else:
+            key.extend((1, token))
+    key.append(-1)
+    return tuple(key)
+
+
+def standard_sort_key(standard_type: str, number_part: str, number: str, version: str) -> Tuple:
+    """
+    標準規格の自然順ソートキー
+    
+    (種別, 番号トークン（数値は整数）, 年度, 番号文字列) の順に比較するため、
+    "EN 301 489-3" は "EN 301 489-17" より前になる。
+    入れ子のタプルは比較が遅いため、1段の平坦なタプルにする。
+    """
+    family = normalize_family(standard_type) or split_family(number)[0] or ''
+    
+    if version.isdigit():
+        year = int(version)
+    else:
+        match = YEAR_PATTERN.search(number)
+        year = int(match.group(1)) if match else 0
+    
+    return (family,) + _token_sort_key(entry_tokens(number_part, number)) + (year, number)
+
+
+def sort_key_for(data: Dict) -> Tuple:
+    """辞書形式の標準規格のソートキー"""
+    return standard_sort_key(
+        data.get('type') or '',
+        data.get('number_part') or '',
+        data.get('number') or '',
+        str(data.get('version') or '')
+    )
@@ -0,0 +1,203 @@
+"""
+標準規格ステータス履歴
+ステータス・バージョンの遷移を追記専用ファイルに記録し、期間指定・時点指定の検索を提供する
+"""
+
+import json
+import logging
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+
+# 履歴を記録するフィールド（existsは登録・削除を表す）
+TRACKED_FIELDS = ('exists', 'status', 'version', 'etsi_status', 'etsi_version', 'etsi_version_status')
+
+
+def snapshot_entry(entry) -> Dict:
+    """標準規格エントリから履歴対象フィールドの値を取り出す"""
+    etsi_info = entry.etsi_info if isinstance(entry.etsi_info, dict) else {}
+    versions = etsi_info.get('versions') or []
+    latest = versions[0] if versions and isinstance(versions[0], dict) else {}
+    
+    return {
+        'exists': True,
+        'status': entry.status,
+        'version': entry.version,
+        'etsi_status': etsi_info.get('status'),
+        'etsi_version': latest.get('identification'),
+        'etsi_version_status': latest.get('status'),
+    }
+
+
+class StatusHistory:
+    """ステータス遷移履歴クラス
+    
+    イベントは (timestamp, standard_id, field, old, new) のタプルとして保持する。
+    全体を時刻順に並べたリストと、標準規格・フィールド別の時刻順リストの2種類の索引を持ち、
+    期間検索と時点検索を二分探索で行う。
+    """
+    
+    def __init__(self, history_file: Path):
+        self.logger = logging.getLogger(__name__)
+        self.history_file = history_file
+        
+        self._loaded = False
+        self._pending: List[Tuple] = []
+        
+        # 全イベント（時刻順）とその時刻のみの並列リスト
+        self._events: List[Tuple] = []
+        self._timestamps: List[str] = []
+        
+        # standard_id -> field -> (時刻リスト, イベントリスト)
+        self._by_standard: Dict[str, Dict[str, Tuple[List[str], List[Tuple]]]] = {}
+    
+    def record(self, standard_id: str, field: str, old, new, timestamp: Optional[str] = None):
+        """遷移を1件記録"""
+        event = (timestamp or datetime.now().isoformat(), standard_id, field, old, new)
+        self._pending.append(event)
+        if self._loaded:
+            self._index(event)
+    
+    def record_snapshot(self, standard_id: str, old: Optional[Dict], new: Optional[Dict],
+                        timestamp: Optional[str] = None):
+        """変更前後のスナップショットを比較し、変化したフィールドを記録"""
+        timestamp = timestamp or datetime.now().isoformat()
+        old = old or {}
+        new = new or {'exists': False}
+        
+        for field in TRACKED_FIELDS:
+            old_value = old.get(field)
+            new_value = new.get(field)
+            if old_value != new_value:
+                self.record(standard_id, field, old_value, new_value, timestamp)
+    
+    def flush(self):
+        """未保存のイベントを履歴ファイルに追記"""
+        if not self._pending:
+            return
+        
+        encoder = json.JSONEncoder(ensure_ascii=False)
+        
+        self.history_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.history_file, 'a', encoding='utf-8') as f:
+            for event in self._pending:
+                f.write(encoder.encode(event) + '\n')
+        
+        self.logger.info(f"履歴を{len(self._pending)}件追記しました: {self.history_file}")
+        self._pending = []
+    
+    def get_history(self, standard_id: str) -> List[Dict]:
+        """指定した標準規格の遷移履歴を時刻順に取得"""
+        self._ensure_loaded()
+        
+        events = []
+        for _, field_events in self._by_standard.get(standard_id, {}).values():
+            events.extend(field_events)
+        events.sort(key=lambda e: e[0])
+        
+        return [self._to_dict(e) for e in events]
+    
+    def changed_between(self, start: str, end: str, field: Optional[str] = None) -> List[Dict]:
+        """
+        期間内の遷移を取得
+        
+        Args:
+            start: 開始日時（ISO形式、この時刻を含む）
+            end: 終了日時（ISO形式、この時刻を含まない）
+            field: 対象フィールド（未指定の場合は全フィールド）
+        """
+        self._ensure_loaded()
+        
+        lo = bisect_left(self._timestamps, start)
+        hi = bisect_left(self._timestamps, end)
+        
+        return [
+            self._to_dict(e) for e in self._events[lo:hi]
+            if field is None or e[2] == field
+        ]
+    
+    def standards_changed_between(self, start: str, end: str, field: Optional[str] = None) -> List[str]:
+        """期間内に遷移があった標準規格IDの一覧を取得"""
+        ids = {}
+        for event in self.changed_between(start, end, field):
+            ids.setdefault(event['standard_id'], None)
+        return list(ids)
+    
+    def state_as_of(self, when: str) -> Dict[str, Dict]:
+        """
+        指定時点での各標準規格の状態を取得
+        
+        履歴を持つ標準規格について、フィールドごとに二分探索で値を求める。
+        指定時点で存在しなかった（登録前・削除後の）標準規格は含まない。
+        """
+        self._ensure_loaded()
+        
+        states = {}
+        for standard_id, fields in self._by_standard.items():
+            state = {}
+            for field, (timestamps, events) in fields.items():
+                index = bisect_right(timestamps, when)
+                # 最初の遷移より前なら遷移前の値
+                state[field] = events[index - 1][4] if index else events[0][3]
+            
+            if state.get('exists', True):
+                states[standard_id] = state
+        
+        return states
+    
+    def tracked_standard_ids(self) -> List[str]:
+        """履歴を持つ標準規格IDの一覧"""
+        self._ensure_loaded()
+        return list(self._by_standard)
+    
+    def _ensure_loaded(self):
+        """履歴ファイルを初回アクセス時に読み込み"""
+        if self._loaded:
+            return
+        
+        try:
+            if self.history_file.exists():
+                with open(self.history_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        line = line.strip()
+                        if line:
+                            self._index(tuple(json.loads(line)))
+        except Exception as e:
+            self.logger.error(f"履歴読み込みエラー: {str(e)}")
+        
+        for event in self._pending:
+            self._index(event)
+        self._loaded = True
+    
+    def _index(self, event: Tuple):
+        """イベントを索引に追加（通常は末尾への追加）"""
+        timestamp, standard_id, field = event[0], event[1], event[2]
+        
+        if not self._timestamps or self._timestamps[-1] <= timestamp:
+            self._timestamps.append(timestamp)
+            self._events.append(event)
+        else:
+            index = bisect_right(self._timestamps, timestamp)
+            self._timestamps.insert(index, timestamp)
+            self._events.insert(index, event)
+        
+        timestamps, events = self._by_standard.setdefault(standard_id, {}).setdefault(field, ([], []))
+        if not timestamps or timestamps[-1] <= timestamp:
+            timestamps.append(timestamp)
+            events.append(event)
+        else:
+            index = bisect_right(timestamps, timestamp)
+            timestamps.insert(index, timestamp)
+            events.insert(index, event)
+    
+    @staticmethod
+    def _to_dict(event: Tuple) -> Dict:
+        """イベントタプルを辞書に変換"""
+        return {
+            'timestamp': event[0],
+            'standard_id': event[1],
+            'field': event[2],
+            'old': event[3],
+            'new': event[4]
+        }
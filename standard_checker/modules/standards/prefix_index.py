@@ -0,0 +1,125 @@
+"""
+標準規格番号のプレフィックス索引
+番号部分のトークンをキーとするトライ木で、前方一致の候補を自然順に返す
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from modules.standards.canonical import split_family, number_tokens, natural_token_key
+
+
+class _Node:
+    """トライ木のノード"""
+    
+    __slots__ = ('children', 'ids', 'order')
+    
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        # このノードで番号が終わるエントリID
+        self.ids: List[str] = []
+        # 子ノードのトークンを自然順に並べたもの（変更時に破棄）
+        self.order: Optional[List[str]] = None
+    
+    def sorted_children(self) -> List[str]:
+        """子ノードのトークンを自然順に取得"""
+        if self.order is None:
+            self.order = sorted(self.children, key=natural_token_key)
+        return self.order
+
+
+class PrefixIndex:
+    """番号部分のトークン単位のトライ木"""
+    
+    def __init__(self):
+        self.root = _Node()
+        # id -> (トークン列, 規格種別, 並び順用ラベル)
+        self._entries: Dict[str, Tuple[Tuple[str, ...], Optional[str], str]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def add(self, entry_id: str, tokens: Tuple[str, ...], family: Optional[str] = None, label: str = ''):
+        """エントリを追加（既存の場合は置き換え）"""
+        if entry_id in self._entries:
+            self.remove(entry_id)
+        if not tokens:
+            return
+        
+        node = self.root
+        for token in tokens:
+            child = node.children.get(token)
+            if child is None:
+                child = node.children[token] = _Node()
+                node.order = None
+            node = child
+        
+        self._entries[entry_id] = (tokens, family, label)
+        node.ids.append(entry_id)
+        node.ids.sort(key=lambda i: self._entries[i][2])
+    
+    def remove(self, entry_id: str) -> bool:
+        """エントリを削除（空になったノードも取り除く）"""
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return False
+        
+        path = [self.root]
+        for token in entry[0]:
+            path.append(path[-1].children[token])
+        path[-1].ids.remove(entry_id)
+        
+        for depth in range(len(entry[0]), 0, -1):
+            node = path[depth]
+            if node.ids or node.children:
+                break
+            parent = path[depth - 1]
+            del parent.children[entry[0][depth - 1]]
+            parent.order = None
+        
+        return True
+    
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        """
+        前方一致するエントリIDを自然順に最大limit件取得
+        
+        最後のトークンは入力途中として扱う（"301 48" は "301 489-17" に一致）。
+        区切り文字で終わる場合は最後のトークンまで確定とみなす。
+        先頭に規格種別がある場合はその種別に絞り込む。
+        """
+        family, rest = split_family(query or '')
+        tokens = number_tokens(rest)
+        if not tokens or limit <= 0:
+            return []
+        
+        complete = query != query.rstrip(' .-')
+        node = self.root
+        for token in (tokens if complete else tokens[:-1]):
+            node = node.children.get(token)
+            if node is None:
+                return []
+        
+        if complete:
+            starts = [node]
+        else:
+            partial = tokens[-1]
+            starts = [node.children[t] for t in node.sorted_children() if t.startswith(partial)]
+        
+        results = []
+        for start in starts:
+            self._collect(start, family, limit, results)
+            if len(results) >= limit:
+                break
+        
+        return results
+    
+    def _collect(self, start: _Node, family: Optional[str], limit: int, results: List[str]):
+        """部分木を自然順（深さ優先）に走査して収集"""
+        stack = [start]
+        while stack and len(results) < limit:
+            node = stack.pop()
+            for entry_id in node.ids:
+                if family is None or self._entries[entry_id][1] == family:
+                    results.append(entry_id)
+                    if len(results) >= limit:
+                        return
+            stack.extend(node.children[t] for t in reversed(node.sorted_children()))
@@ -3,16 +3,43 @@
 標準規格データの管理と操作を行う
 """
 
+import csv
 import json
 import logging
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator, Iterable, Tuple, Callable, Set
 from datetime import datetime
+from collections import deque
+from bisect import bisect_left, insort
 import uuid
 
+from modules.export.exporter import StreamingExporter
+from modules.standards.history import StatusHistory, snapshot_entry
+from modules.standards.canonical import (
+    entry_tokens, identity_key, normalize_family, split_family, standard_sort_key
+)
+from modules.standards.prefix_index import PrefixIndex
+from modules.standards.trigram_index import TrigramIndex, entry_titles
+from modules.standards.schema import FIELD_SCHEMA, coerce_field
+
+# 変更ログに保持する最大件数
+DEFAULT_CHANGE_LOG_LIMIT = 1000
+
+# マージ時の競合解決ポリシー（newest: last_updatedが新しい方を採用, local: ローカルを維持）
+MERGE_POLICIES = ('newest', 'local')
+
+# 副索引（フィールド値 -> IDの集合）を持つフィールド
+INDEXED_FIELDS = ('status', 'type', 'source', 'directive', 'version')
+
 class StandardEntry:
     """個別の標準規格情報を管理するクラス"""
     
+    # to_dictで出力するフィールド（エクスポート時の列順）
+    FIELDS = [
+        'id', 'number', 'type', 'number_part', 'version', 'status', 'directive',
+        'extracted_at', 'source', 'etsi_info', 'last_updated', 'notes'
+    ]
+    
     def __init__(self, data: Dict):
         self.id = data.get('id', str(uuid.uuid4()))
         self.number = data.get('number', '')
@@ -26,6 +53,9 @@ class StandardEntry:
         self.etsi_info = data.get('etsi_info', None)
         self.last_updated = data.get('last_updated', datetime.now().isoformat())
         self.notes = data.get('notes', '')
+        # スキーマのフィールドの型変換結果（フィールド -> (元の値, 変換後の値)）
+        self._typed: Dict[str, Tuple] = {}
+        self.refresh_typed()
     
     def to_dict(self) -> Dict:
         """辞書形式に変換"""
@@ -44,6 +74,31 @@ class StandardEntry:
             'notes': self.notes
         }
     
+    def get(self, field: str, default=None):
+        """フィールド値を取得（辞書と同じ形で参照できるように）"""
+        return getattr(self, field, default) if field in self.FIELDS else default
+    
+    def get_typed(self, field: str):
+        """
+        スキーマに従って型変換したフィールド値を取得（変換できない場合はNone）
+        
+        保持している変換結果を返す。値が置き換えられていた場合は変換し直す
+        """
+        value = getattr(self, field, None)
+        cached = self._typed.get(field)
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        
+        typed = coerce_field(field, value)
+        if field in FIELD_SCHEMA:
+            self._typed[field] = (value, typed)
+        return typed
+    
+    def refresh_typed(self):
+        """スキーマのフィールドを全て型変換して保持"""
+        self._typed = {field: (getattr(self, field), coerce_field(field, getattr(self, field)))
+                       for field in FIELD_SCHEMA}
+    
     def update_etsi_info(self, etsi_info: Dict):
         """ETSI情報を更新"""
         self.etsi_info = etsi_info
@@ -58,19 +113,64 @@ class StandardEntry:
 class StandardRegistry:
     """標準規格レジストリクラス"""
     
-    def __init__(self, data_file: Optional[Path] = None):
+    def __init__(self, data_file: Optional[Path] = None, change_log_limit: int = DEFAULT_CHANGE_LOG_LIMIT):
         self.logger = logging.getLogger(__name__)
         self.data_file = data_file or Path("data/output/standards_registry.json")
+        self.changes_file = self.data_file.with_name(f"{self.data_file.stem}.changes.json")
+        self.history = StatusHistory(self.data_file.with_name(f"{self.data_file.stem}.history.jsonl"))
+        self.views_file = self.data_file.with_name(f"{self.data_file.stem}.views.json")
         self.standards: Dict[str, StandardEntry] = {}
+        
+        # 変更フィード（単調増加するシーケンス番号と上限付き変更ログ）
+        self.epoch = uuid.uuid4().hex[:12]
+        self.sequence = 0
+        self.change_log = deque(maxlen=change_log_limit)
+        
+        # 同一性キー -> IDリストの索引（初回の重複判定時に構築）
+        self._identity_index: Optional[Dict[object, List[str]]] = None
+        self._identity_keys: Dict[str, object] = {}
+        
+        # 番号の前方一致索引（初回の候補検索時に構築）
+        self._prefix_index: Optional[PrefixIndex] = None
+        # 番号・ETSIタイトルのトライグラム索引（初回のあいまい検索時に構築）
+        self._trigram_index: Optional[TrigramIndex] = None
+        
+        # 自然順に並べた (ソートキー, ID) のリスト（初回の一覧取得時に構築）
+        self._sorted: Optional[List[Tuple[tuple, str]]] = None
+        self._sort_keys: Dict[str, tuple] = {}
+        # ID -> 自然順の位置（指定IDの並べ替え用、並び順が変わったら破棄）
+        self._ranks: Optional[Dict[str, int]] = None
+        
+        # フィールド値 -> IDの集合の副索引（フィールドごとに初回の検索時に構築、構築できない場合はNone）
+        self._field_indexes: Dict[str, Optional[Dict[object, Set[str]]]] = {}
+        self._field_values: Dict[str, Dict[str, object]] = {}
+        
+        # 変更通知の購読者（operation, standard_id を受け取る）
+        self._listeners: List[Callable[[str, Optional[str]], None]] = []
+        self._columnar_view = None
+        self._view_manager = None
+        
         self.load_data()
+        self.saved_sequence = self.sequence
     
     def load_data(self):
         """保存されたデータを読み込み"""
+        self._identity_index = None
+        self._identity_keys = {}
+        self._prefix_index = None
+        self._trigram_index = None
+        self._sorted = None
+        self._sort_keys = {}
+        self._ranks = None
+        self._field_indexes = {}
+        self._field_values = {}
+        self._notify('reload', None)
         try:
             if self.data_file.exists() and self.data_file.stat().st_size > 0:
                 with open(self.data_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     for item in data:
+                        # 比較用の型変換は生成時に済ませ、エントリに保持する
                         entry = StandardEntry(item)
                         self.standards[entry.id] = entry
                 self.logger.info(f"{len(self.standards)}件の標準規格を読み込みました")
@@ -79,6 +179,25 @@ class StandardRegistry:
         except Exception as e:
             self.logger.error(f"データ読み込みエラー: {str(e)}")
             self.standards = {}
+        
+        self._load_change_log()
+    
+    def _load_change_log(self):
+        """変更ログを読み込み"""
+        try:
+            if self.changes_file.exists() and self.changes_file.stat().st_size > 0:
+                with open(self.changes_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.epoch = data.get('epoch', self.epoch)
+                self.sequence = int(data.get('sequence', 0))
+                # 再読み込みでは置き換える（追記すると同じ変更が重複する）
+                self.change_log.clear()
+                self.change_log.extend(data.get('changes', []))
+        except Exception as e:
+            # 変更ログが壊れている場合は新しいエポックで再開する
+            self.logger.error(f"変更ログ読み込みエラー: {str(e)}")
+            self.sequence = 0
+            self.change_log.clear()
     
     def save_data(self):
         """データを保存"""
@@ -92,8 +211,19 @@ class StandardRegistry:
             with open(self.data_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
             
-            self.logger.info(f"データを保存しました: {self.data_file}")
+            with open(self.changes_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'epoch': self.epoch,
+                    'sequence': self.sequence,
+                    'changes': list(self.change_log)
+                }, f, ensure_ascii=False)
+            
+            # ステータス履歴を追記
+            self.history.flush()
+            self.saved_sequence = self.sequence
             
+            self.logger.info(f"データを保存しました: {self.data_file}")
+        
         except Exception as e:
             self.logger.error(f"データ保存エラー: {str(e)}")
             raise
@@ -107,46 +237,146 @@ class StandardRegistry:
             if existing_id:
                 # 既存の標準規格を更新
                 self.standards[existing_id].last_updated = datetime.now().isoformat()
+                self._record_change('update', existing_id)
                 self.logger.info(f"既存標準規格を更新: {standard_data.get('number', '')}")
                 return existing_id
             else:
                 # 新規標準規格を追加
                 entry = StandardEntry(standard_data)
                 self.standards[entry.id] = entry
+                self.history.record_snapshot(entry.id, None, snapshot_entry(entry))
+                self._record_change('add', entry.id)
                 self.logger.info(f"新規標準規格を追加: {entry.number}")
                 return entry.id
-                
+        
         except Exception as e:
             self.logger.error(f"標準規格追加エラー: {str(e)}")
             raise
     
     def _find_existing_standard(self, standard_data: Dict) -> Optional[str]:
-        """既存の標準規格を検索"""
-        search_number = standard_data.get('number', '')
-        search_type = standard_data.get('type', '')
-        search_version = standard_data.get('version', None)
+        """既存の標準規格を同一性キーで検索（番号を解釈できない場合は番号の完全一致）"""
+        key = self._identity_of(standard_data)
+        if key is None:
+            return None
+        
+        entry_ids = self._get_identity_index().get(key)
+        return entry_ids[0] if entry_ids else None
+    
+    @staticmethod
+    def _identity_of(standard_data: Dict):
+        """
+        同一性の索引のキー
         
-        for entry_id, entry in self.standards.items():
-            if (entry.number == search_number or 
-                (entry.type == search_type and 
-                 entry.number_part == standard_data.get('number_part', '') and
-                 str(entry.version) == str(search_version))):
-                return entry_id
+        番号を解釈できない場合は ('number', 番号) を使い、同じ番号の登録だけを重複とみなす
+        （番号が空の場合はNone）
+        """
+        key = identity_key(standard_data)
+        if key is not None:
+            return key
+        number = str(standard_data.get('number') or '')
+        return ('number', number) if number else None
+    
+    def _get_identity_index(self) -> Dict[object, List[str]]:
+        """同一性キーの索引を取得（未構築の場合は構築）"""
+        if self._identity_index is None:
+            self._identity_index = {}
+            self._identity_keys = {}
+            for entry in self.standards.values():
+                self._index_identity(entry)
+        return self._identity_index
+    
+    def _index_identity(self, entry: StandardEntry):
+        """エントリを同一性キーの索引に登録"""
+        key = self._identity_of({
+            'number': entry.number,
+            'number_part': entry.number_part,
+            'type': entry.type,
+            'version': entry.version
+        })
+        if key is not None:
+            self._identity_index.setdefault(key, []).append(entry.id)
+            self._identity_keys[entry.id] = key
+    
+    def _unindex_identity(self, standard_id: str):
+        """エントリを同一性キーの索引から削除"""
+        key = self._identity_keys.pop(standard_id, None)
+        if key is None:
+            return
         
-        return None
+        entry_ids = self._identity_index[key]
+        entry_ids.remove(standard_id)
+        if not entry_ids:
+            del self._identity_index[key]
     
     def get_standard(self, standard_id: str) -> Optional[StandardEntry]:
         """指定されたIDの標準規格を取得"""
         return self.standards.get(standard_id)
     
     def get_all_standards(self) -> List[Dict]:
-        """全ての標準規格を取得"""
-        return [entry.to_dict() for entry in self.standards.values()]
+        """全ての標準規格を番号の自然順で取得"""
+        return [entry.to_dict() for entry in self.sorted_entries()]
+    
+    def iter_standards(self) -> Iterator[Dict]:
+        """全ての標準規格を番号の自然順に1件ずつ辞書形式で返す"""
+        for entry in self.sorted_entries():
+            yield entry.to_dict()
+    
+    def sorted_entries(self) -> List[StandardEntry]:
+        """番号の自然順に並べたエントリのリスト（呼び出し時点のスナップショット）"""
+        self._ensure_sorted()
+        return [self.standards[entry_id] for _, entry_id in self._sorted]
+    
+    def entries_in_order(self, standard_ids: Iterable[str]) -> List[StandardEntry]:
+        """指定したIDのエントリを番号の自然順で取得（存在しないIDは無視）"""
+        self._ensure_sorted()
+        if self._ranks is None:
+            self._ranks = {entry_id: rank for rank, (_, entry_id) in enumerate(self._sorted)}
+        
+        ranks = self._ranks
+        ids = sorted((i for i in standard_ids if i in ranks), key=ranks.__getitem__)
+        return [self.standards[entry_id] for entry_id in ids]
+    
+    def _ensure_sorted(self):
+        """自然順のリストを構築"""
+        if self._sorted is None:
+            self._sort_keys = {entry_id: self._sort_key(entry) for entry_id, entry in self.standards.items()}
+            self._sorted = sorted((key, entry_id) for entry_id, key in self._sort_keys.items())
+    
+    def get_field_index(self, field: str) -> Optional[Dict[object, Set[str]]]:
+        """
+        フィールド値 -> IDの集合の副索引を取得
+        
+        INDEXED_FIELDS以外のフィールドや、ハッシュ不可能な値を含む場合はNone。
+        返した索引は読み取り専用として扱うこと
+        """
+        if field not in INDEXED_FIELDS:
+            return None
+        
+        if field not in self._field_indexes:
+            index, values = {}, {}
+            try:
+                for entry_id, entry in self.standards.items():
+                    value = getattr(entry, field)
+                    index.setdefault(value, set()).add(entry_id)
+                    values[entry_id] = value
+            except TypeError:
+                index = None
+            self._field_indexes[field] = index
+            self._field_values[field] = values
+        
+        return self._field_indexes[field]
+    
+    @staticmethod
+    def _sort_key(entry: StandardEntry) -> tuple:
+        """エントリの自然順ソートキー"""
+        return standard_sort_key(entry.type or '', entry.number_part or '', entry.number or '', str(entry.version or ''))
     
     def remove_standard(self, standard_id: str) -> bool:
         """標準規格を削除"""
         if standard_id in self.standards:
-            del self.standards[standard_id]
+            entry = self.standards.pop(standard_id)
+            self.history.record_snapshot(standard_id, snapshot_entry(entry), None)
+            self._record_change('remove', standard_id)
             self.logger.info(f"標準規格を削除: {standard_id}")
             return True
         return False
@@ -157,6 +387,7 @@ class StandardRegistry:
             return False
         
         entry = self.standards[standard_id]
+        old_snapshot = snapshot_entry(entry)
         
         # 更新可能なフィールドを更新
         updatable_fields = ['status', 'directive', 'notes', 'etsi_info']
@@ -166,9 +397,247 @@ class StandardRegistry:
                 setattr(entry, field, update_data[field])
         
         entry.last_updated = datetime.now().isoformat()
+        self.history.record_snapshot(standard_id, old_snapshot, snapshot_entry(entry), entry.last_updated)
+        self._record_change('update', standard_id)
         self.logger.info(f"標準規格を更新: {standard_id}")
         return True
     
+    def _record_change(self, operation: str, standard_id: str):
+        """変更ログにエントリを記録"""
+        self.sequence += 1
+        self.change_log.append({
+            'seq': self.sequence,
+            'op': operation,
+            'id': standard_id,
+            'timestamp': datetime.now().isoformat()
+        })
+        self._sync_indexes(operation, standard_id)
+        self._notify(operation, standard_id)
+    
+    def subscribe(self, listener: Callable[[str, Optional[str]], None]):
+        """
+        変更通知を購読
+        
+        listenerは (operation, standard_id) で呼ばれる。operationは 'add' / 'update' / 'remove'、
+        またはファイルの再読み込みを表す 'reload'（standard_idはNone）
+        """
+        self._listeners.append(listener)
+    
+    def unsubscribe(self, listener: Callable[[str, Optional[str]], None]):
+        """変更通知の購読を解除"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def _notify(self, operation: str, standard_id: Optional[str]):
+        """購読者に変更を通知"""
+        for listener in list(self._listeners):
+            try:
+                listener(operation, standard_id)
+            except Exception as e:
+                self.logger.error(f"変更通知エラー: {str(e)}")
+    
+    def _sync_indexes(self, operation: str, standard_id: str):
+        """構築済みの索引・並び順に変更を反映"""
+        entry = self.standards.get(standard_id)
+        removed = operation == 'remove' or entry is None
+        
+        if not removed:
+            entry.refresh_typed()
+        
+        if self._identity_index is not None:
+            self._unindex_identity(standard_id)
+            if not removed:
+                self._index_identity(entry)
+        
+        if self._prefix_index is not None:
+            if removed:
+                self._prefix_index.remove(standard_id)
+            else:
+                self._index_entry(entry)
+        
+        if self._trigram_index is not None:
+            if removed:
+                self._trigram_index.remove(standard_id)
+            else:
+                self._trigram_index.add(entry.id, entry.number, entry_titles(entry.etsi_info))
+        
+        if self._field_indexes:
+            self._sync_field_indexes(standard_id, None if removed else entry)
+        
+        if self._sorted is not None:
+            old_key = self._sort_keys.pop(standard_id, None)
+            new_key = None if removed else self._sort_key(entry)
+            if old_key == new_key:
+                if new_key is not None:
+                    self._sort_keys[standard_id] = new_key
+                return
+            
+            self._ranks = None
+            if old_key is not None:
+                index = bisect_left(self._sorted, (old_key, standard_id))
+                del self._sorted[index]
+            if new_key is not None:
+                insort(self._sorted, (new_key, standard_id))
+                self._sort_keys[standard_id] = new_key
+    
+    def _sync_field_indexes(self, standard_id: str, entry: Optional[StandardEntry]):
+        """構築済みの副索引に変更を反映（反映できない索引は破棄して次回に再構築）"""
+        for field in list(self._field_indexes):
+            index = self._field_indexes[field]
+            values = self._field_values[field]
+            if index is None:
+                del self._field_indexes[field]
+                continue
+            
+            if standard_id in values:
+                old_value = values.pop(standard_id)
+                ids = index[old_value]
+                ids.discard(standard_id)
+                if not ids:
+                    del index[old_value]
+            
+            if entry is not None:
+                value = getattr(entry, field)
+                try:
+                    index.setdefault(value, set()).add(standard_id)
+                except TypeError:
+                    del self._field_indexes[field]
+                    continue
+                values[standard_id] = value
+    
+    def _index_entry(self, entry: StandardEntry):
+        """エントリを前方一致索引に登録"""
+        family = normalize_family(entry.type) or split_family(entry.number)[0]
+        self._prefix_index.add(entry.id, entry_tokens(entry.number_part, entry.number), family, entry.number)
+    
+    def suggest(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        番号の前方一致で候補を取得（自然順）
+        
+        "301 489" は "301 489-1", "301 489-3", "301 489-17" ... に一致する
+        """
+        if self._prefix_index is None:
+            self._prefix_index = PrefixIndex()
+            for entry in self.standards.values():
+                self._index_entry(entry)
+        
+        return [self.standards[i].to_dict() for i in self._prefix_index.search(query, limit)]
+    
+    def fuzzy_search(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        番号・ETSIタイトルのあいまい検索（得点の高い順、各要素にscoreを付加）
+        
+        "489 17" や "EN301489" は "EN 301 489-17" に、
+        "broadband data transmission" はそのタイトルを持つ標準規格に一致する
+        """
+        if self._trigram_index is None:
+            self._trigram_index = TrigramIndex()
+            for entry in self.standards.values():
+                self._trigram_index.add(entry.id, entry.number, entry_titles(entry.etsi_info))
+        
+        return [
+            {**self.standards[entry_id].to_dict(), 'score': score}
+            for entry_id, score in self._trigram_index.search(query, limit)
+        ]
+    
+    def get_columnar_view(self):
+        """列指向ビュー（ColumnarView）を取得（NumPyがない場合はNone）"""
+        if self._columnar_view is None:
+            from modules.filter.columnar import ColumnarView, COLUMNAR_AVAILABLE
+            if not COLUMNAR_AVAILABLE:
+                return None
+            self._columnar_view = ColumnarView(self)
+        return self._columnar_view
+    
+    def get_view_manager(self):
+        """保存フィルタービューの管理（ViewManager）を取得（初回に定義を読み込んで評価）"""
+        if self._view_manager is None:
+            from modules.filter.views import ViewManager
+            self._view_manager = ViewManager(self)
+        return self._view_manager
+    
+    def get_changes(self, since: int = 0) -> Dict:
+        """
+        指定シーケンス以降の変更を取得
+        
+        Args:
+            since: 取得済みの最後のシーケンス番号
+        
+        Returns:
+            変更一覧の辞書。ログが切り詰められている等で差分を返せない場合は
+            reset_requiredがTrueになり、利用者は全件を取得し直す必要がある
+        """
+        oldest_seq = self.change_log[0]['seq'] if self.change_log else self.sequence + 1
+        reset_required = since > self.sequence or since < oldest_seq - 1
+        
+        changes = [] if reset_required else [dict(c) for c in self.change_log if c['seq'] > since]
+        
+        return {
+            'epoch': self.epoch,
+            'sequence': self.sequence,
+            'since': since,
+            'reset_required': reset_required,
+            'changes': changes
+        }
+    
+    def is_dirty(self) -> bool:
+        """未保存の変更があるかどうか"""
+        return self.sequence != self.saved_sequence
+    
+    def get_etag(self) -> str:
+        """シーケンス番号から全件一覧用のETagを生成"""
+        return f'"{self.epoch}-{self.sequence}"'
+    
+    def get_status_history(self, standard_id: str) -> List[Dict]:
+        """指定した標準規格のステータス・バージョン遷移履歴を取得"""
+        return self.history.get_history(standard_id)
+    
+    def get_changed_standards(self, start: str, end: str, field: Optional[str] = None) -> List[Dict]:
+        """
+        期間内に遷移があった標準規格を取得
+        
+        Args:
+            start: 開始日時（ISO形式、この時刻を含む）
+            end: 終了日時（ISO形式、この時刻を含まない）
+            field: 対象フィールド（例: 'etsi_status'。未指定の場合は全フィールド）
+        
+        Returns:
+            標準規格IDごとの遷移一覧
+        """
+        results = {}
+        for event in self.history.changed_between(start, end, field):
+            standard_id = event['standard_id']
+            if standard_id not in results:
+                entry = self.standards.get(standard_id)
+                results[standard_id] = {
+                    'standard_id': standard_id,
+                    'number': entry.number if entry else None,
+                    'transitions': []
+                }
+            results[standard_id]['transitions'].append(event)
+        
+        return list(results.values())
+    
+    def get_state_as_of(self, when: str) -> Dict[str, Dict]:
+        """
+        指定時点でのレジストリの状態（履歴対象フィールド）を取得
+        
+        履歴を持たない標準規格は、履歴記録開始前から現在の状態であったとみなす
+        """
+        states = self.history.state_as_of(when)
+        tracked_ids = set(self.history.tracked_standard_ids())
+        
+        for standard_id, entry in self.standards.items():
+            current = snapshot_entry(entry)
+            if standard_id in states:
+                # 遷移のなかったフィールドは現在値で補完
+                for field, value in current.items():
+                    states[standard_id].setdefault(field, value)
+            elif standard_id not in tracked_ids:
+                states[standard_id] = current
+        
+        return states
+    
     def search_standards(self, **criteria) -> List[Dict]:
         """条件に基づいて標準規格を検索"""
         results = []
@@ -247,20 +716,155 @@ class StandardRegistry:
         self.logger.info(f"{len(added_ids)}件の標準規格を一括追加しました")
         return added_ids
     
-    def export_to_csv(self, output_path: Path):
-        """CSV形式でエクスポート"""
-        try:
-            import pandas as pd
+    def merge_from(self, path: Path, policy: str = 'newest', save: bool = True, dry_run: bool = False) -> Dict:
+        """
+        外部レジストリ（JSON）またはCSVエクスポートを一括マージ
+        
+        同一性キーでハッシュ結合し、全行の処理内容を決定してから一括で反映する
+        
+        Args:
+            path: マージ元ファイル（.json または .csv）
+            policy: 競合解決ポリシー（'newest' または 'local'）
+            save: マージ後に保存するかどうか
+            dry_run: Trueの場合は集計のみ行い反映しない
+        
+        Returns:
+            ファイル単位の集計結果
+        """
+        if policy not in MERGE_POLICIES:
+            raise ValueError(f"未知のマージポリシー: {policy}")
+        
+        path = Path(path)
+        rows = self._read_merge_rows(path)
+        
+        summary = {
+            'file': str(path),
+            'rows': len(rows),
+            'added': 0,
+            'updated': 0,
+            'unchanged': 0,
+            'kept_local': 0,
+            'duplicate': 0,
+            'invalid': 0
+        }
+        
+        # ローカルの同一性キー索引（構築済みのものを共有）と、このファイルで追加予定のキー
+        local_index = self._get_identity_index()
+        planned = {}
+        
+        # 1. 全行の処理内容を決定
+        additions = []
+        addition_ids = set()
+        matched_ids = set()
+        updates = []
+        for row in rows:
+            key = identity_key(row)
+            if key is None:
+                summary['invalid'] += 1
+                continue
             
-            data = self.get_all_standards()
-            df = pd.DataFrame(data)
+            incoming = StandardEntry(row)
+            local_ids = local_index.get(key)
+            local_id = local_ids[0] if local_ids else planned.get(key)
             
-            # 出力ディレクトリを作成
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+            if local_id is None:
+                if incoming.id in self.standards or incoming.id in addition_ids:
+                    incoming.id = str(uuid.uuid4())
+                additions.append(incoming)
+                addition_ids.add(incoming.id)
+                planned[key] = incoming.id
+                summary['added'] += 1
+                continue
             
-            df.to_csv(output_path, index=False)
-            self.logger.info(f"CSVエクスポート完了: {output_path}")
+            if local_id in addition_ids or local_id in matched_ids:
+                # 同一ファイル内で既に処理済みの標準規格
+                summary['duplicate'] += 1
+                continue
             
+            matched_ids.add(local_id)
+            local = self.standards[local_id]
+            
+            fields = [f for f in StandardEntry.FIELDS if f in row and f != 'id']
+            if all(getattr(local, f) == getattr(incoming, f) for f in fields):
+                summary['unchanged'] += 1
+            elif policy == 'newest' and self._is_newer(incoming.last_updated, local.last_updated):
+                updates.append((local, incoming, fields))
+                summary['updated'] += 1
+            else:
+                summary['kept_local'] += 1
+        
+        if dry_run:
+            self.logger.info(f"マージ（ドライラン）: {summary}")
+            return summary
+        
+        # 2. 一括反映
+        for entry in additions:
+            self.standards[entry.id] = entry
+            self.history.record_snapshot(entry.id, None, snapshot_entry(entry))
+            self._record_change('add', entry.id)
+        
+        for local, incoming, fields in updates:
+            old_snapshot = snapshot_entry(local)
+            # マージ元に含まれるフィールドのみ反映
+            for field in fields:
+                setattr(local, field, getattr(incoming, field))
+            self.history.record_snapshot(local.id, old_snapshot, snapshot_entry(local))
+            self._record_change('update', local.id)
+        
+        if save and (additions or updates):
+            self.save_data()
+        
+        self.logger.info(f"マージ完了: {summary}")
+        return summary
+    
+    def _read_merge_rows(self, path: Path) -> List[Dict]:
+        """マージ元ファイルを読み込み"""
+        if path.suffix.lower() == '.csv':
+            with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+                return [self._decode_csv_row(row) for row in csv.DictReader(f)]
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        # APIレスポンス形式（{"standards": [...]}）にも対応
+        if isinstance(data, dict):
+            data = data.get('standards', [])
+        return [row for row in data if isinstance(row, dict)]
+    
+    @staticmethod
+    def _decode_csv_row(row: Dict) -> Dict:
+        """CSVエクスポートの行をレジストリ形式に戻す"""
+        decoded = {}
+        for field, value in row.items():
+            if field not in StandardEntry.FIELDS:
+                continue
+            if field in ('version', 'directive', 'etsi_info') and value == '':
+                value = None
+            elif field == 'etsi_info' and value:
+                try:
+                    value = json.loads(value)
+                except ValueError:
+                    pass
+            if field in ('id', 'extracted_at', 'last_updated') and not value:
+                continue
+            decoded[field] = value
+        return decoded
+    
+    @staticmethod
+    def _is_newer(incoming: str, local: str) -> bool:
+        """incomingのlast_updatedがlocalより新しいか"""
+        try:
+            return datetime.fromisoformat(str(incoming)) > datetime.fromisoformat(str(local))
+        except (ValueError, TypeError):
+            return str(incoming) > str(local)
+    
+    def export_to_csv(self, output_path: Path):
+        """CSV形式でエクスポート"""
+        try:
+            exporter = StreamingExporter(columns=StandardEntry.FIELDS)
+            exporter.write_csv(self.iter_standards(), output_path)
+            self.logger.info(f"CSVエクスポート完了: {output_path}")
+        
         except Exception as e:
             self.logger.error(f"CSVエクスポートエラー: {str(e)}")
             raise
@@ -268,24 +872,18 @@ class StandardRegistry:
     def export_to_excel(self, output_path: Path):
         """Excel形式でエクスポート"""
         try:
-            import pandas as pd
-            
-            data = self.get_all_standards()
-            df = pd.DataFrame(data)
-            
-            # 出力ディレクトリを作成
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+            # 統計情報も追加
+            stats = self.get_statistics()
+            stats_rows = ({'Metric': key, 'Value': value} for key, value in stats.items())
             
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='Standards', index=False)
-                
-                # 統計情報も追加
-                stats = self.get_statistics()
-                stats_df = pd.DataFrame(list(stats.items()), columns=['Metric', 'Value'])
-                stats_df.to_excel(writer, sheet_name='Statistics', index=False)
+            exporter = StreamingExporter()
+            exporter.write_xlsx({
+                'Standards': self.iter_standards(),
+                'Statistics': stats_rows
+            }, output_path)
             
             self.logger.info(f"Excelエクスポート完了: {output_path}")
-            
+        
         except Exception as e:
             self.logger.error(f"Excelエクスポートエラー: {str(e)}")
             raise
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+標準規格フィールドのスキーマ
+比較に使うフィールドの型を定義し、文字列値をPythonの型に変換する
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+# 型付きで比較するフィールド（datetime: 日時, year: 西暦年の整数）
+FIELD_SCHEMA: Dict[str, str] = {
+    'extracted_at': 'datetime',
+    'last_updated': 'datetime',
+    'version': 'year',
+}
+
+# fromisoformatで解釈できない場合に試す日付形式
+DATE_FORMATS = ('%m/%d/%Y', '%d.%m.%Y', '%Y/%m/%d')
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """タイムゾーン付きの日時はUTCに換算してからタイムゾーンを除く"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.replace(tzinfo=None)
+
+
+def _parse_datetime(text: str) -> Optional[datetime]:
+    """日時文字列をタイムゾーンなし（UTC基準）のdatetimeに変換"""
+    text = text.strip()
+    try:
+        return _naive_utc(datetime.fromisoformat(text))
+    except ValueError:
+        pass
+    
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_year(text: str) -> Optional[int]:
+    """西暦年の文字列を整数に変換"""
+    text = text.strip()
+    return int(text) if len(text) == 4 and text.isdigit() else None
+
+
+def coerce_datetime(value) -> Optional[datetime]:
+    """値をdatetimeに変換（変換できない場合はNone）"""
+    if isinstance(value, datetime):
+        return _naive_utc(value)
+    if isinstance(value, str):
+        return _parse_datetime(value)
+    return None
+
+
+def coerce_year(value) -> Optional[int]:
+    """値を西暦年の整数に変換（変換できない場合はNone）"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return _parse_year(value)
+    return None
+
+
+COERCERS = {
+    'datetime': coerce_datetime,
+    'year': coerce_year,
+}
+
+
+def coerce_field(field: str, value):
+    """スキーマに従って値を変換（スキーマ外のフィールドや変換できない値はNone）"""
+    field_type = FIELD_SCHEMA.get(field)
+    if field_type is None or value is None:
+        return None
+    return COERCERS[field_type](value)
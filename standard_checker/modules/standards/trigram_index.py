@@ -0,0 +1,265 @@
+"""
+標準規格のトライグラム索引
+正規化した番号とETSIのバージョン名（タイトル）を3文字組に分解し、あいまい検索の候補を得点順に返す
+"""
+
+import re
+import string
+import unicodedata
+from collections import Counter
+from heapq import nsmallest
+from functools import lru_cache
+from itertools import chain
+from math import ceil
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# クエリの3文字組のうち、一致が必要な割合の既定値
+MIN_SIMILARITY = 0.5
+
+# タイトルの一致の得点の重み（同じ割合なら番号の一致を上位にする）
+TITLE_WEIGHT = 0.9
+
+# クエリの単語とタイトルの単語を同じとみなす3文字組の一致割合（綴りの誤りを許容する）
+WORD_SIMILARITY = 0.6
+
+# 単語の区切り（英数字以外）
+WORD_SEPARATOR = re.compile(r'[\W_]+')
+
+# 番号の区切り文字（連結時に取り除く、str.translateの変換表）
+NUMBER_SEPARATORS = str.maketrans('', '', string.punctuation + string.whitespace)
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """全角・半角と大文字小文字を揃える"""
+    return unicodedata.normalize('NFKC', text or '').lower()
+
+
+def number_trigrams(number: Optional[str]) -> FrozenSet[str]:
+    """
+    番号の3文字組（区切り文字を除いて連結した文字列から作る）
+    
+    "EN 301 489-17" と "EN301489 17" は同じ3文字組になる
+    """
+    compact = normalize_text(number).translate(NUMBER_SEPARATORS)
+    return frozenset({compact[i:i + 3] for i in range(len(compact) - 2)})
+
+
+@lru_cache(maxsize=65536)
+def title_words(text: Optional[str]) -> FrozenSet[str]:
+    """文章の単語の集合（同じタイトルは複数のバージョン・規格で繰り返し現れる）"""
+    return frozenset(WORD_SEPARATOR.split(normalize_text(text))) - {''}
+
+
+@lru_cache(maxsize=65536)
+def word_trigrams(word: str) -> FrozenSet[str]:
+    """単語の3文字組（前後を空白で埋めて作るため、短い単語も一致できる）"""
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def entry_titles(etsi_info) -> List[str]:
+    """ETSI情報からバージョン名（タイトル）を取り出す"""
+    if not isinstance(etsi_info, dict):
+        return []
+    
+    titles = []
+    for version in etsi_info.get('versions') or []:
+        if isinstance(version, dict) and version.get('title'):
+            titles.append(str(version['title']))
+    if etsi_info.get('title'):
+        titles.append(str(etsi_info['title']))
+    return titles
+
+
+class TrigramIndex:
+    """
+    番号とタイトルのあいまい検索索引
+    
+    番号は3文字組 -> IDの集合の転置索引で、クエリの3文字組のうち番号に含まれる割合を得点とする。
+    タイトルは単語 -> IDの集合の転置索引と、単語の3文字組 -> 単語の集合の索引の2段で持ち、
+    クエリの単語ごとに綴りの近い単語を求めて、一致した単語の（3文字組の数で重み付けした）割合を得点とする。
+    エントリの得点は番号とタイトルの高い方
+    
+    どちらも一致の少ない3文字組・単語から候補を集め、残りをすべて満たしても
+    下限の得点に届かない候補は数えない
+    """
+    
+    def __init__(self):
+        self._numbers: Dict[str, Set[str]] = {}
+        self._words: Dict[str, Set[str]] = {}
+        self._vocabulary: Dict[str, Set[str]] = {}
+        # id -> (番号の3文字組, タイトルの単語)
+        self._entries: Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]] = {}
+        # id -> 番号の3文字組の数（同点の並べ替え用）
+        self._lengths: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def add(self, entry_id: str, number: Optional[str], titles: Iterable[str] = ()):
+        """エントリを追加（既存の場合は置き換え）"""
+        if entry_id in self._entries:
+            self.remove(entry_id)
+        
+        numbers = number_trigrams(number)
+        words = frozenset().union(*(title_words(title) for title in titles))
+        self._entries[entry_id] = (numbers, words)
+        self._lengths[entry_id] = len(numbers)
+        
+        postings = self._numbers
+        for trigram in numbers:
+            ids = postings.get(trigram)
+            if ids is None:
+                postings[trigram] = {entry_id}
+            else:
+                ids.add(entry_id)
+        
+        for word in words:
+            ids = self._words.get(word)
+            if ids is None:
+                self._words[word] = {entry_id}
+                for trigram in word_trigrams(word):
+                    self._vocabulary.setdefault(trigram, set()).add(word)
+            else:
+                ids.add(entry_id)
+    
+    def remove(self, entry_id: str) -> bool:
+        """エントリを削除"""
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return False
+        del self._lengths[entry_id]
+        
+        for trigram in entry[0]:
+            ids = self._numbers[trigram]
+            ids.discard(entry_id)
+            if not ids:
+                del self._numbers[trigram]
+        
+        for word in entry[1]:
+            ids = self._words[word]
+            ids.discard(entry_id)
+            if not ids:
+                del self._words[word]
+                for trigram in word_trigrams(word):
+                    words = self._vocabulary[trigram]
+                    words.discard(word)
+                    if not words:
+                        del self._vocabulary[trigram]
+        return True
+    
+    def search(self, query: str, limit: int = 20, min_similarity: float = MIN_SIMILARITY) -> List[Tuple[str, float]]:
+        """
+        あいまい検索で (ID, 得点) を得点の高い順に最大limit件取得
+        
+        得点が同じ場合は3文字組の少ない（クエリに近い）番号を上位にする
+        """
+        if limit <= 0:
+            return []
+        
+        scores = self._number_scores(number_trigrams(query), min_similarity, limit)
+        for entry_id, score in self._title_scores(title_words(query), min_similarity, limit).items():
+            score *= TITLE_WEIGHT
+            if score > scores.get(entry_id, 0.0):
+                scores[entry_id] = score
+        
+        # 得点の高い段から順に、同点の中では3文字組の少ない番号を選ぶ（段の数は少ない）
+        ranked = []
+        for level in sorted(set(scores.values()), reverse=True):
+            ids = [entry_id for entry_id, score in scores.items() if score == level]
+            for entry_id in nsmallest(limit - len(ranked), ids, key=self._lengths.__getitem__):
+                ranked.append((entry_id, round(level, 4)))
+            if len(ranked) >= limit:
+                break
+        return ranked
+    
+    def _number_scores(self, trigrams: FrozenSet[str], min_similarity: float, limit: int) -> Dict[str, float]:
+        """
+        番号の得点（クエリの3文字組のうち番号に含まれる割合）
+        
+        一致数の下限を全数から順に下げ、その下限以上の番号がlimit件集まった時点で打ち切る。
+        下限がhの段では、一致の少ない (3文字組の数 - h + 1) 個の転置リストのどれかに
+        必ず含まれるため、候補はそれらの和集合だけでよい
+        """
+        if not trigrams:
+            return {}
+        
+        total = len(trigrams)
+        required = max(1, ceil(total * min_similarity))
+        lists = sorted((self._numbers[t] for t in trigrams if t in self._numbers), key=len)
+        if len(lists) < required:
+            return {}
+        
+        entries = self._entries
+        scores: Dict[str, float] = {}
+        found = Counter()
+        
+        # 全ての転置リストに含まれる番号は集合の積で求まる
+        seen = set.intersection(*lists)
+        scores.update(dict.fromkeys(seen, len(lists) / total))
+        found[len(lists)] = len(seen)
+        
+        for threshold in range(len(lists) - 1, required - 1, -1):
+            if sum(count for hits, count in found.items() if hits > threshold) >= limit:
+                break
+            candidates = set().union(*lists[:len(lists) - threshold + 1])
+            candidates -= seen
+            seen |= candidates
+            for entry_id in candidates:
+                hits = len(trigrams & entries[entry_id][0])
+                if hits >= required:
+                    scores[entry_id] = hits / total
+                    found[hits] += 1
+        
+        return scores
+    
+    def _title_scores(self, words: FrozenSet[str], min_similarity: float, limit: int) -> Dict[str, float]:
+        """
+        タイトルの得点（クエリの単語ごとの一致度を3文字組の数で重み付けした割合）
+        
+        全ての単語をそのまま含むタイトルがlimit件以上あればそれだけを返す
+        """
+        if not words:
+            return {}
+        
+        exact = [self._words.get(word, ()) for word in words]
+        if all(exact):
+            full = set.intersection(*exact) if len(exact) > 1 else exact[0]
+            if len(full) >= limit:
+                return dict.fromkeys(full, 1.0)
+        
+        # クエリの単語ごとに、綴りの近い単語のエントリ -> 一致度
+        matches = []
+        for word in words:
+            trigrams = word_trigrams(word)
+            weight = len(trigrams)
+            similar = Counter(chain.from_iterable(
+                self._vocabulary[t] for t in trigrams if t in self._vocabulary
+            ))
+            found = {}
+            for other, hits in sorted(similar.items(), key=lambda item: item[1]):
+                similarity = hits / max(weight, len(word_trigrams(other)))
+                if similarity >= WORD_SIMILARITY:
+                    # 一致度の高い単語で上書き
+                    found.update(dict.fromkeys(self._words[other], similarity))
+            matches.append((weight, found))
+        
+        total = sum(weight for weight, _ in matches)
+        required = total * min_similarity
+        
+        # 一致の少ない単語から候補を集め、残りの単語の重みだけでは下限に届かなくなるまで続ける
+        matches.sort(key=lambda match: len(match[1]))
+        candidates = set()
+        remaining = total
+        for weight, found in matches:
+            if remaining < required:
+                break
+            candidates.update(found)
+            remaining -= weight
+        
+        scores = {}
+        for entry_id in candidates:
+            score = sum(weight * found.get(entry_id, 0.0) for weight, found in matches) / total
+            if score >= min_similarity:
+                scores[entry_id] = score
+        return scores
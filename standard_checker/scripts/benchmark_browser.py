@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+ブラウザー設定の性能計測スクリプト
+ETSIポータルを模したローカルのフィクスチャサイトに対してSelenium検索を行い、
+通常の起動設定と軽量モード（eager読み込み・画像等の遮断）の転送量と所要時間を比較する
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.etsi_crawler.query import ETSICrawler
+from modules.etsi_crawler.rate_limit import HostRateLimiter
+
+# フィクスチャの資源（パス -> (Content-Type, キロバイト)）
+ASSETS = {
+    '/assets/site.css': ('text/css', 150),
+    '/assets/fixture.woff2': ('font/woff2', 120),
+    '/assets/banner-0.png': ('image/png', 400),
+    '/assets/banner-1.png': ('image/png', 400),
+    '/assets/banner-2.jpg': ('image/jpeg', 300),
+    '/assets/logo.svg': ('image/svg+xml', 20),
+}
+
+# 他ホストのスクリプト（アクセス解析等を模す）
+THIRD_PARTY_SCRIPT = ('/analytics.js', 'application/javascript', 250)
+
+class FixtureStats:
+    """フィクスチャサイトが送信したバイト数とリクエスト数"""
+    
+    def __init__(self):
+        self.bytes = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+    
+    def add(self, size: int):
+        with self._lock:
+            self.bytes += size
+            self.requests += 1
+    
+    def snapshot(self):
+        with self._lock:
+            return self.bytes, self.requests
+
+def _page(body: str, third_party: str) -> bytes:
+    """資源を参照するページのHTML"""
+    images = ''.join(f'<img src="{path}">' for path, (kind, _) in ASSETS.items() if kind.startswith('image/'))
+    return f"""<!DOCTYPE html>
+<html><head>
+<link rel="stylesheet" href="/assets/site.css">
+<script src="{third_party}{THIRD_PARTY_SCRIPT[0]}"></script>
+</head><body>
+{images}
+{body}
+</body></html>""".encode('utf-8')
+
+def _search_form() -> str:
+    return """<form action="/results" method="get">
+<input type="text" name="qETSIDeliverableNumber">
+<input type="checkbox" name="qETSIAllVersions">
+<input type="submit" name="qETSISearchButton" value="Search">
+</form>"""
+
+def _results_table(number: str) -> str:
+    rows = ''.join(
+        f"<tr><td>EN {number} V{major}.1.1</td><td>Published</td><td>2024-0{major}-01</td>"
+        f"<td></td><td>Fixture standard {number}</td></tr>"
+        for major in range(1, 6)
+    )
+    return ('<table class="report-table"><tr><th>IDENTIFICATION</th><th>STATUS</th>'
+            f'<th>PUBLICATION DATE</th><th>OJ REFERENCE</th><th>TITLE</th></tr>{rows}</table>')
+
+def make_handler(stats: FixtureStats, third_party: str, asset_delay: float):
+    """フィクスチャサイトのリクエストハンドラー"""
+    css_font = b"@font-face { font-family: fixture; src: url(/assets/fixture.woff2); } body { font-family: fixture; }"
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == '/search':
+                self._send('text/html; charset=utf-8', _page(_search_form(), third_party))
+            elif url.path == '/results':
+                number = parse_qs(url.query).get('qETSIDeliverableNumber', [''])[0]
+                self._send('text/html; charset=utf-8', _page(_results_table(number), third_party))
+            elif url.path in ASSETS or url.path == THIRD_PARTY_SCRIPT[0]:
+                kind, kilobytes = ASSETS.get(url.path, THIRD_PARTY_SCRIPT[1:])
+                # 資源の応答は遅延させる（実際のサイトの画像・広告等の読み込みを模す）
+                time.sleep(asset_delay)
+                body = css_font if url.path.endswith('.css') else b''
+                self._send(kind, body + b' ' * (kilobytes * 1024 - len(body)), cacheable=True)
+            else:
+                self.send_error(404)
+        
+        def _send(self, content_type: str, body: bytes, cacheable: bool = False):
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'max-age=3600' if cacheable else 'no-store')
+            self.end_headers()
+            self.wfile.write(body)
+            stats.add(len(body))
+        
+        def log_message(self, format, *args):
+            pass
+    
+    return Handler
+
+def start_server(host: str, handler) -> ThreadingHTTPServer:
+    """バックグラウンドでサーバーを起動"""
+    server = ThreadingHTTPServer((host, 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def run_searches(search_url: str, stats: FixtureStats, count: int, lightweight: bool, profile_dir: Path):
+    """ブラウザーを起動してcount件を検索し、(1件あたりのバイト数, 1件あたりの秒数, 区間ごとの平均) を返す"""
+    crawler = ETSICrawler(use_selenium=True, rate_limiter=HostRateLimiter(rate=0),
+                          lightweight=lightweight, profile_dir=profile_dir)
+    crawler.search_url = search_url
+    
+    with crawler:
+        # 1件目はブラウザーの初回読み込みを含むため計測から除く
+        crawler.search_standard('300 000')
+        before_bytes, _ = stats.snapshot()
+        crawler.reset_timings()
+        
+        start = time.perf_counter()
+        for i in range(count):
+            result = crawler.search_standard(f"301 {489 + i}")
+            assert result.get('status') == 'Success', f"検索に失敗しました: {result}"
+        elapsed = time.perf_counter() - start
+    
+    return (stats.snapshot()[0] - before_bytes) / count, elapsed / count, crawler.timing_summary()
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="ブラウザー設定の性能計測（ローカルのフィクスチャサイト）")
+    parser.add_argument("--searches", type=int, default=10, help="設定ごとの検索回数")
+    parser.add_argument("--asset-delay", type=float, default=0.1, help="資源の応答の遅延（秒）")
+    
+    args = parser.parse_args()
+    
+    stats = FixtureStats()
+    # 他ホストの資源は名前（localhost）で参照し、検索ページはIPアドレスで開く
+    third_party_server = start_server('127.0.0.1', make_handler(stats, '', args.asset_delay))
+    third_party = f"http://localhost:{third_party_server.server_address[1]}"
+    server = start_server('127.0.0.1', make_handler(stats, third_party, args.asset_delay))
+    search_url = f"http://127.0.0.1:{server.server_address[1]}/search"
+    
+    print(f"フィクスチャ: {search_url} / {args.searches}件ずつ")
+    print(f"{'設定':<24}{'KB/件':>10}{'秒/件':>10}  区間ごとの平均")
+    
+    try:
+        for lightweight in (False, True):
+            with tempfile.TemporaryDirectory() as profile_dir:
+                # 同じプロファイルで2回起動し、2回目はキャッシュを再利用する
+                for run in ('cold', 'warm'):
+                    per_bytes, per_seconds, phases = run_searches(
+                        search_url, stats, args.searches, lightweight, Path(profile_dir)
+                    )
+                    name = f"{'lightweight' if lightweight else 'default'} ({run} profile)"
+                    detail = ' / '.join(f"{phase} {seconds:.3f}s" for phase, seconds in phases.items())
+                    print(f"{name:<24}{per_bytes / 1024:>10.1f}{per_seconds:>10.3f}  {detail}")
+    finally:
+        server.shutdown()
+        third_party_server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+フィルター性能計測スクリプト
+合成データに対して StandardFilter の処理時間を計測する
+（行単位の評価と列指向ビューの評価を、結果が一致することを確認しながら比較）
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.filter.filter import StandardFilter, FilterOperator
+from modules.filter.columnar import ColumnarView, COLUMNAR_AVAILABLE
+from modules.filter.planner import QueryPlanner
+from modules.filter.batch import BatchFilter
+from modules.standards.registry import StandardRegistry
+
+# 計測に使う5条件（軽い比較から正規表現まで）
+BENCHMARK_CONDITIONS = [
+    ('type', FilterOperator.EQUALS, 'EN'),
+    ('status', FilterOperator.IN, ['Active', 'Published']),
+    ('directive', FilterOperator.CONTAINS, 'red'),
+    ('extracted_at', FilterOperator.GREATER_THAN, '2024-01-01'),
+    ('number', FilterOperator.REGEX, r'30[01] \d{3}-1\d'),
+]
+
+# 演算子別のシナリオ（名前 -> 条件のリスト）
+BENCHMARK_SCENARIOS = {
+    'equals': [('type', FilterOperator.EQUALS, 'EN')],
+    'in': [('status', FilterOperator.IN, ['Active', 'Published'])],
+    'range': [('extracted_at', FilterOperator.BETWEEN, ['2023-06-01', '2024-06-01'])],
+    'contains': [('number', FilterOperator.CONTAINS, '489-1')],
+    'regex': [('number', FilterOperator.REGEX, r'30[01] \d{3}-1\d')],
+    'mixed': BENCHMARK_CONDITIONS,
+    'indexed': [
+        ('number', FilterOperator.REGEX, r'30[01] \d{3}-1\d'),
+        ('status', FilterOperator.EQUALS, 'withdrawn'),
+        ('source', FilterOperator.IN, ['PDF']),
+        ('directive', FilterOperator.EQUALS, 'LVD 2014/35/EU'),
+    ],
+}
+
+def generate_standards(size: int, seed: int = 42):
+    """合成の標準規格データを生成"""
+    rng = random.Random(seed)
+    base = datetime(2023, 1, 1)
+    types = ['EN', 'EN', 'EN', 'IEC', 'ISO']
+    statuses = ['Active', 'Published', 'Withdrawn', 'Superseded']
+    directives = ['RED 2014/53/EU', 'EMC 2014/30/EU', 'LVD 2014/35/EU', None]
+    
+    standards = []
+    for i in range(size):
+        standard_type = rng.choice(types)
+        number_part = f"{rng.randint(300, 303)} {rng.randint(0, 999):03d}-{rng.randint(1, 60)}"
+        version = str(rng.randint(2005, 2024))
+        standards.append({
+            'id': str(i),
+            'number': f"{standard_type} {number_part}:{version}",
+            'type': standard_type,
+            'number_part': number_part,
+            'version': version,
+            'status': rng.choice(statuses),
+            'directive': rng.choice(directives),
+            'extracted_at': (base + timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60))).isoformat(),
+            'source': 'PDF',
+            'etsi_info': None
+        })
+    return standards
+
+def build_filter(conditions=BENCHMARK_CONDITIONS) -> StandardFilter:
+    """計測用の条件を設定したフィルターを作成"""
+    filter_obj = StandardFilter()
+    for field, operator, value in conditions:
+        filter_obj.add_filter(field, operator, value)
+    return filter_obj
+
+def measure(label: str, func, repeat: int):
+    """最良時間を計測して表示"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    
+    print(f"{label:<32} {best * 1000:10.1f} ms  ({len(result)}件)")
+    return result
+
+def build_registry(standards, data_dir: Path) -> StandardRegistry:
+    """合成データを読み込んだレジストリを作成"""
+    data_file = data_dir / 'standards_registry.json'
+    with open(data_file, 'w', encoding='utf-8') as f:
+        json.dump(standards, f, ensure_ascii=False)
+    return StandardRegistry(data_file)
+
+def run_scenarios(registry: StandardRegistry, repeat: int):
+    """シナリオごとに行単位と列指向の処理時間を比較"""
+    view = ColumnarView(registry)
+    planner = QueryPlanner(registry)
+    registry.sorted_entries()
+    
+    start = time.perf_counter()
+    len(view)
+    print(f"{'columnar build':<32} {(time.perf_counter() - start) * 1000:10.1f} ms")
+    
+    for name, conditions in BENCHMARK_SCENARIOS.items():
+        compiled = build_filter(conditions).compile()
+        # 行単位はAPIと同じくレジストリから辞書を取り出して評価
+        baseline = measure(f"[{name}] row-wise", lambda: compiled.filter(registry.get_all_standards()), repeat)
+        # 列の作成は初回のみ（2回目以降の計測は作成済みの列を使う）
+        result = measure(f"[{name}] columnar", lambda: view.filter(compiled), repeat)
+        measure(f"[{name}] columnar (mask only)", lambda: view.mask(compiled).nonzero()[0], repeat)
+        assert result == baseline, f"列指向ビューの結果が一致しません: {name}"
+        # 副索引は初回の計画作成時に構築される
+        result = measure(f"[{name}] planned", lambda: planner.execute(compiled), repeat)
+        assert result == baseline, f"実行計画の結果が一致しません: {name}"
+
+def generate_profiles(count: int, seed: int = 7):
+    """顧客ごとのフィルタープロファイルを模した条件を生成（条件の多くはプロファイル間で重複する）"""
+    rng = random.Random(seed)
+    profiles = {}
+    for i in range(count):
+        kwargs = {
+            'type': rng.choice(['EN', 'IEC', 'ISO']),
+            'status': rng.choice(['Active', 'Published', 'Withdrawn']),
+        }
+        if rng.random() < 0.5:
+            kwargs['directive'] = rng.choice(['RED', 'EMC', 'LVD'])
+        if rng.random() < 0.3:
+            kwargs['date_start'] = rng.choice(['2023-06-01', '2024-01-01'])
+        profiles[f"profile-{i}"] = kwargs
+    return profiles
+
+def run_batch(standards, count: int, repeat: int):
+    """プロファイルごとの個別評価と一括評価を比較"""
+    filter_obj = StandardFilter()
+    compiled = {name: filter_obj.compile(**kwargs) for name, kwargs in generate_profiles(count).items()}
+    
+    def separately():
+        return {name: [s['id'] for s in profile.filter(standards)] for name, profile in compiled.items()}
+    
+    batch = BatchFilter(compiled)
+    print(f"{count}プロファイル / 共有後の条件 {len(batch.conditions)}件")
+    baseline = measure("profiles (separately)", separately, repeat)
+    result = measure("profiles (batch)", lambda: BatchFilter(compiled).evaluate(standards), repeat)
+    assert result == baseline, "一括評価の結果が一致しません"
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="フィルター性能計測")
+    parser.add_argument("--size", type=int, default=100000, help="標準規格の件数")
+    parser.add_argument("--repeat", type=int, default=3, help="計測回数（最良値を表示）")
+    parser.add_argument("--profiles", type=int, default=0, help="一括評価を計測するプロファイル数（0は計測しない）")
+    
+    args = parser.parse_args()
+    
+    standards = generate_standards(args.size)
+    print(f"{args.size}件 / {len(BENCHMARK_CONDITIONS)}条件")
+    
+    filter_obj = build_filter()
+    baseline = measure("apply_filters", lambda: filter_obj.apply_filters(standards), args.repeat)
+    
+    if hasattr(filter_obj, 'compile'):
+        compiled = filter_obj.compile()
+        result = measure("compiled (reused)", lambda: compiled.filter(standards), args.repeat)
+        assert result == baseline, "コンパイル済みフィルターの結果が一致しません"
+    
+    if args.profiles:
+        print()
+        run_batch(standards, args.profiles, args.repeat)
+    
+    if COLUMNAR_AVAILABLE:
+        print()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            run_scenarios(build_registry(standards, Path(temp_dir)), args.repeat)
+
+if __name__ == "__main__":
+    main()
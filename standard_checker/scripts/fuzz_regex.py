@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+正規表現ガードのファジング・性能計測スクリプト
+既知の危険なパターンとランダム生成したパターンを検証し、
+受理されたパターンが敵対的な入力に対して制限時間内に照合を終えることを確認する
+"""
+
+import argparse
+import multiprocessing
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.filter.safe_regex import validate_pattern, UnsafePatternError
+from modules.pdf_parser.parser import DEFAULT_STANDARD_PATTERNS
+
+# 既知の危険なパターン（全て拒否されるべきもの）
+ADVERSARIAL_PATTERNS = [
+    r'(a+)+$',
+    r'(a*)*$',
+    r'(a|aa)+$',
+    r'(a|a)*$',
+    r'(a|ab)*c',
+    r'^(\w+\s?)*$',
+    r'(.*a){12}',
+    r'(x+x+)+y',
+    r'([a-z]+)*=',
+    r'(\d+|\d+\.)+$',
+    r'^(([a-z])+.)+[A-Z]([a-z])+$',
+    r'(a)\1',
+    r'(?P<x>a)(?P=x)',
+]
+
+# ランダム生成に使う部品
+ATOMS = ['a', 'b', 'x', '.', r'\w', r'\d', r'\s', '[ab]', '[a-z]', '[^b]']
+QUANTIFIERS = ['', '', '*', '+', '?', '{1,3}', '{2,}', '*?', '++']
+
+def generate_pattern(rng: random.Random, depth: int = 0) -> str:
+    """ランダムな正規表現を生成"""
+    parts = []
+    for _ in range(rng.randint(1, 3)):
+        choice = rng.random()
+        if depth < 3 and choice < 0.25:
+            inner = generate_pattern(rng, depth + 1)
+            part = f"({inner})"
+        elif depth < 3 and choice < 0.4:
+            alternatives = [generate_pattern(rng, depth + 1) for _ in range(rng.randint(2, 3))]
+            part = f"(?:{'|'.join(alternatives)})"
+        else:
+            part = rng.choice(ATOMS)
+        parts.append(part + rng.choice(QUANTIFIERS))
+    pattern = ''.join(parts)
+    return pattern + ('$' if depth == 0 and rng.random() < 0.5 else '')
+
+def adversarial_subjects(length: int):
+    """バックトラックを誘発しやすい入力"""
+    return [
+        'a' * length + '!',
+        'ab' * (length // 2) + '!',
+        ' ' * length + '!',
+        'x' * length,
+        '1' * length + '.',
+        'a' * length + 'b' * length,
+    ]
+
+def run_pattern(args):
+    """1パターンを全ての入力で照合し、最長時間（秒）を返す（別プロセスで実行）"""
+    pattern, subjects = args
+    regex = re.compile(pattern, re.IGNORECASE)
+    worst = 0.0
+    for subject in subjects:
+        start = time.perf_counter()
+        regex.search(subject)
+        worst = max(worst, time.perf_counter() - start)
+    return worst
+
+def time_patterns(patterns, subjects, limit: float):
+    """パターンごとの最長照合時間を計測（制限時間を超えたものはNone）"""
+    results = {}
+    pool = multiprocessing.Pool(1)
+    try:
+        for pattern in patterns:
+            try:
+                results[pattern] = pool.apply_async(run_pattern, ((pattern, subjects),)).get(timeout=limit)
+            except multiprocessing.TimeoutError:
+                results[pattern] = None
+                # 照合中のプロセスは中断できないため作り直す
+                pool.terminate()
+                pool = multiprocessing.Pool(1)
+    finally:
+        pool.terminate()
+    return results
+
+def classify(pattern: str):
+    """パターンを検証し、拒否理由（受理の場合はNone）を返す"""
+    try:
+        validate_pattern(pattern, re.IGNORECASE)
+    except (UnsafePatternError, re.error) as e:
+        return str(e)
+    return None
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="正規表現ガードのファジング")
+    parser.add_argument("--count", type=int, default=500, help="ランダム生成するパターン数")
+    parser.add_argument("--seed", type=int, default=0, help="乱数シード")
+    parser.add_argument("--length", type=int, default=28, help="敵対的な入力の長さ")
+    parser.add_argument("--limit", type=float, default=1.0, help="受理パターンの照合の制限時間（秒）")
+    parser.add_argument("--raw", action="store_true", help="拒否したパターンもガードなしで計測する")
+    
+    args = parser.parse_args()
+    subjects = adversarial_subjects(args.length)
+    failures = 0
+    
+    # 既知の危険なパターンは全て拒否されること
+    print("== 既知の危険なパターン ==")
+    for pattern in ADVERSARIAL_PATTERNS:
+        reason = classify(pattern)
+        print(f"{'rejected' if reason else 'ACCEPTED':<9} {pattern:<36} {reason or ''}")
+        failures += reason is None
+    
+    if args.raw:
+        print("\n== ガードなしの照合時間 ==")
+        for pattern, elapsed in time_patterns(ADVERSARIAL_PATTERNS, subjects, args.limit).items():
+            label = f"> {args.limit:.1f} s" if elapsed is None else f"{elapsed * 1000:.1f} ms"
+            print(f"{pattern:<36} {label}")
+    
+    # 既定の抽出パターンは受理されること
+    for pattern in DEFAULT_STANDARD_PATTERNS:
+        if classify(pattern):
+            print(f"既定の抽出パターンが拒否されました: {pattern}")
+            failures += 1
+    
+    # ランダム生成したパターンのうち受理されたものは制限時間内に終わること
+    rng = random.Random(args.seed)
+    generated = list(dict.fromkeys(generate_pattern(rng) for _ in range(args.count)))
+    accepted = [p for p in generated if classify(p) is None]
+    
+    start = time.perf_counter()
+    timings = time_patterns(accepted, subjects, args.limit)
+    elapsed = time.perf_counter() - start
+    
+    slow = [p for p, t in timings.items() if t is None]
+    slowest = sorted(((t, p) for p, t in timings.items() if t is not None), reverse=True)[:5]
+    
+    print(f"\n== ランダム生成 {len(generated)}件（受理 {len(accepted)}件 / 拒否 {len(generated) - len(accepted)}件）==")
+    print(f"計測時間: {elapsed:.1f} s")
+    for t, pattern in slowest:
+        print(f"{t * 1000:8.2f} ms  {pattern}")
+    for pattern in slow:
+        print(f"制限時間超過: {pattern}")
+    failures += len(slow)
+    
+    if failures:
+        print(f"\n失敗: {failures}件")
+        sys.exit(1)
+    print("\n全て成功")
+
+if __name__ == "__main__":
+    main()
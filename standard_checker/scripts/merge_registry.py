@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+レジストリマージスクリプト
+他拠点のレジストリ（JSON）や手動編集したCSVエクスポートを一括で取り込む
+"""
+
+import argparse
+import sys
+import logging
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.standards.registry import StandardRegistry, MERGE_POLICIES
+
+def setup_logging(log_level: str = "INFO"):
+    """ログ設定"""
+    Path('data/logs').mkdir(parents=True, exist_ok=True)
+    logging.basicConfig(
+        level=getattr(logging, log_level.upper()),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('data/logs/merge_registry.log'),
+            logging.StreamHandler()
+        ]
+    )
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="レジストリ一括マージ")
+    parser.add_argument("inputs", nargs="+", help="マージ元ファイル（.json / .csv）")
+    parser.add_argument("--registry", "-r", help="マージ先レジストリファイル (デフォルト: data/output/standards_registry.json)")
+    parser.add_argument("--policy", "-p", choices=MERGE_POLICIES, default="newest",
+                        help="競合解決ポリシー（newest: last_updatedが新しい方, local: ローカルを維持）")
+    parser.add_argument("--dry-run", action="store_true", help="反映せずに集計のみ表示")
+    parser.add_argument("--log-level", default="INFO", help="ログレベル")
+    
+    args = parser.parse_args()
+    
+    # ログ設定
+    setup_logging(args.log_level)
+    logger = logging.getLogger(__name__)
+    
+    try:
+        logger.info("=== レジストリマージ開始 ===")
+        
+        registry = StandardRegistry(data_file=Path(args.registry) if args.registry else None)
+        
+        summaries = []
+        for input_path in args.inputs:
+            path = Path(input_path)
+            if not path.exists():
+                logger.error(f"入力ファイルが見つかりません: {path}")
+                sys.exit(1)
+            
+            summaries.append(registry.merge_from(path, policy=args.policy, save=False, dry_run=args.dry_run))
+        
+        # 全ファイル分をまとめて保存
+        if not args.dry_run:
+            registry.save_data()
+        
+        logger.info("=== マージ結果 ===")
+        for summary in summaries:
+            logger.info(f"  {summary['file']}: 行数 {summary['rows']}, 追加 {summary['added']}, "
+                        f"更新 {summary['updated']}, 変更なし {summary['unchanged']}, "
+                        f"ローカル維持 {summary['kept_local']}, 重複 {summary['duplicate']}, "
+                        f"不正 {summary['invalid']}")
+        logger.info(f"総標準規格数: {len(registry.standards)}")
+        
+        logger.info("=== レジストリマージ完了 ===")
+        
+    except Exception as e:
+        logger.error(f"マージエラー: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ PDFからの標準規格抽出とETSI情報の更新を一括実行
 """
 
 import argparse
+import asyncio
 import sys
 import logging
 from pathlib import Path
@@ -16,7 +17,8 @@ sys.path.insert(0, str(project_root))
 
 from modules.pdf_parser.parser import PDFParser
 from modules.standards.registry import StandardRegistry
-from modules.etsi_crawler.query import ETSICrawler
+from modules.etsi_crawler.query import ETSICrawler, DEFAULT_WORKERS, FETCH_MODES
+from modules.etsi_crawler.rate_limit import HostRateLimiter, DEFAULT_REQUEST_RATE
 from modules.filter.filter import StandardFilter
 
 def setup_logging(log_level: str = "INFO"):
@@ -36,6 +38,15 @@ def main():
     parser.add_argument("--input", "-i", required=True, help="入力PDFファイルパス")
     parser.add_argument("--output", "-o", help="出力ディレクトリ (デフォルト: data/output)")
     parser.add_argument("--etsi-check", action="store_true", help="ETSI情報を確認")
+    parser.add_argument("--workers", "-w", type=int, default=DEFAULT_WORKERS,
+                        help=f"ETSI確認の並行数（ブラウザーでの検索は1件ずつ、デフォルト: {DEFAULT_WORKERS}）")
+    parser.add_argument("--rate", type=float, default=DEFAULT_REQUEST_RATE,
+                        help=f"ETSIポータルへの全体のリクエスト数（回/秒、デフォルト: {DEFAULT_REQUEST_RATE}）")
+    parser.add_argument("--fetch-mode", choices=FETCH_MODES, default="auto",
+                        help="取得方法（auto: HTTPで結果の表が得られない場合だけSelenium、デフォルト: auto）")
+    parser.add_argument("--lightweight", action="store_true",
+                        help="Seleniumで画像・スタイルシート・フォント・他ホストのスクリプトを読み込まない")
+    parser.add_argument("--profile-dir", help="実行をまたいで再利用するChromeのプロファイル（キャッシュ）のディレクトリ")
     parser.add_argument("--export-csv", action="store_true", help="CSV形式でエクスポート")
     parser.add_argument("--export-excel", action="store_true", help="Excel形式でエクスポート")
     parser.add_argument("--filter-status", help="特定のステータスでフィルタリング")
@@ -80,16 +91,10 @@ def main():
         if args.etsi_check:
             logger.info("ステップ3: ETSI情報を確認")
             
-            with ETSICrawler(use_selenium=True) as crawler:
-                for standard in standards:
-                    standard_number = standard.get('number_part', '')
-                    if standard_number:
-                        logger.info(f"ETSI確認: {standard_number}")
-                        
-                        etsi_info = crawler.search_standard(standard_number)
-                        
-                        # レジストリを更新
-                        registry.update_standard(standard['id'], {'etsi_info': etsi_info})
+            crawler = ETSICrawler(fetch_mode=args.fetch_mode, lightweight=args.lightweight,
+                                  profile_dir=args.profile_dir, rate_limiter=HostRateLimiter(args.rate))
+            with crawler:
+                asyncio.run(_check_etsi(crawler, registry, standards, args.workers))
         
         # ステップ4: フィルタリング（オプション）
         filtered_standards = standards
@@ -126,10 +131,18 @@ def main():
         logger.info(f"バージョン情報有り: {stats['with_version']}")
         
         logger.info("=== パイプライン完了 ===")
-        
+    
     except Exception as e:
         logger.error(f"パイプライン実行エラー: {str(e)}")
         sys.exit(1)
 
+async def _check_etsi(crawler, registry, standards, workers):
+    """ETSI情報を並行に取得し、受け取った順にレジストリを更新"""
+    targets = [standard for standard in standards if standard.get('number_part')]
+    
+    async for index, _, etsi_info in crawler.iter_batch_results(
+            [standard['number_part'] for standard in targets], workers):
+        registry.update_standard(targets[index]['id'], {'etsi_info': etsi_info})
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
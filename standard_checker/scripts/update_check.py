@@ -5,9 +5,9 @@ ETSI更新状況確認スクリプト
 """
 
 import argparse
+import asyncio
 import sys
 import logging
-import time
 from pathlib import Path
 from datetime import datetime, timedelta
 
@@ -16,7 +16,8 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from modules.standards.registry import StandardRegistry
-from modules.etsi_crawler.query import ETSICrawler
+from modules.etsi_crawler.query import ETSICrawler, DEFAULT_WORKERS, FETCH_MODES
+from modules.etsi_crawler.rate_limit import HostRateLimiter, DEFAULT_REQUEST_RATE
 
 def setup_logging(log_level: str = "INFO"):
     """ログ設定"""
@@ -37,9 +38,21 @@ def main():
     parser.add_argument("--standard", "-s", help="特定の標準規格番号のみチェック")
     parser.add_argument("--export", "-e", help="結果をファイルにエクスポート")
     parser.add_argument("--log-level", default="INFO", help="ログレベル")
-    parser.add_argument("--delay", type=int, default=2, help="リクエスト間の待機時間（秒）")
+    parser.add_argument("--workers", "-w", type=int, default=DEFAULT_WORKERS,
+                        help=f"並行検索数（ブラウザーでの検索は1件ずつ、デフォルト: {DEFAULT_WORKERS}）")
+    parser.add_argument("--rate", type=float,
+                        help=f"ETSIポータルへの全体のリクエスト数（回/秒、デフォルト: {DEFAULT_REQUEST_RATE}）")
+    parser.add_argument("--delay", type=float, help="リクエスト間の最小間隔（秒、--rateの逆数として扱う）")
+    parser.add_argument("--fetch-mode", choices=FETCH_MODES, default="auto",
+                        help="取得方法（auto: HTTPで結果の表が得られない場合だけSelenium、デフォルト: auto）")
+    parser.add_argument("--lightweight", action="store_true",
+                        help="Seleniumで画像・スタイルシート・フォント・他ホストのスクリプトを読み込まない")
+    parser.add_argument("--profile-dir", help="実行をまたいで再利用するChromeのプロファイル（キャッシュ）のディレクトリ")
+    parser.add_argument("--changes-since", help="指定日時（ISO形式）以降のETSIステータス遷移を履歴からレポート")
     
     args = parser.parse_args()
+    if args.delay is not None and args.delay <= 0:
+        parser.error("--delay には正の秒数を指定してください")
     
     # ログ設定
     setup_logging(args.log_level)
@@ -92,54 +105,14 @@ def main():
         
         logger.info(f"チェック対象: {len(standards_to_check)}件 / 総数: {len(all_standards)}件")
         
-        # ETSI情報をチェック
-        update_results = []
+        # ETSI情報をチェック（並行に検索し、レジストリは結果を受け取った順に更新）
+        rate = args.rate if args.rate is not None else (1 / args.delay if args.delay is not None else DEFAULT_REQUEST_RATE)
+        crawler = ETSICrawler(fetch_mode=args.fetch_mode, lightweight=args.lightweight,
+                              profile_dir=args.profile_dir, rate_limiter=HostRateLimiter(rate))
+        logger.info(f"並行数: {args.workers} / レート上限: {rate}回/秒")
         
-        with ETSICrawler(use_selenium=True) as crawler:
-            for i, standard in enumerate(standards_to_check):
-                standard_number = standard.get('number_part', '')
-                if not standard_number:
-                    continue
-                
-                logger.info(f"進行状況: {i+1}/{len(standards_to_check)} - {standard_number}")
-                
-                try:
-                    # ETSI情報を取得
-                    etsi_info = crawler.search_standard(standard_number)
-                    
-                    # 変更があるかチェック
-                    old_etsi_info = standard.get('etsi_info')
-                    has_changes = _compare_etsi_info(old_etsi_info, etsi_info)
-                    
-                    if has_changes or not old_etsi_info:
-                        # レジストリを更新
-                        registry.update_standard(standard['id'], {'etsi_info': etsi_info})
-                        
-                        update_results.append({
-                            'standard_id': standard['id'],
-                            'standard_number': standard['number'],
-                            'has_changes': has_changes,
-                            'old_status': old_etsi_info.get('status') if old_etsi_info else None,
-                            'new_status': etsi_info.get('status'),
-                            'versions_count': etsi_info.get('total_versions', 0),
-                            'update_time': datetime.now().isoformat()
-                        })
-                        
-                        logger.info(f"更新検出: {standard_number} - {etsi_info.get('status', 'Unknown')}")
-                    else:
-                        logger.debug(f"変更なし: {standard_number}")
-                
-                except Exception as e:
-                    logger.error(f"ETSI確認エラー ({standard_number}): {str(e)}")
-                    update_results.append({
-                        'standard_id': standard['id'],
-                        'standard_number': standard['number'],
-                        'error': str(e),
-                        'update_time': datetime.now().isoformat()
-                    })
-                
-                # レート制限
-                time.sleep(args.delay)
+        with crawler:
+            update_results = asyncio.run(_check_standards(crawler, registry, standards_to_check, args.workers))
         
         # レジストリを保存
         registry.save_data()
@@ -161,6 +134,18 @@ def main():
                     logger.info(f"  {result['standard_number']}: "
                               f"{result.get('old_status', 'N/A')} -> {result.get('new_status', 'N/A')}")
         
+        # 履歴からのETSIステータス遷移レポート
+        history_changes = []
+        if args.changes_since:
+            history_changes = registry.get_changed_standards(
+                args.changes_since, datetime.now().isoformat(), field='etsi_status'
+            )
+            logger.info(f"=== {args.changes_since} 以降のETSIステータス遷移: {len(history_changes)}件 ===")
+            for item in history_changes:
+                for transition in item['transitions']:
+                    logger.info(f"  {item['number']}: {transition['old']} -> {transition['new']} "
+                              f"({transition['timestamp']})")
+        
         # 結果のエクスポート
         if args.export:
             export_path = Path(args.export)
@@ -173,17 +158,62 @@ def main():
                     'total_checked': len(standards_to_check),
                     'changes_detected': changes_count,
                     'errors': errors_count,
-                    'results': update_results
+                    'results': update_results,
+                    'history_changes': history_changes
                 }, f, ensure_ascii=False, indent=2)
             
             logger.info(f"結果をエクスポートしました: {export_path}")
         
         logger.info("=== 更新確認完了 ===")
-        
+    
     except Exception as e:
         logger.error(f"更新確認エラー: {str(e)}")
         sys.exit(1)
 
+async def _check_standards(crawler, registry, standards, workers):
+    """標準規格のETSI情報を並行に取得し、変更のあったものをレジストリに反映"""
+    logger = logging.getLogger(__name__)
+    targets = [standard for standard in standards if standard.get('number_part')]
+    update_results = []
+    
+    async for index, standard_number, etsi_info in crawler.iter_batch_results(
+            [standard['number_part'] for standard in targets], workers):
+        standard = targets[index]
+        
+        try:
+            # 変更があるかチェック
+            old_etsi_info = standard.get('etsi_info')
+            has_changes = _compare_etsi_info(old_etsi_info, etsi_info)
+            
+            if has_changes or not old_etsi_info:
+                # レジストリを更新
+                registry.update_standard(standard['id'], {'etsi_info': etsi_info})
+                
+                update_results.append({
+                    'standard_id': standard['id'],
+                    'standard_number': standard['number'],
+                    'has_changes': has_changes,
+                    'old_status': old_etsi_info.get('status') if old_etsi_info else None,
+                    'new_status': etsi_info.get('status'),
+                    'versions_count': etsi_info.get('total_versions', 0),
+                    'update_time': datetime.now().isoformat()
+                })
+                
+                logger.info(f"更新検出: {standard_number} - {etsi_info.get('status', 'Unknown')}")
+            else:
+                logger.debug(f"変更なし: {standard_number}")
+        
+        except Exception as e:
+            logger.error(f"ETSI確認エラー ({standard_number}): {str(e)}")
+            update_results.append({
+                'standard_id': standard['id'],
+                'standard_number': standard['number'],
+                'error': str(e),
+                'update_time': datetime.now().isoformat()
+            })
+    
+    return update_results
+
 def _compare_etsi_info(old_info, new_info):
     """ETSI情報の変更をチェック"""
     if not old_info and new_info:
@@ -0,0 +1,60 @@
+"""
+APIルートの単体テスト
+"""
+
+import pytest
+import json
+import tempfile
+from pathlib import Path
+import sys
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.dependencies import get_registry
+from modules.standards.registry import StandardRegistry
+
+class TestExportRoute:
+    """エクスポートAPIのテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.registry = StandardRegistry(data_file=Path(self.temp_dir.name) / 'registry.json')
+        app.dependency_overrides[get_registry] = lambda: self.registry
+        self.client = TestClient(app)
+        
+        self.ids = {}
+        for number, number_part in [('EN 301 489-17:2017', '301 489-17'),
+                                    ('EN 301 489-3:2019', '301 489-3'),
+                                    ('EN 300 328:2019', '300 328')]:
+            self.ids[number] = self.registry.add_standard({
+                'number': number, 'type': 'EN', 'number_part': number_part, 'version': number[-4:]
+            })
+    
+    def teardown_method(self):
+        """各テストメソッドの後に実行"""
+        app.dependency_overrides.pop(get_registry, None)
+        self.temp_dir.cleanup()
+    
+    def test_export_ids_in_natural_order(self):
+        """ID指定のエクスポートも番号の自然順で出力されるテスト"""
+        ids = [self.ids['EN 301 489-17:2017'], self.ids['EN 300 328:2019'],
+               self.ids['EN 301 489-3:2019'], self.ids['EN 300 328:2019']]
+        
+        response = self.client.get('/api/export/json', params={'ids': ','.join(ids), 'columns': 'number'})
+        
+        assert response.status_code == 200
+        assert [row['number'] for row in json.loads(response.text)] == [
+            'EN 300 328:2019', 'EN 301 489-3:2019', 'EN 301 489-17:2017'
+        ]
+    
+    def test_filter_rejects_overlapping_repeats(self):
+        """重なる上限なしの繰り返しを並べたクエリが評価前に拒否されるテスト"""
+        response = self.client.post('/api/filter', params={'q': 'number ~ ".*.*.*.*.*.*Z"'})
+        
+        assert response.status_code == 400
@@ -0,0 +1,127 @@
+"""
+一括フィルター評価モジュールの単体テスト
+"""
+
+import pytest
+import tempfile
+from pathlib import Path
+import sys
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.filter.batch import BatchFilter, evaluate_batch
+from modules.filter.filter import StandardFilter, FilterOperator
+from modules.filter.query import compile_query
+from modules.standards.registry import StandardRegistry
+
+class TestBatchFilter:
+    """BatchFilterクラスのテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.standards = [
+            {'id': '1', 'number': 'EN 301 489-17:2017', 'type': 'EN', 'status': 'Active',
+             'directive': 'RED 2014/53/EU', 'extracted_at': '2024-03-01T10:00:00'},
+            {'id': '2', 'number': 'EN 300 328:2019', 'type': 'EN', 'status': 'Withdrawn',
+             'directive': 'RED 2014/53/EU', 'extracted_at': '2023-06-01T00:00:00'},
+            {'id': '3', 'number': 'IEC 62368-1:2014', 'type': 'IEC', 'status': 'Active',
+             'directive': 'LVD 2014/35/EU', 'extracted_at': '2024-01-15T00:00:00'},
+            {'id': '4', 'number': 'CISPR 32:2015', 'type': 'CISPR', 'status': 'Active',
+             'directive': None, 'extracted_at': '2022-01-01T00:00:00', 'etsi_info': None},
+        ]
+        self.profiles = {
+            'red-active': {'directive': 'RED', 'status': 'Active'},
+            'active': {'status': 'Active'},
+            'en': {'type': 'EN'},
+            'en-active': {'type': 'EN', 'status': 'Active'},
+            'recent': {'date_start': '2024-01-01'},
+            'nothing': {'type': 'ISO'},
+        }
+    
+    def expected(self, profiles):
+        """プロファイルごとに個別に評価した結果"""
+        return {
+            name: [s['id'] for s in StandardFilter().apply_filters(self.standards, **kwargs)]
+            for name, kwargs in profiles.items()
+        }
+    
+    def test_matches_individual_evaluation(self):
+        """個別評価と結果が一致することのテスト"""
+        results = StandardFilter().apply_batch(self.standards, self.profiles)
+        assert results == self.expected(self.profiles)
+        assert results['red-active'] == ['1']
+        assert results['nothing'] == []
+    
+    def test_shared_conditions(self):
+        """同じ条件がプロファイル間で共有されることのテスト"""
+        filter_obj = StandardFilter()
+        batch = BatchFilter({name: filter_obj.compile(**kwargs) for name, kwargs in self.profiles.items()})
+        
+        # status=Active は3プロファイルで共有される
+        assert len(batch.conditions) == 5
+        assert max(condition.users for condition in batch.conditions) == 3
+    
+    def test_shared_condition_evaluated_once_per_value(self):
+        """共有する条件の判定関数がフィールド値ごとに1回だけ呼ばれることのテスト"""
+        calls = []
+        compiled = {name: StandardFilter().compile(**kwargs) for name, kwargs in self.profiles.items()}
+        batch = BatchFilter(compiled)
+        
+        for condition in batch.conditions:
+            if condition.field == 'status':
+                predicate = condition.predicate
+                condition.predicate = lambda value, predicate=predicate: calls.append(value) or predicate(value)
+        
+        batch.evaluate(self.standards)
+        assert sorted(calls) == ['Active', 'Withdrawn']
+    
+    def test_memo_distinguishes_types(self):
+        """等しい値でも型が異なれば別々に判定されるテスト（True == 1）"""
+        standards = [{'id': '1', 'status': 1}, {'id': '2', 'status': True}, {'id': '3', 'status': 1.0}]
+        results = evaluate_batch(standards, {'true': StandardFilter().compile(status='true')})
+        
+        assert results == {'true': ['2']}
+    
+    def test_profile_without_conditions(self):
+        """条件のないプロファイルは全件に一致することのテスト"""
+        results = evaluate_batch(self.standards, {'all': StandardFilter().compile()})
+        assert results == {'all': ['1', '2', '3', '4']}
+    
+    def test_queries(self):
+        """クエリ言語のプロファイルのテスト"""
+        results = evaluate_batch(self.standards, {
+            'and': compile_query('status = Active AND type = EN'),
+            'or': compile_query('type = IEC OR directive contains RED'),
+            'filter': StandardFilter().compile(status='Active', type='EN'),
+        })
+        assert results == {'and': ['1'], 'or': ['1', '2', '3'], 'filter': ['1']}
+    
+    def test_list_values(self):
+        """リストの値を持つ条件のテスト"""
+        profiles = {}
+        for name in ('a', 'b'):
+            filter_obj = StandardFilter()
+            filter_obj.add_filter('status', FilterOperator.IN, ['Active', 'Published'])
+            profiles[name] = filter_obj.compile(type='EN')
+        batch = BatchFilter(profiles)
+        
+        assert len(batch.conditions) == 2
+        assert batch.evaluate(self.standards) == {'a': ['1'], 'b': ['1']}
+    
+    def test_execute_registry(self):
+        """レジストリの全エントリの評価テスト"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            registry = StandardRegistry(data_file=Path(temp_dir) / 'registry.json')
+            for standard in self.standards:
+                registry.add_standard({k: v for k, v in standard.items() if k != 'id'})
+            
+            batch = BatchFilter({name: StandardFilter().compile(**kwargs) for name, kwargs in self.profiles.items()})
+            results = batch.execute(registry)
+            
+            expected = {
+                name: [s['id'] for s in StandardFilter().apply_filters(registry.get_all_standards(), **kwargs)]
+                for name, kwargs in self.profiles.items()
+            }
+            assert results == expected
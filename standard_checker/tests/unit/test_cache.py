@@ -0,0 +1,209 @@
+"""
+レジストリキャッシュモジュールの単体テスト
+"""
+
+import pytest
+import json
+import tempfile
+import threading
+from pathlib import Path
+import sys
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.standards import cache as cache_module
+from modules.standards.cache import RegistryCache, ESTIMATED_BYTES_PER_ENTRY
+from modules.standards.registry import StandardRegistry
+
+class TestRegistryCache:
+    """RegistryCacheクラスのテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.cache = RegistryCache(
+            base_dir=self.temp_path / 'tenants',
+            default_data_file=self.temp_path / 'default' / 'standards_registry.json',
+            max_registries=2
+        )
+        self.sample = {
+            'number': 'EN 301 489-1:2019',
+            'type': 'EN',
+            'number_part': '301 489-1',
+            'version': '2019',
+            'status': 'active'
+        }
+    
+    def teardown_method(self):
+        """各テストメソッドの後に実行"""
+        self.temp_dir.cleanup()
+    
+    def test_get_is_cached_per_tenant(self):
+        """テナントごとに同じインスタンスが返されるテスト"""
+        lab_a = self.cache.get('lab-a')
+        
+        assert self.cache.get('lab-a') is lab_a
+        assert self.cache.get('lab-b') is not lab_a
+        assert self.cache.get().data_file == self.temp_path / 'default' / 'standards_registry.json'
+        assert lab_a.data_file == self.temp_path / 'tenants' / 'lab-a' / 'standards_registry.json'
+        assert self.cache.hits == 1
+    
+    @pytest.mark.parametrize("tenant", ['../etc', 'a/b', '-lab', 'x' * 65])
+    def test_invalid_tenant(self, tenant):
+        """不正なテナントIDのテスト"""
+        with pytest.raises(ValueError):
+            self.cache.get(tenant)
+    
+    def test_evict_flushes_dirty_registry(self):
+        """解放時に未保存の変更が書き出されるテスト"""
+        registry = self.cache.get('lab-a')
+        registry.add_standard(self.sample)
+        assert registry.is_dirty()
+        
+        assert self.cache.evict('lab-a')
+        
+        with open(registry.data_file, 'r', encoding='utf-8') as f:
+            assert len(json.load(f)) == 1
+        assert self.cache.get('lab-a') is not registry
+        assert len(self.cache.get('lab-a').standards) == 1
+    
+    def test_lru_eviction_by_count(self):
+        """上限数を超えたら最も古く使われたレジストリが解放されるテスト"""
+        lab_a = self.cache.get('lab-a')
+        lab_a.add_standard(self.sample)
+        self.cache.get('lab-b')
+        self.cache.get('lab-a')
+        self.cache.get('lab-c')
+        
+        stats = self.cache.get_statistics()
+        assert stats['tenants'] == ['lab-a', 'lab-c']
+        assert stats['evictions'] == 1
+    
+    def test_lru_eviction_by_memory_budget(self):
+        """推定メモリ使用量の上限を超えたら解放されるテスト"""
+        self.cache.max_registries = 10
+        self.cache.max_bytes = ESTIMATED_BYTES_PER_ENTRY * 2
+        
+        lab_a = self.cache.get('lab-a')
+        lab_a.add_standard(self.sample)
+        self.cache.get('lab-b')
+        self.cache.get('lab-c')
+        
+        assert self.cache.get_statistics()['tenants'] == ['lab-b', 'lab-c']
+        # 解放前に保存されている
+        assert lab_a.data_file.exists()
+    
+    def test_close_flushes_all(self):
+        """終了時に全テナントが保存されるテスト"""
+        lab_a = self.cache.get('lab-a')
+        lab_a.add_standard(self.sample)
+        default = self.cache.get()
+        default.add_standard(self.sample)
+        
+        self.cache.close()
+        
+        assert lab_a.data_file.exists()
+        assert default.data_file.exists()
+        assert self.cache.get_statistics()['loaded'] == 0
+    
+    def test_in_use_registry_is_not_evicted(self):
+        """利用中のレジストリは上限を超えても解放されず、返却後に解放・保存されるテスト"""
+        with self.cache.use('lab-a') as lab_a:
+            self.cache.get('lab-b')
+            self.cache.get('lab-c')
+            lab_a.add_standard(self.sample)
+            
+            stats = self.cache.get_statistics()
+            assert stats['tenants'] == ['lab-a', 'lab-c']
+            assert stats['in_use'] == 1
+        
+        self.cache.get('lab-d')
+        assert 'lab-a' not in self.cache.get_statistics()['tenants']
+        with open(lab_a.data_file, 'r', encoding='utf-8') as f:
+            assert len(json.load(f)) == 1
+    
+    def test_explicit_evict_waits_for_release(self):
+        """利用中のレジストリの解放は返却まで延期されるテスト"""
+        with self.cache.use('lab-a') as lab_a:
+            assert not self.cache.evict('lab-a')
+            lab_a.add_standard(self.sample)
+        
+        assert self.cache.get_statistics()['loaded'] == 0
+        with open(lab_a.data_file, 'r', encoding='utf-8') as f:
+            assert len(json.load(f)) == 1
+    
+    def test_close_saves_in_use_registry_on_release(self):
+        """終了時に利用中だったレジストリは返却時に保存されるテスト"""
+        with self.cache.use('lab-a') as lab_a:
+            self.cache.close()
+            lab_a.add_standard(self.sample)
+        
+        with open(lab_a.data_file, 'r', encoding='utf-8') as f:
+            assert len(json.load(f)) == 1
+    
+    def test_loading_does_not_block_other_tenants(self, monkeypatch):
+        """読み込み中のテナントが他のテナントの取得を止めないテスト"""
+        loading = threading.Event()
+        proceed = threading.Event()
+        loads = []
+        
+        class SlowRegistry(StandardRegistry):
+            def __init__(self, data_file):
+                loads.append(data_file.parent.name)
+                if data_file.parent.name == 'slow':
+                    loading.set()
+                    proceed.wait(5)
+                super().__init__(data_file=data_file)
+        
+        monkeypatch.setattr(cache_module, 'StandardRegistry', SlowRegistry)
+        lab_a = self.cache.get('lab-a')
+        
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.cache.get('slow'))) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        assert loading.wait(5)
+        
+        # 他のテナントは読み込み済み・未読み込みのいずれも待たずに取得できる
+        assert self.cache.get('lab-a') is lab_a
+        self.cache.get('lab-b')
+        
+        proceed.set()
+        for thread in threads:
+            thread.join(5)
+        
+        # 同じテナントの同時の取得でも読み込みは1回
+        assert loads.count('slow') == 1
+        assert results[0] is results[1]
+    
+    def test_saving_does_not_block_other_tenants(self, monkeypatch):
+        """解放時の保存が全体のロックの外で行われ、他のテナントの取得を止めないテスト"""
+        saving = threading.Event()
+        proceed = threading.Event()
+        
+        lab_a = self.cache.get('lab-a')
+        lab_a.add_standard(self.sample)
+        original_save = lab_a.save_data
+        
+        def slow_save():
+            saving.set()
+            proceed.wait(5)
+            original_save()
+        
+        monkeypatch.setattr(lab_a, 'save_data', slow_save)
+        thread = threading.Thread(target=self.cache.evict, args=('lab-a',))
+        thread.start()
+        assert saving.wait(5)
+        
+        # 保存中も他のテナントを取得でき、保存中のテナントは読み込み直さずに同じものを返す
+        self.cache.get('lab-b')
+        assert self.cache.get('lab-a') is lab_a
+        
+        proceed.set()
+        thread.join(5)
+        assert not lab_a.is_dirty()
+        with open(lab_a.data_file, 'r', encoding='utf-8') as f:
+            assert len(json.load(f)) == 1
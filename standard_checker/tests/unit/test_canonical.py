@@ -0,0 +1,53 @@
+"""
+標準規格番号正規化モジュールの単体テスト
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.standards.canonical import CanonicalKey, parse_number, identity_key
+
+class TestCanonicalKey:
+    """同一性キーのテスト"""
+    
+    @pytest.mark.parametrize("text,expected", [
+        ("ETSI EN 301 489-17:2017", ('EN', '301 489', '17', '', '2017')),
+        ("EN 301  489-17", ('EN', '301 489', '17', '', '')),
+        ("en 301 489-17 V3.2.4", ('EN', '301 489', '17', '', '')),
+        ("EN 55032:2015+A11:2020", ('EN', '55032', '', 'A11', '2015')),
+        ("EN 300 328 2019", ('EN', '300 328', '', '', '')),
+        ("IEC 61000-4-2:2008", ('IEC', '61000', '4-2', '', '2008')),
+        ("ISO/IEC 17025:2017", ('ISO/IEC', '17025', '', '', '2017')),
+        ("301 489-1", ('', '301 489', '1', '', '')),
+    ])
+    def test_parse_number(self, text, expected):
+        """番号の解釈テスト"""
+        assert parse_number(text) == CanonicalKey(*expected)
+    
+    def test_parse_number_invalid(self):
+        """番号を解釈できない場合のテスト"""
+        assert parse_number("") is None
+        assert parse_number("Unknown") is None
+    
+    def test_keys_are_interned(self):
+        """表記揺れのあるキーが同一オブジェクトになるテスト"""
+        a = parse_number("ETSI EN 301 489-17:2017")
+        b = identity_key({'type': 'EN', 'number_part': '301 489-17', 'version': '2017'})
+        c = identity_key({'number': 'EN 301 489-17:2017'})
+        
+        assert a is b
+        assert a is c
+        assert a.number_part == '301 489-17'
+        assert str(a) == 'EN 301 489-17:2017'
+    
+    def test_identity_key_version_overrides_number(self):
+        """versionフィールドが番号中の年度より優先されるテスト"""
+        key = identity_key({'type': 'EN', 'number': 'EN 301 489-17:2017', 'version': 2019})
+        
+        assert key.year == '2019'
+        assert identity_key({'number': '', 'number_part': ''}) is None
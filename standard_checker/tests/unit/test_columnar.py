@@ -0,0 +1,170 @@
+"""
+列指向フィルターモジュールの単体テスト
+"""
+
+import pytest
+import tempfile
+from pathlib import Path
+import sys
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("numpy")
+
+from modules.filter.columnar import ColumnarView
+from modules.filter.filter import StandardFilter, FilterOperator
+from modules.standards.registry import StandardRegistry
+
+class TestColumnarView:
+    """ColumnarViewクラスのテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.registry = StandardRegistry(data_file=Path(self.temp_dir.name) / 'registry.json')
+        
+        self.standards = [
+            {'number': 'EN 301 489-17:2017', 'type': 'EN', 'number_part': '301 489-17', 'version': '2017',
+             'status': 'Active', 'directive': 'RED 2014/53/EU', 'extracted_at': '2024-03-01T10:00:00'},
+            {'number': 'EN 301 489-1:2019', 'type': 'EN', 'number_part': '301 489-1', 'version': '2019',
+             'status': 'Published', 'directive': None, 'extracted_at': '2023-12-31T23:59:59'},
+            {'number': 'IEC 62368-1:2014', 'type': 'IEC', 'number_part': '62368-1', 'version': '2014',
+             'status': 'Withdrawn', 'directive': 'LVD 2014/35/EU', 'extracted_at': '03/15/2024',
+             'etsi_info': {'status': 'Published'}},
+            {'number': 'EN 300 328:2019', 'type': 'EN', 'number_part': '300 328', 'version': 'V2.2.2',
+             'status': 'Active', 'directive': 'RED 2014/53/EU', 'extracted_at': 'unknown'},
+            {'number': 'ISO 9001', 'type': 'ISO', 'number_part': '9001', 'version': None,
+             'status': 'Unknown', 'directive': 'red', 'extracted_at': '2022-01-01'},
+        ]
+        for standard in self.standards:
+            self.registry.add_standard(standard)
+        
+        self.view = ColumnarView(self.registry)
+    
+    def teardown_method(self):
+        """各テストメソッドの後に実行"""
+        self.view.close()
+        self.temp_dir.cleanup()
+    
+    def assert_same_as_row_wise(self, field, operator, value):
+        """列指向と行単位の結果が一致することを確認"""
+        filter_obj = StandardFilter()
+        filter_obj.add_filter(field, operator, value)
+        compiled = filter_obj.compile()
+        
+        expected = compiled.filter(self.registry.get_all_standards())
+        assert self.view.filter(compiled) == expected
+        return expected
+    
+    @pytest.mark.parametrize("field,operator,value", [
+        ('type', FilterOperator.EQUALS, 'en'),
+        ('number', FilterOperator.EQUALS, 'EN 300 328:2019'),
+        ('directive', FilterOperator.EQUALS, 'None'),
+        ('status', FilterOperator.IN, ['Active', 'Unknown']),
+        ('directive', FilterOperator.IN, [None, 'red']),
+        ('status', FilterOperator.NOT_IN, ['Active']),
+        ('etsi_info', FilterOperator.NOT_IN, [None, '']),
+        ('number', FilterOperator.CONTAINS, '489'),
+        ('directive', FilterOperator.CONTAINS, 'RED'),
+        ('number', FilterOperator.CONTAINS, ''),
+        ('number', FilterOperator.STARTS_WITH, 'en 301'),
+        ('number', FilterOperator.ENDS_WITH, ':2019'),
+        ('number', FilterOperator.ENDS_WITH, '9001'),
+        ('number', FilterOperator.REGEX, r'489-1\b'),
+        ('extracted_at', FilterOperator.GREATER_THAN, '2024-01-01'),
+        ('extracted_at', FilterOperator.LESS_THAN, '2024-01-01T00:00:00'),
+        ('extracted_at', FilterOperator.BETWEEN, ['2023-12-31', '2024-03-10']),
+        ('extracted_at', FilterOperator.GREATER_THAN, 'not a date'),
+        ('version', FilterOperator.GREATER_THAN, '2015'),
+        ('version', FilterOperator.BETWEEN, [2014, 2017]),
+        ('version', FilterOperator.BETWEEN, ['2014']),
+        ('notes', FilterOperator.EQUALS, ''),
+    ])
+    def test_matches_row_wise(self, field, operator, value):
+        """各演算子の結果が行単位の評価と一致するテスト"""
+        self.assert_same_as_row_wise(field, operator, value)
+    
+    def test_long_text_column_is_not_fixed_width(self):
+        """長い値を含むフィールドの文字列配列が固定長にならないテスト"""
+        standard_id = self.registry.add_standard({'number': 'EN 303 645:2020', 'type': 'EN',
+                                                  'number_part': '303 645', 'version': '2020'})
+        self.registry.update_standard(standard_id, {'notes': 'long note ' * 10000})
+        
+        expected = self.assert_same_as_row_wise('notes', FilterOperator.EQUALS, '')
+        assert len(expected) == len(self.standards)
+        assert self.view._text(self.view._get_snapshot(), 'notes').dtype == object
+    
+    def test_typed_range_with_fallback(self):
+        """型変換できない値は文字列比較にフォールバックするテスト"""
+        expected = self.assert_same_as_row_wise('extracted_at', FilterOperator.GREATER_THAN, '2024-01-01')
+        
+        numbers = {s['number'] for s in expected}
+        # 03/15/2024 は日付として比較され、'unknown' は文字列比較で '2024-01-01' より大きい
+        assert numbers == {'EN 301 489-17:2017', 'IEC 62368-1:2014', 'EN 300 328:2019'}
+    
+    def test_multiple_conditions(self):
+        """複数条件のテスト（行単位の条件は絞り込み後の行にのみ適用）"""
+        filter_obj = StandardFilter()
+        compiled = filter_obj.compile(type='EN', directive='RED', date_start='2024-01-01')
+        
+        expected = compiled.filter(self.registry.get_all_standards())
+        assert self.view.filter(compiled) == expected
+        assert len(expected) == 2
+        
+        assert filter_obj.apply_columnar(self.view, type='EN', directive='RED') == \
+            filter_obj.apply_filters(self.registry.get_all_standards(), type='EN', directive='RED')
+    
+    def test_order_matches_registry(self):
+        """行の並びがレジストリの一覧と同じテスト"""
+        compiled = StandardFilter().compile()
+        
+        assert self.view.filter(compiled) == self.registry.get_all_standards()
+        assert len(self.view) == len(self.standards)
+    
+    def test_rebuilt_after_change(self):
+        """レジストリの変更後に再構築されるテスト"""
+        compiled = StandardFilter().compile(type='IEC')
+        assert len(self.view.filter(compiled)) == 1
+        builds = self.view.builds
+        
+        # 変更がなければ再構築しない
+        self.view.filter(compiled)
+        assert self.view.builds == builds
+        
+        standard_id = self.registry.add_standard({'number': 'IEC 61000-4-2:2008', 'type': 'IEC'})
+        assert len(self.view.filter(compiled)) == 2
+        assert self.view.builds == builds + 1
+        
+        self.registry.update_standard(standard_id, {'status': 'Withdrawn'})
+        withdrawn = StandardFilter().compile(type='IEC', status='Withdrawn')
+        assert len(self.view.filter(withdrawn)) == 2
+        
+        self.registry.remove_standard(self.registry.get_all_standards()[0]['id'])
+        assert self.view.filter(StandardFilter().compile()) == self.registry.get_all_standards()
+    
+    def test_close_stops_updates(self):
+        """購読解除後は変更通知を受け取らないテスト"""
+        len(self.view)
+        self.view.close()
+        builds = self.view.builds
+        
+        self.registry.add_standard({'number': 'EN 300 440:2018', 'type': 'EN'})
+        assert self.view.builds == builds
+    
+    def test_empty_registry(self):
+        """空のレジストリのテスト"""
+        registry = StandardRegistry(data_file=Path(self.temp_dir.name) / 'empty.json')
+        view = ColumnarView(registry)
+        
+        compiled = StandardFilter().compile(type='EN', directive='RED', date_start='2024-01-01')
+        assert view.filter(compiled) == []
+        assert len(view) == 0
+    
+    def test_registry_accessor(self):
+        """レジストリから同じビューが取得できるテスト"""
+        view = self.registry.get_columnar_view()
+        
+        assert view is self.registry.get_columnar_view()
+        assert len(view) == len(self.standards)
@@ -0,0 +1,223 @@
+"""
+Seleniumドライバープールの単体テスト
+"""
+
+import tempfile
+import threading
+import time
+import pytest
+from pathlib import Path
+import sys
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from modules.etsi_crawler.driver_pool import DriverPool, DriverPoolTimeout, chrome_options
+from modules.etsi_crawler.query import ETSICrawler
+
+class FakeDriver:
+    """テスト用のドライバー"""
+    
+    def __init__(self):
+        self.alive = True
+        self.quit_called = False
+    
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise WebDriverException("chrome not reachable")
+        return "about:blank"
+    
+    def quit(self):
+        self.quit_called = True
+
+class TestDriverPool:
+    """ドライバープールのテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.drivers = []
+        
+        def factory(**options):
+            driver = FakeDriver()
+            self.drivers.append(driver)
+            return driver
+        
+        self.factory = factory
+    
+    def test_reuse(self):
+        """返却したドライバーの再利用テスト"""
+        pool = DriverPool(size=2, factory=self.factory)
+        for _ in range(5):
+            with pool.driver() as driver:
+                assert driver is self.drivers[0]
+        
+        assert pool.stats()['started'] == 1
+        assert pool.stats()['checkouts'] == 5
+        assert pool.stats()['idle'] == 1
+    
+    def test_recycle_after_max_uses(self):
+        """使用回数の上限での作り直しテスト"""
+        pool = DriverPool(size=1, max_uses=2, factory=self.factory)
+        used = []
+        for _ in range(5):
+            with pool.driver() as driver:
+                used.append(driver)
+        
+        assert used[0] is used[1] and used[1] is not used[2]
+        assert len(self.drivers) == 3
+        assert self.drivers[0].quit_called and self.drivers[1].quit_called
+        assert pool.stats()['recycled'] == 2
+    
+    def test_recycle_on_crash(self):
+        """利用中の異常終了での作り直しテスト"""
+        pool = DriverPool(size=1, factory=self.factory)
+        with pytest.raises(WebDriverException):
+            with pool.driver():
+                raise WebDriverException("tab crashed")
+        
+        assert self.drivers[0].quit_called
+        with pool.driver() as driver:
+            assert driver is self.drivers[1]
+    
+    def test_timeout_keeps_driver(self):
+        """ページ読み込みのタイムアウトではドライバーを作り直さないテスト"""
+        pool = DriverPool(size=1, factory=self.factory)
+        with pytest.raises(TimeoutException):
+            with pool.driver():
+                raise TimeoutException("page load timed out")
+        
+        assert not self.drivers[0].quit_called
+        with pool.driver() as driver:
+            assert driver is self.drivers[0]
+        assert pool.stats()['started'] == 1
+    
+    def test_health_check(self):
+        """応答しないドライバーの作り直しテスト"""
+        pool = DriverPool(size=1, factory=self.factory)
+        with pool.driver():
+            pass
+        self.drivers[0].alive = False
+        
+        with pool.driver() as driver:
+            assert driver is self.drivers[1]
+        assert self.drivers[0].quit_called
+    
+    def test_checkout_timeout(self):
+        """貸し出し待ちのタイムアウトテスト"""
+        pool = DriverPool(size=1, checkout_timeout=0.05, factory=self.factory)
+        pooled = pool.checkout()
+        with pytest.raises(DriverPoolTimeout):
+            pool.checkout()
+        
+        pool.checkin(pooled)
+        assert pool.checkout().driver is self.drivers[0]
+    
+    def test_waiting_checkout(self):
+        """返却待ちの貸し出しテスト"""
+        pool = DriverPool(size=1, checkout_timeout=2, factory=self.factory)
+        pooled = pool.checkout()
+        threading.Timer(0.05, pool.checkin, args=(pooled,)).start()
+        
+        assert pool.checkout().driver is self.drivers[0]
+    
+    def test_size_limit(self):
+        """並行利用時の起動数の上限テスト"""
+        pool = DriverPool(size=2, checkout_timeout=5, factory=self.factory)
+        
+        def use():
+            with pool.driver():
+                time.sleep(0.02)
+        
+        threads = [threading.Thread(target=use) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(self.drivers) <= 2
+        assert pool.stats()['checkouts'] == 8
+    
+    def test_start_failure(self):
+        """起動失敗時に起動枠を戻すことのテスト"""
+        def failing(**options):
+            raise WebDriverException("chrome not found")
+        
+        pool = DriverPool(size=1, checkout_timeout=0.05, factory=failing)
+        for _ in range(2):
+            with pytest.raises(WebDriverException):
+                pool.checkout()
+        assert pool.stats()['running'] == 0
+    
+    def test_close(self):
+        """終了時に全ドライバーを終了することのテスト"""
+        pool = DriverPool(size=2, factory=self.factory)
+        first = pool.checkout()
+        second = pool.checkout()
+        pool.checkin(first)
+        pool.close()
+        
+        assert self.drivers[0].quit_called
+        assert not self.drivers[1].quit_called
+        pool.checkin(second)
+        assert self.drivers[1].quit_called
+        
+        with pytest.raises(RuntimeError):
+            pool.checkout()
+    
+    def test_crawler_returns_driver(self):
+        """クローラーがプールのドライバーを終了せず返すことのテスト"""
+        pool = DriverPool(size=1, factory=self.factory)
+        with ETSICrawler(driver_pool=pool) as crawler:
+            with crawler._selenium_driver() as driver:
+                assert driver is self.drivers[0]
+        
+        assert not self.drivers[0].quit_called
+        assert crawler.driver is None
+        assert pool.stats()['idle'] == 1
+        assert crawler._batch_workers(4) == 1
+    
+    def test_profile_dir_per_slot(self):
+        """起動枠ごとのプロファイルのディレクトリのテスト"""
+        calls = []
+        
+        def factory(**options):
+            calls.append(options)
+            return self.factory()
+        
+        pool = DriverPool(size=2, factory=factory, lightweight=True, profile_dir=Path('/tmp/profiles'))
+        first = pool.checkout()
+        second = pool.checkout()
+        assert [c['user_data_dir'] for c in calls] == [Path('/tmp/profiles/driver-0'), Path('/tmp/profiles/driver-1')]
+        assert all(c['lightweight'] for c in calls)
+        
+        # 終了したドライバーの枠（ディレクトリ）は次の起動で再利用する
+        pool.checkin(first, broken=True)
+        pool.checkout()
+        assert calls[-1]['user_data_dir'] == Path('/tmp/profiles/driver-0')
+
+class TestChromeOptions:
+    """Chromeの起動オプションのテスト"""
+    
+    def test_default(self):
+        """通常の起動オプションのテスト"""
+        options = chrome_options()
+        assert '--headless' in options.arguments
+        assert options.page_load_strategy == 'normal'
+        assert not any(arg.startswith('--host-resolver-rules') for arg in options.arguments)
+    
+    def test_lightweight(self):
+        """軽量モードの起動オプションのテスト"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            profile = Path(temp_dir) / 'profile'
+            options = chrome_options(lightweight=True, user_data_dir=profile)
+            assert profile.is_dir()
+        
+        assert options.page_load_strategy == 'eager'
+        assert f'--user-data-dir={profile.resolve()}' in options.arguments
+        assert options.experimental_options['prefs']['profile.managed_default_content_settings.images'] == 2
+        rules = next(arg for arg in options.arguments if arg.startswith('--host-resolver-rules='))
+        assert 'MAP * ~NOTFOUND' in rules and 'EXCLUDE *.etsi.org' in rules
@@ -0,0 +1,249 @@
+"""
+ETSIクローラーの単体テスト
+"""
+
+import time
+import pytest
+from pathlib import Path
+import sys
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import requests
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+from modules.etsi_crawler.query import ETSICrawler, FetchStats, SEARCH_PHASES
+from modules.etsi_crawler.rate_limit import HostRateLimiter
+
+RESULTS_TABLE = (
+    '<table class="report-table">'
+    '<tr><th>IDENTIFICATION</th><th>STATUS</th><th>TITLE</th></tr>'
+    '<tr><td>EN 301 489-17 V3.2.4</td><td>Published</td><td>Broadband data transmission</td></tr>'
+    '</table>'
+)
+
+class FakeElement:
+    """テスト用の要素"""
+    
+    def __init__(self, browser=None, html='', page=None):
+        self.browser = browser
+        self.html = html
+        self.page = page
+        self.value = ''
+    
+    def clear(self):
+        self.value = ''
+    
+    def send_keys(self, text):
+        self.value += text
+    
+    def is_selected(self):
+        return False
+    
+    def click(self):
+        if self.browser is not None:
+            self.browser.submit()
+    
+    def is_enabled(self):
+        if self.page is not None and self.page != self.browser.page:
+            raise StaleElementReferenceException("stale")
+        return True
+    
+    def get_attribute(self, name):
+        return self.html
+
+class FakeBrowser:
+    """検索結果の表示に時間のかかるETSIポータルを模したドライバー"""
+    
+    def __init__(self, render_delay=0.2, has_results=True, renders=True):
+        self.render_delay = render_delay
+        self.has_results = has_results
+        self.renders = renders
+        self.page = 0
+        self.rendered_at = None
+        self.current_url = 'about:blank'
+    
+    def get(self, url):
+        self.current_url = url
+        self.page += 1
+        self.rendered_at = None
+    
+    def submit(self):
+        self.submitted_at = time.monotonic()
+        self.rendered_at = self.submitted_at + self.render_delay if self.renders else float('inf')
+    
+    def rendered(self):
+        return self.rendered_at is not None and time.monotonic() >= self.rendered_at
+    
+    def find_element(self, by, value):
+        if by == By.TAG_NAME and value == 'html':
+            return FakeElement(self, page=self.page)
+        if by == By.NAME and value == 'qETSISearchButton':
+            return FakeElement(self)
+        if by == By.NAME:
+            return FakeElement()
+        raise NoSuchElementException(value)
+    
+    def find_elements(self, by, value):
+        if self.rendered():
+            if self.page == 1:
+                # 検索結果のページに遷移
+                self.page += 1
+            if self.has_results and value == 'report-table':
+                return [FakeElement(html=RESULTS_TABLE)]
+        return []
+    
+    def execute_script(self, script):
+        return 'complete' if self.rendered() and self.page > 1 else 'loading'
+    
+    def quit(self):
+        pass
+
+class TestSeleniumWaits:
+    """Selenium検索の待機のテスト"""
+    
+    def crawler(self, browser, **kwargs):
+        """偽のドライバーを使うクローラー"""
+        crawler = ETSICrawler(use_selenium=True, rate_limiter=HostRateLimiter(rate=0), **kwargs)
+        crawler.driver = browser
+        return crawler
+    
+    def test_results_without_fixed_sleep(self):
+        """結果の表示を待って解析することのテスト"""
+        crawler = self.crawler(FakeBrowser(render_delay=0.2))
+        
+        start = time.monotonic()
+        result = crawler.search_standard('EN 301 489-17')
+        elapsed = time.monotonic() - start
+        
+        assert result['status'] == 'Success'
+        assert result['versions'][0]['identification'] == 'EN 301 489-17 V3.2.4'
+        # 固定の3秒待機がない
+        assert 0.2 <= elapsed < 1.0
+    
+    def test_no_results(self):
+        """結果なしのページの検出テスト"""
+        crawler = self.crawler(FakeBrowser(render_delay=0.1, has_results=False))
+        
+        start = time.monotonic()
+        result = crawler.search_standard('EN 399 999')
+        
+        assert result['status'] == 'No Results'
+        assert time.monotonic() - start < 1.0
+    
+    def test_result_timeout(self):
+        """結果が表示されない場合のタイムアウトテスト"""
+        crawler = self.crawler(FakeBrowser(renders=False), result_timeout=0.3)
+        result = crawler.search_standard('EN 301 489-17')
+        
+        assert result['status'] == 'Error'
+        assert result['error'] == 'Timeout'
+        assert crawler.timed_searches == 0
+    
+    def test_phase_timings(self):
+        """区間ごとの所要時間の記録テスト"""
+        crawler = self.crawler(FakeBrowser(render_delay=0.15))
+        for _ in range(2):
+            crawler.search_standard('EN 301 489-17')
+        
+        summary = crawler.timing_summary()
+        assert crawler.timed_searches == 2
+        assert tuple(summary) == SEARCH_PHASES
+        assert summary['render'] >= 0.15
+        assert summary['render'] > summary['parse']
+    
+    def test_timing_summary_empty(self):
+        """検索前の平均時間のテスト"""
+        assert self.crawler(FakeBrowser()).timing_summary() == {}
+
+class FakeResponse:
+    """テスト用のHTTP応答"""
+    
+    def __init__(self, html):
+        self.content = html.encode('utf-8')
+    
+    def raise_for_status(self):
+        pass
+
+class FakeSession:
+    """テスト用のHTTPセッション（Noneの場合は接続エラー）"""
+    
+    def __init__(self, html):
+        self.html = html
+        self.requests = 0
+    
+    def get(self, url, params=None, timeout=None):
+        self.requests += 1
+        if self.html is None:
+            raise requests.exceptions.ConnectionError("connection refused")
+        return FakeResponse(self.html)
+
+class TestTieredFetch:
+    """HTTPを優先しブラウザーで補う取得のテスト"""
+    
+    def crawler(self, html, browser=None):
+        """HTTPの応答と偽のドライバーを指定したautoのクローラー"""
+        crawler = ETSICrawler(fetch_mode='auto', rate_limiter=HostRateLimiter(rate=0))
+        crawler.session = FakeSession(html)
+        crawler.driver = browser
+        return crawler
+    
+    def test_http_results(self):
+        """HTTPで結果の表が得られればブラウザーを使わないことのテスト"""
+        crawler = self.crawler(f"<html><body>{RESULTS_TABLE}</body></html>")
+        result = crawler.search_standard('EN 301 489-17')
+        
+        assert result['status'] == 'Success'
+        assert result['versions'][0]['identification'] == 'EN 301 489-17 V3.2.4'
+        assert crawler.driver is None
+        assert crawler.fetch_stats.to_dict() == {'requests': 1, 'selenium': 0, 'total': 1}
+    
+    def test_http_empty_table(self):
+        """データ行のない結果の表は該当なしとして扱うことのテスト"""
+        crawler = self.crawler('<table class="report-table"><tr><th>IDENTIFICATION</th><th>STATUS</th></tr></table>')
+        result = crawler.search_standard('EN 399 999')
+        
+        assert result['status'] == 'Success'
+        assert result['versions'] == []
+        assert crawler.fetch_stats.counts['requests'] == 1
+    
+    def test_fallback_without_table(self):
+        """結果の表がないページではブラウザーで検索することのテスト"""
+        browser = FakeBrowser(render_delay=0.05)
+        crawler = self.crawler('<html><body><div id="app"></div><table><tr><td>layout</td></tr></table></body></html>', browser)
+        result = crawler.search_standard('EN 301 489-17')
+        
+        assert result['status'] == 'Success'
+        assert browser.page > 0
+        assert crawler.session.requests == 1
+        assert crawler.fetch_stats.to_dict() == {'requests': 0, 'selenium': 1, 'total': 1}
+    
+    def test_fallback_on_http_error(self):
+        """HTTPの通信エラーではブラウザーで検索することのテスト"""
+        crawler = self.crawler(None, FakeBrowser(render_delay=0.05))
+        result = crawler.search_standard('EN 301 489-17')
+        
+        assert result['status'] == 'Success'
+        assert crawler.fetch_stats.counts['selenium'] == 1
+    
+    def test_shared_stats(self):
+        """複数のクローラーで件数を共有することのテスト"""
+        stats = FetchStats()
+        for _ in range(3):
+            crawler = ETSICrawler(fetch_mode='auto', rate_limiter=HostRateLimiter(rate=0), fetch_stats=stats)
+            crawler.session = FakeSession(RESULTS_TABLE)
+            crawler.search_standard('EN 301 489-17')
+        assert stats.to_dict()['requests'] == 3
+    
+    def test_fetch_mode(self):
+        """取得方法の指定テスト"""
+        assert ETSICrawler().fetch_mode == 'selenium'
+        assert ETSICrawler(use_selenium=False).fetch_mode == 'requests'
+        auto = ETSICrawler(fetch_mode='auto')
+        assert not auto.use_selenium
+        assert auto._batch_workers(8) == 8
+        with pytest.raises(ValueError):
+            ETSICrawler(fetch_mode='browser')
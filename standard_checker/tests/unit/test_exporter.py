@@ -0,0 +1,138 @@
+"""
+ストリーミングエクスポートモジュールの単体テスト
+"""
+
+import pytest
+import csv
+import json
+import tempfile
+from pathlib import Path
+import sys
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.export.exporter import StreamingExporter, collect_columns, batch_chunks
+
+class TestStreamingExporter:
+    """StreamingExporterクラスのテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.rows = [
+            {'number': 'EN 301 489-17:2017', 'type': 'EN', 'version': '2017',
+             'etsi_info': {'status': 'Published'}},
+            {'number': 'IEC 62368-1:2014', 'type': 'IEC', 'version': None,
+             'etsi_info': None},
+        ]
+    
+    def teardown_method(self):
+        """各テストメソッドの後に実行"""
+        self.temp_dir.cleanup()
+    
+    def test_write_csv(self):
+        """CSV書き出しテスト"""
+        csv_path = self.temp_path / 'out.csv'
+        StreamingExporter().write_csv(self.rows, csv_path)
+        
+        with open(csv_path, encoding='utf-8', newline='') as f:
+            loaded = list(csv.DictReader(f))
+        
+        assert len(loaded) == 2
+        assert loaded[0]['number'] == 'EN 301 489-17:2017'
+        # ネストした値はJSON文字列、Noneは空文字
+        assert json.loads(loaded[0]['etsi_info']) == {'status': 'Published'}
+        assert loaded[1]['version'] == ''
+    
+    def test_iter_csv_is_lazy(self):
+        """CSVが行を1件ずつ消費して生成されるテスト"""
+        consumed = []
+        
+        def generate():
+            for row in self.rows:
+                consumed.append(row['number'])
+                yield row
+        
+        chunks = StreamingExporter(columns=['number']).iter_csv(generate())
+        
+        assert next(chunks).strip() == 'number'
+        assert len(consumed) == 1
+    
+    def test_column_selection(self):
+        """列指定テスト"""
+        exporter = StreamingExporter(columns=['type', 'number'])
+        
+        lines = ''.join(exporter.iter_csv(self.rows)).splitlines()
+        assert lines[0] == 'type,number'
+        assert lines[1] == 'EN,EN 301 489-17:2017'
+        
+        loaded = json.loads(''.join(exporter.iter_json(self.rows)))
+        assert loaded[1] == {'type': 'IEC', 'number': 'IEC 62368-1:2014'}
+    
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_iter_json(self, indent):
+        """JSON配列の逐次生成テスト"""
+        text = ''.join(StreamingExporter().iter_json(iter(self.rows), indent=indent))
+        assert json.loads(text) == self.rows
+        
+        assert json.loads(''.join(StreamingExporter().iter_json([], indent=indent))) == []
+    
+    def test_iter_ndjson(self):
+        """改行区切りJSONテスト"""
+        lines = list(StreamingExporter().iter_ndjson(self.rows))
+        
+        assert len(lines) == 2
+        assert [json.loads(line) for line in lines] == self.rows
+    
+    def test_write_xlsx(self):
+        """Excel書き出しテスト"""
+        from openpyxl import load_workbook
+        
+        xlsx_path = self.temp_path / 'out.xlsx'
+        StreamingExporter().write_xlsx({
+            'Standards': iter(self.rows),
+            'Statistics': [{'Metric': 'total_count', 'Value': 2}]
+        }, xlsx_path)
+        
+        workbook = load_workbook(xlsx_path)
+        assert workbook.sheetnames == ['Standards', 'Statistics']
+        
+        rows = list(workbook['Standards'].values)
+        assert rows[0] == ('number', 'type', 'version', 'etsi_info')
+        assert rows[1][0] == 'EN 301 489-17:2017'
+        assert list(workbook['Statistics'].values)[1] == ('total_count', 2)
+    
+    def test_iter_xlsx_chunks(self):
+        """Excelのバイト列チャンク生成テスト"""
+        data = b''.join(StreamingExporter().iter_xlsx({'Sheet1': self.rows}))
+        
+        # xlsxはzip形式
+        assert data[:2] == b'PK'
+    
+    def test_export_by_suffix(self):
+        """拡張子による形式判定テスト"""
+        exporter = StreamingExporter()
+        exporter.export(self.rows, self.temp_path / 'out.ndjson')
+        exporter.export(self.rows, self.temp_path / 'out.json')
+        
+        ndjson_text = (self.temp_path / 'out.ndjson').read_text(encoding='utf-8')
+        assert len(ndjson_text.splitlines()) == 2
+        assert json.loads((self.temp_path / 'out.json').read_text(encoding='utf-8')) == self.rows
+    
+    def test_collect_columns(self):
+        """列名収集テスト"""
+        rows = [{'a': 1}, {'b': 2, 'a': 3}, {'c': 4}]
+        
+        assert collect_columns(rows) == ['a', 'b', 'c']
+    
+    def test_batch_chunks(self):
+        """チャンク結合テスト"""
+        chunks = ['a' * 10] * 5
+        
+        batched = list(batch_chunks(chunks, size=25))
+        
+        assert [len(c) for c in batched] == [30, 20]
+        assert ''.join(batched) == ''.join(chunks)
@@ -0,0 +1,93 @@
+"""
+ファセット集計モジュールの単体テスト
+"""
+
+import pytest
+import tempfile
+from pathlib import Path
+import sys
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.filter.facets import FacetCounter, facet_value, registry_facets, FACET_FIELDS
+from modules.filter.filter import StandardFilter
+from modules.standards.registry import StandardRegistry
+
+class TestFacets:
+    """ファセット集計のテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.registry = StandardRegistry(data_file=Path(self.temp_dir.name) / 'registry.json')
+        
+        self.ids = []
+        for standard in [
+            {'number': 'EN 301 489-17:2017', 'type': 'EN', 'number_part': '301 489-17', 'version': '2017',
+             'status': 'Active', 'directive': 'RED 2014/53/EU', 'source': 'pdf'},
+            {'number': 'EN 300 328:2019', 'type': 'EN', 'number_part': '300 328', 'version': '2019',
+             'status': 'Withdrawn', 'directive': 'RED 2014/53/EU', 'source': 'pdf'},
+            {'number': 'IEC 62368-1:2014', 'type': 'IEC', 'number_part': '62368-1', 'version': '2014',
+             'status': 'Active', 'directive': None, 'source': 'manual'},
+            {'number': 'ISO 9001', 'type': 'ISO', 'number_part': '9001', 'version': 'V2.2.2',
+             'status': 'Active', 'directive': None, 'source': 'manual'},
+        ]:
+            self.ids.append(self.registry.add_standard(standard))
+    
+    def teardown_method(self):
+        """各テストメソッドの後に実行"""
+        self.temp_dir.cleanup()
+    
+    def scanned(self):
+        """全件を走査して数えたファセット"""
+        counter = FacetCounter()
+        for standard in self.registry.get_all_standards():
+            counter.add(standard)
+        return counter.to_dict()
+    
+    def test_facet_value(self):
+        """ファセットの値の取得テスト"""
+        entry = self.registry.get_standard(self.ids[0])
+        assert facet_value(entry, 'type') == 'EN'
+        assert facet_value(entry, 'version_year') == 2017
+        assert facet_value(entry.to_dict(), 'version_year') == 2017
+        assert facet_value({'version': 'V2.2.2'}, 'version_year') is None
+    
+    def test_apply_with_facets(self):
+        """フィルター結果と同じ走査でのファセット集計テスト"""
+        standards = self.registry.get_all_standards()
+        filtered, facets = StandardFilter().apply_with_facets(standards, status='Active')
+        
+        assert filtered == StandardFilter().apply_filters(standards, status='Active')
+        assert set(facets) == set(FACET_FIELDS)
+        assert facets['type'] == {'EN': 1, 'IEC': 1, 'ISO': 1}
+        assert facets['status'] == {'Active': 3}
+        assert facets['directive'] == {None: 2, 'RED 2014/53/EU': 1}
+        assert facets['version_year'] == {None: 1, 2014: 1, 2017: 1}
+    
+    def test_counts_sorted_by_frequency(self):
+        """件数の多い順に並ぶことのテスト"""
+        _, facets = StandardFilter().apply_with_facets(self.registry.get_all_standards())
+        assert list(facets['type']) == ['EN', 'IEC', 'ISO']
+        assert list(facets['status'].values()) == [3, 1]
+    
+    def test_registry_facets_match_scan(self):
+        """副索引から求めたファセットと全件走査の一致テスト"""
+        assert registry_facets(self.registry) == self.scanned()
+        
+        # 差分更新後も一致すること
+        self.registry.update_standard(self.ids[1], {'status': 'Active'})
+        self.registry.remove_standard(self.ids[2])
+        self.registry.add_standard({'number': 'CISPR 32:2015', 'type': 'CISPR', 'number_part': '32',
+                                    'version': '2015', 'status': 'Active'})
+        assert registry_facets(self.registry) == self.scanned()
+    
+    def test_unhashable_values(self):
+        """ハッシュ不可能な値の集計テスト"""
+        counter = FacetCounter(('directive',))
+        counter.add({'directive': ['RED', 'EMC']})
+        counter.add({'directive': ['RED', 'EMC']})
+        assert counter.to_dict() == {'directive': {"['RED', 'EMC']": 2}}
+        assert counter.total == 2
@@ -11,7 +11,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from modules.filter.filter import StandardFilter, FilterOperator
+from modules.filter.filter import StandardFilter, FilterOperator, CompiledFilter
 
 class TestStandardFilter:
     """StandardFilterクラスのテスト"""
@@ -168,6 +168,102 @@ class TestStandardFilter:
         assert len(result) == 2
         assert all(s['type'] == 'EN' and s['status'] == 'Active' for s in result)
     
+    def test_iter_filters(self):
+        """逐次フィルター適用テスト"""
+        result = self.filter.iter_filters(iter(self.sample_standards), type='EN')
+        
+        assert next(result)['id'] == '1'
+        assert [s['id'] for s in result] == ['4']
+    
+    def test_iter_filters_limit(self):
+        """件数上限に達した時点で走査を打ち切るテスト"""
+        consumed = []
+        
+        def cursor():
+            for standard in self.sample_standards:
+                consumed.append(standard['id'])
+                yield standard
+        
+        result = list(self.filter.iter_filters(cursor(), limit=1, status='Active'))
+        
+        assert [s['id'] for s in result] == ['1']
+        assert consumed == ['1']
+        assert list(self.filter.iter_filters(self.sample_standards, limit=0)) == []
+    
+    def test_top_k(self):
+        """フィールド値の上位k件の取得テスト"""
+        latest = self.filter.top_k(self.sample_standards, 2, 'extracted_at')
+        assert [s['id'] for s in latest] == ['4', '3']
+        
+        oldest = self.filter.top_k(self.sample_standards, 2, 'extracted_at', descending=False, status='Active')
+        assert [s['id'] for s in oldest] == ['1', '3']
+    
+    def test_top_k_missing_values_last(self):
+        """値のない標準規格が並び順によらず末尾になることのテスト"""
+        newest = self.filter.top_k(self.sample_standards, 4, 'version')
+        oldest = self.filter.top_k(self.sample_standards, 4, 'version', descending=False)
+        
+        assert [s['id'] for s in newest] == ['1', '3', '2', '4']
+        assert [s['id'] for s in oldest] == ['2', '3', '1', '4']
+    
+    def test_apply_filters_does_not_accumulate(self):
+        """キーワード引数の条件がフィルターに蓄積されないテスト"""
+        first = self.filter.apply_filters(self.sample_standards, status='Active')
+        second = self.filter.apply_filters(self.sample_standards, type='IEC')
+        
+        assert len(first) == 3
+        assert all(s['type'] == 'IEC' for s in second)
+        assert self.filter.filters == []
+    
+    def test_compiled_filter_reuse(self):
+        """コンパイル済みフィルターの再利用テスト"""
+        self.filter.add_filter('number', FilterOperator.REGEX, r'en 301')
+        compiled = self.filter.compile(status='Active')
+        self.filter.clear_filters()
+        
+        assert isinstance(compiled, CompiledFilter)
+        assert len(compiled) == 2
+        # コンパイル後に元のフィルターを変更しても影響しない
+        expected = [s for s in self.sample_standards if s['number'].startswith('EN 301') and s['status'] == 'Active']
+        assert compiled.filter(self.sample_standards) == expected
+        assert compiled.filter(self.sample_standards) == expected
+    
+    def test_compiled_filter_invalid_regex(self):
+        """不正な正規表現は一致なしとして扱うテスト"""
+        self.filter.add_filter('number', FilterOperator.REGEX, '(')
+        
+        assert self.filter.apply_filters(self.sample_standards) == []
+    
+    def test_typed_date_comparison(self):
+        """スキーマのdatetimeフィールドは日時として比較するテスト"""
+        standards = [
+            {'id': 'a', 'extracted_at': '2024-01-15T10:30:00+09:00'},
+            {'id': 'b', 'extracted_at': '2024-01-14T23:59:59.999999'},
+            {'id': 'c', 'extracted_at': 'unknown'},
+        ]
+        
+        result = self.filter.apply_filters(standards, date_start='2024-01-15')
+        
+        # タイムゾーン付きも比較でき、変換できない値は文字列比較にフォールバック
+        assert [s['id'] for s in result] == ['a', 'c']
+    
+    def test_typed_version_comparison(self):
+        """versionは西暦年の整数として比較するテスト"""
+        standards = [{'version': '2009'}, {'version': '2010'}, {'version': 2011}, {'version': 'V3.2.4'}]
+        self.filter.add_filter('version', FilterOperator.BETWEEN, ['2010', 2011])
+        
+        result = self.filter.apply_filters(standards)
+        
+        assert [s['version'] for s in result] == ['2010', 2011]
+    
+    def test_not_in_with_unhashable_values(self):
+        """辞書などハッシュ不可能な値に対するNOT_INのテスト"""
+        standards = [{'etsi_info': {'status': 'Published'}}, {'etsi_info': None}, {'etsi_info': ''}]
+        
+        result = self.filter.apply_filters(standards, has_etsi_info=True)
+        
+        assert result == [standards[0]]
+    
     def test_filter_operator_contains(self):
         """CONTAINS演算子テスト"""
         self.filter.add_filter('number', FilterOperator.CONTAINS, '301 489')
@@ -0,0 +1,55 @@
+"""
+Web UIルートの単体テスト
+"""
+
+import pytest
+import tempfile
+from pathlib import Path
+import sys
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.dependencies import get_registry
+from modules.pdf_parser.parser import PDFParser
+from modules.standards.registry import StandardRegistry
+
+class TestUploadRoute:
+    """PDFアップロードのテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.registry = StandardRegistry(data_file=Path(self.temp_dir.name) / 'registry.json')
+        app.dependency_overrides[get_registry] = lambda: self.registry
+        self.filename = 'test_upload_route.pdf'
+    
+    def teardown_method(self):
+        """各テストメソッドの後に実行"""
+        app.dependency_overrides.pop(get_registry, None)
+        (project_root / 'data' / 'input' / self.filename).unlink(missing_ok=True)
+        self.temp_dir.cleanup()
+    
+    def test_upload_renders_results_with_facets(self, monkeypatch):
+        """アップロードした標準規格の件数を含む結果ページを返す"""
+        standards = [
+            {'number': 'EN 301 489-17:2017', 'type': 'EN', 'number_part': '301 489-17', 'version': '2017'},
+            {'number': 'EN 300 328:2019', 'type': 'EN', 'number_part': '300 328', 'version': '2019'},
+            {'number': 'IEC 62368-1:2018', 'type': 'IEC', 'number_part': '62368-1', 'version': '2018'},
+        ]
+        monkeypatch.setattr(PDFParser, 'extract_standards_from_pdf', lambda self, path: standards)
+        # テンプレートとデータディレクトリはプロジェクトルートからの相対パス
+        monkeypatch.chdir(project_root)
+        
+        with TestClient(app) as client:
+            response = client.post('/upload', files={'file': (self.filename, b'%PDF-1.4', 'application/pdf')})
+        
+        assert response.status_code == 200
+        assert '<span id="enCount">2</span>' in response.text
+        assert '<span id="iecCount">1</span>' in response.text
+        assert 'EN 301 489-17:2017' in response.text
+        assert len(self.registry.get_all_standards()) == 3
@@ -0,0 +1,142 @@
+"""
+フィルター実行計画モジュールの単体テスト
+"""
+
+import pytest
+import tempfile
+from pathlib import Path
+import sys
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.filter.filter import StandardFilter, FilterOperator
+from modules.filter.planner import QueryPlanner
+from modules.standards.registry import StandardRegistry
+
+class TestQueryPlanner:
+    """QueryPlannerクラスのテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.registry = StandardRegistry(data_file=Path(self.temp_dir.name) / 'registry.json')
+        
+        statuses = ['Active', 'Published', 'Withdrawn', 'Superseded']
+        directives = ['RED 2014/53/EU', 'EMC 2014/30/EU', 'LVD 2014/35/EU', None]
+        for i in range(40):
+            self.registry.add_standard({
+                'number': f'EN 301 {i:03d}-{i % 7 + 1}:20{10 + i % 10}',
+                'type': 'EN' if i % 5 else 'IEC',
+                'number_part': f'301 {i:03d}-{i % 7 + 1}',
+                'version': f'20{10 + i % 10}',
+                'status': statuses[i % 4],
+                'directive': directives[i % 4 if i % 3 else 3],
+                'source': 'PDF' if i % 2 else 'Manual',
+                'extracted_at': f'2024-{i % 12 + 1:02d}-01T00:00:00',
+            })
+        
+        self.planner = QueryPlanner(self.registry)
+    
+    def teardown_method(self):
+        """各テストメソッドの後に実行"""
+        self.temp_dir.cleanup()
+    
+    def compile(self, conditions):
+        """条件のリストからコンパイル済みフィルターを作成"""
+        filter_obj = StandardFilter()
+        for field, operator, value in conditions:
+            filter_obj.add_filter(field, operator, value)
+        return filter_obj.compile()
+    
+    @pytest.mark.parametrize("conditions", [
+        [('status', FilterOperator.EQUALS, 'withdrawn')],
+        [('status', FilterOperator.IN, ['Active', 'Published'])],
+        [('directive', FilterOperator.IN, [None, 'RED 2014/53/EU'])],
+        [('directive', FilterOperator.CONTAINS, 'red')],
+        [('status', FilterOperator.NOT_IN, ['Active'])],
+        [('type', FilterOperator.EQUALS, 'IEC'), ('number', FilterOperator.REGEX, r'-[12]:')],
+        [('source', FilterOperator.EQUALS, 'pdf'), ('status', FilterOperator.EQUALS, 'Active'),
+         ('extracted_at', FilterOperator.GREATER_THAN, '2024-06-01')],
+        [('status', FilterOperator.EQUALS, 'Unknown')],
+        [('number', FilterOperator.CONTAINS, '301 01')],
+        [],
+    ])
+    def test_matches_row_wise(self, conditions):
+        """実行計画の結果が行単位の評価と一致するテスト"""
+        compiled = self.compile(conditions)
+        
+        expected = compiled.filter(self.registry.get_all_standards())
+        assert self.planner.execute(compiled) == expected
+    
+    def test_index_narrows_candidates(self):
+        """副索引で候補が絞り込まれるテスト"""
+        plan = self.planner.plan(self.compile([
+            ('number', FilterOperator.REGEX, r'301'),
+            ('status', FilterOperator.EQUALS, 'Active'),
+            ('type', FilterOperator.EQUALS, 'IEC'),
+        ]))
+        
+        assert plan.uses_index
+        # status=Active (10件) と type=IEC (8件) の積
+        assert plan.candidate_ids == {
+            s['id'] for s in self.registry.get_all_standards()
+            if s['status'] == 'Active' and s['type'] == 'IEC'
+        }
+        # 小さい集合から積をとる
+        assert [s['field'] for s in plan.describe()['index_conditions']] == ['type', 'status']
+        assert [s['field'] for s in plan.describe()['residual_conditions']] == ['number']
+    
+    def test_unselective_index_condition_is_residual(self):
+        """候補をほとんど絞り込めない条件は行ごとに評価するテスト"""
+        plan = self.planner.plan(self.compile([('status', FilterOperator.NOT_IN, ['Active'])]))
+        
+        assert not plan.uses_index
+        assert plan.describe()['residual_conditions'][0]['selectivity'] == 0.75
+    
+    def test_residual_order_by_cost_and_selectivity(self):
+        """残りの条件が安価で選択的な順に並ぶテスト"""
+        plan = self.planner.plan(self.compile([
+            ('number', FilterOperator.REGEX, r'301'),
+            ('extracted_at', FilterOperator.GREATER_THAN, '2024-06-01'),
+            ('notes', FilterOperator.EQUALS, ''),
+        ]))
+        
+        operators = [s['operator'] for s in plan.describe()['residual_conditions']]
+        assert operators == ['equals', 'greater_than', 'regex']
+    
+    def test_empty_candidates_short_circuit(self):
+        """候補が空の場合のテスト"""
+        plan = self.planner.plan(self.compile([
+            ('status', FilterOperator.EQUALS, 'Active'),
+            ('status', FilterOperator.EQUALS, 'Withdrawn'),
+        ]))
+        
+        assert plan.candidate_ids == set()
+        assert plan.execute() == []
+    
+    def test_index_follows_registry_changes(self):
+        """レジストリの変更が副索引に反映されるテスト"""
+        compiled = self.compile([('status', FilterOperator.EQUALS, 'Draft')])
+        assert self.planner.execute(compiled) == []
+        
+        standard_id = self.registry.get_all_standards()[0]['id']
+        self.registry.update_standard(standard_id, {'status': 'Draft'})
+        assert [s['id'] for s in self.planner.execute(compiled)] == [standard_id]
+        
+        new_id = self.registry.add_standard({'number': 'EN 300 328:2019', 'type': 'EN', 'status': 'Draft'})
+        assert len(self.planner.execute(compiled)) == 2
+        
+        self.registry.remove_standard(standard_id)
+        self.registry.remove_standard(new_id)
+        assert self.planner.execute(compiled) == []
+        assert 'Draft' not in self.registry.get_field_index('status')
+    
+    def test_apply_indexed(self):
+        """StandardFilterからの実行計画による適用テスト"""
+        filter_obj = StandardFilter()
+        kwargs = {'status': 'Active', 'directive': 'RED', 'date_start': '2024-01-15'}
+        
+        assert filter_obj.apply_indexed(self.registry, **kwargs) == \
+            filter_obj.apply_filters(self.registry.get_all_standards(), **kwargs)
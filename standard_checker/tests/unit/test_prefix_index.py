@@ -0,0 +1,82 @@
+"""
+プレフィックス索引モジュールの単体テスト
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.standards.canonical import split_family, number_tokens, sort_key_for
+from modules.standards.prefix_index import PrefixIndex
+
+class TestPrefixIndex:
+    """PrefixIndexクラスのテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.index = PrefixIndex()
+        for number_part in ['301 489-17', '301 489-3', '301 489-1', '301 489-52', '300 328', '301 893']:
+            self.index.add(number_part, number_tokens(number_part), 'EN', f"EN {number_part}")
+        self.index.add('62368-1', number_tokens('62368-1'), 'IEC', 'IEC 62368-1')
+    
+    @pytest.mark.parametrize("text,expected", [
+        ("ETSI EN 301 489-17:2017", ("EN", "301 489-17:2017")),
+        ("EN 301 489-17", ("EN", "301 489-17")),
+        ("IEC 62368-1", ("IEC", "62368-1")),
+        ("301 489", (None, "301 489")),
+    ])
+    def test_split_family(self, text, expected):
+        """規格種別の分離テスト"""
+        assert split_family(text) == expected
+    
+    def test_number_tokens(self):
+        """トークン分解テスト"""
+        assert number_tokens("301 489-17:2017") == ("301", "489", "17")
+        assert number_tokens(" 62368-1 ") == ("62368", "1")
+    
+    def test_sort_key_for(self):
+        """自然順ソートキーのテスト"""
+        numbers = ['EN 301 489-17:2017', 'EN 301 489-3:2019', 'ETSI EN 301 489-3:2017', 'EN 300 328', 'IEC 62368-1:2014']
+        standards = [{'number': n} for n in numbers]
+        
+        ordered = [s['number'] for s in sorted(standards, key=sort_key_for)]
+        
+        assert ordered == ['EN 300 328', 'ETSI EN 301 489-3:2017', 'EN 301 489-3:2019', 'EN 301 489-17:2017', 'IEC 62368-1:2014']
+    
+    def test_search_natural_order(self):
+        """自然順での前方一致テスト"""
+        assert self.index.search("301 489") == ['301 489-1', '301 489-3', '301 489-17', '301 489-52']
+    
+    def test_search_partial_token(self):
+        """入力途中のトークンの前方一致テスト"""
+        assert self.index.search("301 48") == ['301 489-1', '301 489-3', '301 489-17', '301 489-52']
+        assert self.index.search("301 489-1") == ['301 489-1', '301 489-17']
+        assert self.index.search("301 489-1 ") == ['301 489-1']
+        assert self.index.search("30") == ['300 328', '301 489-1', '301 489-3', '301 489-17', '301 489-52', '301 893']
+    
+    def test_search_limit_and_family(self):
+        """件数制限と規格種別による絞り込みテスト"""
+        assert self.index.search("301", limit=2) == ['301 489-1', '301 489-3']
+        assert self.index.search("ETSI EN 62368") == []
+        assert self.index.search("IEC 62368") == ['62368-1']
+        assert self.index.search("") == []
+    
+    def test_remove(self):
+        """削除テスト（空ノードも除去される）"""
+        assert self.index.remove('301 893')
+        assert not self.index.remove('301 893')
+        
+        assert self.index.search("301 8") == []
+        assert '893' not in self.index.root.children['301'].children
+        assert len(self.index) == 6
+    
+    def test_re_add_replaces(self):
+        """同じIDの再登録で置き換えられるテスト"""
+        self.index.add('300 328', number_tokens('300 440'), 'EN', 'EN 300 440')
+        
+        assert self.index.search("300 3") == []
+        assert self.index.search("300 4") == ['300 328']
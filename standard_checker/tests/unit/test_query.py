@@ -0,0 +1,144 @@
+"""
+フィルタークエリ言語モジュールの単体テスト
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.filter.filter import FilterOperator
+from modules.filter.query import (
+    compile_query, parse_query, resolve_path, tokenize, QuerySyntaxError, MAX_QUERY_DEPTH
+)
+
+class TestFilterQuery:
+    """クエリ言語のテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.standards = [
+            {'number': 'EN 301 489-17:2017', 'type': 'EN', 'status': 'Active', 'directive': 'RED 2014/53/EU',
+             'extracted_at': '2024-03-01T10:00:00',
+             'etsi_info': {'status': 'Published', 'versions': [
+                 {'identification': 'V3.2.4', 'status': 'Published'},
+                 {'identification': 'V3.3.0', 'status': 'Draft'},
+             ]}},
+            {'number': 'EN 300 328:2019', 'type': 'EN', 'status': 'Withdrawn', 'directive': None,
+             'extracted_at': '2023-06-01T00:00:00',
+             'etsi_info': {'status': 'Withdrawn', 'versions': [{'identification': 'V2.2.2', 'status': 'Withdrawn'}]}},
+            {'number': 'IEC 62368-1:2014', 'type': 'IEC', 'status': 'Active', 'directive': 'LVD 2014/35/EU',
+             'extracted_at': '2024-01-15T00:00:00', 'etsi_info': None},
+        ]
+    
+    def numbers(self, query):
+        """クエリを満たす標準規格の番号"""
+        return [s['number'] for s in compile_query(query).filter(self.standards)]
+    
+    def test_parse_precedence(self):
+        """AND が OR より優先されるテスト"""
+        tree = parse_query('status = a OR type = b AND NOT directive = c')
+        
+        assert tree[0] == 'or'
+        assert tree[1][0] == ('cmp', 'status', FilterOperator.EQUALS, 'a')
+        assert tree[1][1][0] == 'and'
+        assert tree[1][1][1][1] == ('not', ('cmp', 'directive', FilterOperator.EQUALS, 'c'))
+    
+    def test_boolean_operators(self):
+        """AND/OR/NOTと括弧のテスト"""
+        assert self.numbers('status = active AND type = EN') == ['EN 301 489-17:2017']
+        assert self.numbers('type = IEC OR status = withdrawn') == ['EN 300 328:2019', 'IEC 62368-1:2014']
+        assert self.numbers('NOT (type = IEC OR status = withdrawn)') == ['EN 301 489-17:2017']
+        assert self.numbers('status != Active') == ['EN 300 328:2019']
+    
+    def test_null_comparison(self):
+        """= null / != null が値の有無で判定されるテスト"""
+        assert self.numbers('directive = null') == ['EN 300 328:2019']
+        assert self.numbers('directive != null') == ['EN 301 489-17:2017', 'IEC 62368-1:2014']
+        assert self.numbers('etsi_info.versions = null') == ['IEC 62368-1:2014']
+        assert parse_query('directive != null') == ('cmp', 'directive', FilterOperator.NOT_IN, [None])
+        # 引用符付きの "null" は文字列として比較
+        assert self.numbers('directive = "null"') == []
+    
+    @pytest.mark.parametrize("query,expected", [
+        ('directive contains red', ['EN 301 489-17:2017']),
+        ('number starts_with "EN 30"', ['EN 301 489-17:2017', 'EN 300 328:2019']),
+        ('number ends_with :2014', ['IEC 62368-1:2014']),
+        ('extracted_at > 2024-01-01', ['EN 301 489-17:2017', 'IEC 62368-1:2014']),
+        ('extracted_at < 2024-01-01', ['EN 300 328:2019']),
+        ('extracted_at between ["2024-01-01", "2024-02-01"]', ['IEC 62368-1:2014']),
+        ('type in [IEC, ISO]', ['IEC 62368-1:2014']),
+        ('directive in [null]', ['EN 300 328:2019']),
+        ('status not_in [Active]', ['EN 300 328:2019']),
+        ('number ~ "489-\\\\d+"', ['EN 301 489-17:2017']),
+        ('number REGEX "^IEC"', ['IEC 62368-1:2014']),
+    ])
+    def test_operators(self, query, expected):
+        """全ての演算子のテスト"""
+        assert self.numbers(query) == expected
+    
+    def test_regex_escapes_in_strings(self):
+        """引用符付き文字列で正規表現のエスケープが保たれるテスト"""
+        assert tokenize(r'number ~ "301\s489"')[-1][1] == r'301\s489'
+        assert self.numbers(r'number ~ "301\s489-\d+"') == ['EN 301 489-17:2017']
+        assert self.numbers(r"number ~ '^IEC\s\d+'") == ['IEC 62368-1:2014']
+        assert self.numbers(r'number ~ "\d{5}-1"') == ['IEC 62368-1:2014']
+        # バックスラッシュ自身と引用符はエスケープできる
+        assert tokenize(r'notes = "a\"b"')[-1][1] == 'a"b'
+        assert tokenize(r"notes = 'it\'s'")[-1][1] == "it's"
+        assert tokenize(r'notes = "a\\b"')[-1][1] == 'a\\b'
+    
+    def test_nested_path_any(self):
+        """ネストしたパスはいずれかの値が一致すれば真となるテスト"""
+        assert self.numbers('etsi_info.versions.status = draft') == ['EN 301 489-17:2017']
+        assert self.numbers('etsi_info.status = withdrawn') == ['EN 300 328:2019']
+        # 値がない場合は None として評価
+        assert self.numbers('etsi_info.versions.identification in [null]') == ['IEC 62368-1:2014']
+        assert self.numbers('NOT etsi_info.versions.status = published') == ['EN 300 328:2019', 'IEC 62368-1:2014']
+    
+    def test_resolve_path(self):
+        """ネストしたパスの値の展開テスト"""
+        assert resolve_path(self.standards[0], ('etsi_info', 'versions', 'identification')) == ['V3.2.4', 'V3.3.0']
+        assert resolve_path(self.standards[2], ('etsi_info', 'versions')) == []
+    
+    def test_conjunction_conditions(self):
+        """比較のANDだけのクエリが条件リストに変換されるテスト"""
+        conditions = compile_query('status = Active AND type in [EN]').conditions
+        
+        assert [(c['field'], c['operator']) for c in conditions] == [
+            ('status', FilterOperator.EQUALS), ('type', FilterOperator.IN)
+        ]
+        assert compile_query('status = Active OR type = EN').conditions is None
+        assert compile_query('etsi_info.status = Published').conditions is None
+    
+    def test_compile_cache(self):
+        """同じクエリ文字列はコンパイル結果が再利用されるテスト"""
+        assert compile_query('type = EN') is compile_query('type = EN')
+    
+    @pytest.mark.parametrize("query", [
+        '',
+        'status',
+        'status =',
+        'unknown = 1',
+        'status = a b',
+        '(status = a',
+        'status in Active',
+        'extracted_at between [2024]',
+        'status = a AND',
+        'status like a',
+        'status = "unterminated',
+    ])
+    def test_syntax_errors(self, query):
+        """構文エラーのテスト"""
+        with pytest.raises(QuerySyntaxError):
+            parse_query(query)
+    
+    def test_depth_limit(self):
+        """入れ子の深さ制限のテスト"""
+        with pytest.raises(QuerySyntaxError):
+            parse_query('NOT ' * (MAX_QUERY_DEPTH + 1) + 'status = a')
+        
+        assert parse_query('NOT ' * MAX_QUERY_DEPTH + 'status = a')[0] == 'not'
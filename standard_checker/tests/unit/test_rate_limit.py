@@ -0,0 +1,136 @@
+"""
+レート制限と並行一括検索の単体テスト
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from pathlib import Path
+import sys
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.etsi_crawler.rate_limit import HostRateLimiter, TokenBucket
+from modules.etsi_crawler.query import ETSICrawler
+
+class FakeClock:
+    """テスト用の時計"""
+    
+    def __init__(self):
+        self.now = 100.0
+    
+    def __call__(self):
+        return self.now
+
+class TestTokenBucket:
+    """トークンバケットのテスト"""
+    
+    def test_reserve_spacing(self):
+        """予約ごとの待ち時間のテスト"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, burst=1, clock=clock)
+        
+        # 同時の予約は1/rate秒ずつずれる
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == pytest.approx(0.5)
+        assert bucket.reserve() == pytest.approx(1.0)
+        
+        # 予約分の時間が経てば待たずに取得できる
+        clock.now += 1.5
+        assert bucket.reserve() == 0.0
+    
+    def test_burst(self):
+        """連続して取得できる数のテスト"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, burst=3, clock=clock)
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.reserve() == pytest.approx(1.0)
+        
+        # 長く空いてもburstを超えては貯まらない
+        clock.now += 100
+        assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.reserve() > 0
+    
+    def test_unlimited(self):
+        """レート0は制限なしのテスト"""
+        bucket = TokenBucket(rate=0)
+        assert all(bucket.acquire() == 0.0 for _ in range(100))
+    
+    def test_concurrent_rate(self):
+        """複数スレッドからの取得が全体のレートを超えないことのテスト"""
+        bucket = TokenBucket(rate=50.0, burst=1)
+        times = []
+        lock = threading.Lock()
+        
+        def worker():
+            for _ in range(5):
+                bucket.acquire()
+                with lock:
+                    times.append(time.monotonic())
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # 20回の取得には少なくとも19/rate秒かかる
+        times.sort()
+        assert times[-1] - times[0] >= 19 / 50.0 * 0.9
+
+class TestHostRateLimiter:
+    """ホストごとのレート制限のテスト"""
+    
+    def test_bucket_per_host(self):
+        """ホストごとのバケットのテスト"""
+        limiter = HostRateLimiter(rate=1.0)
+        bucket = limiter.bucket('https://portal.etsi.org/a')
+        assert limiter.bucket('https://PORTAL.etsi.org/b?x=1') is bucket
+        assert limiter.bucket('https://www.etsi.org/') is not bucket
+
+class TestConcurrentBatch:
+    """並行一括検索のテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.crawler = ETSICrawler(use_selenium=False, rate_limiter=HostRateLimiter(rate=0))
+        self.threads = set()
+        
+        def fake_search(standard_number):
+            self.threads.add(threading.get_ident())
+            time.sleep(0.05)
+            return {'standard_number': standard_number, 'status': 'Success', 'versions': []}
+        
+        self.crawler._search_with_requests = fake_search
+        self.numbers = [f"301 489-{i}" for i in range(1, 13)]
+    
+    def test_batch_preserves_order(self):
+        """並行検索の結果が入力順に並ぶことのテスト"""
+        start = time.monotonic()
+        results = self.crawler.batch_search_standards(self.numbers, workers=4)
+        elapsed = time.monotonic() - start
+        
+        assert [r['standard_number'] for r in results] == self.numbers
+        assert len(self.threads) > 1
+        # 逐次なら0.6秒かかる
+        assert elapsed < 0.45
+    
+    def test_iter_batch_results(self):
+        """完了順に結果を返す非同期イテレータのテスト"""
+        async def collect():
+            return [item async for item in self.crawler.iter_batch_results(self.numbers, workers=4)]
+        
+        items = asyncio.run(collect())
+        assert sorted(index for index, _, _ in items) == list(range(len(self.numbers)))
+        for index, number, result in items:
+            assert self.numbers[index] == number == result['standard_number']
+    
+    def test_selenium_is_sequential(self):
+        """Selenium使用時は並行しないことのテスト"""
+        crawler = ETSICrawler(use_selenium=True)
+        assert crawler._batch_workers(8) == 1
+        assert self.crawler._batch_workers(8) == 8
+        assert self.crawler._batch_workers(0) == 1
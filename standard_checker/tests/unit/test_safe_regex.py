@@ -0,0 +1,125 @@
+"""
+安全な正規表現モジュールの単体テスト
+"""
+
+import re
+import pytest
+from pathlib import Path
+import sys
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.filter.filter import StandardFilter, FilterOperator
+from modules.filter.query import compile_query, QuerySyntaxError
+from modules.filter.safe_regex import (
+    compile_guarded, validate_pattern, regex_budget,
+    UnsafePatternError, RegexBudgetExceeded, MAX_PATTERN_LENGTH, MAX_SUBJECT_LENGTH
+)
+from modules.pdf_parser.parser import PDFParser, DEFAULT_STANDARD_PATTERNS
+
+class TestSafeRegex:
+    """正規表現の検証・時間予算のテスト"""
+    
+    @pytest.mark.parametrize('pattern', [
+        r'(a+)+$',
+        r'(a*)*$',
+        r'(a|aa)+$',
+        r'(a|ab)*c',
+        r'^(\w+\s?)*$',
+        r'(x+x+)+y',
+        r'([a-z]x?)+',
+        r'(a)\1',
+        r'a{5000}',
+        r'.*.*.*.*.*.*Z',
+        r'\d*\d*\d*\d*\d*x',
+        r'(.*)(.*)Z',
+        r'\d+\s*\d+',
+        r'EN.*489.*2017',
+    ])
+    def test_unsafe_patterns_rejected(self, pattern):
+        """指数的なバックトラックを起こしうるパターンの拒否テスト"""
+        with pytest.raises(UnsafePatternError):
+            validate_pattern(pattern, re.IGNORECASE)
+    
+    @pytest.mark.parametrize('pattern', DEFAULT_STANDARD_PATTERNS + [
+        r'EN\s+\d+',
+        r'^EN 30[01]',
+        r'(?:ETSI|CEN)\s+EN',
+        r'(ab)+c',
+        r'\d{4}-\d{2}',
+        r'(a++)+$',
+        r'\d+-\d+',
+        r'489-\d+',
+        r'\d+\s+\d+',
+        r'EN.*2017',
+        r'\w+@\w+',
+    ])
+    def test_safe_patterns_accepted(self, pattern):
+        """通常のパターンの受理テスト"""
+        validate_pattern(pattern, re.IGNORECASE)
+    
+    def test_pattern_too_long(self):
+        """長すぎるパターンの拒否テスト"""
+        with pytest.raises(UnsafePatternError):
+            validate_pattern('a' * (MAX_PATTERN_LENGTH + 1))
+    
+    def test_syntax_error(self):
+        """構文エラーはre.errorのまま送出されることのテスト"""
+        with pytest.raises(re.error):
+            validate_pattern('(')
+    
+    def test_compile_guarded_cached(self):
+        """コンパイル結果のキャッシュテスト"""
+        assert compile_guarded(r'EN\s+\d+', re.IGNORECASE) is compile_guarded(r'EN\s+\d+', re.IGNORECASE)
+        assert compile_guarded(r'en\s+\d+', re.IGNORECASE).search('EN 301 489')
+    
+    def test_budget_exceeded(self):
+        """時間予算を超えた場合のテスト"""
+        pattern = compile_guarded('EN')
+        with regex_budget(0):
+            with pytest.raises(RegexBudgetExceeded):
+                pattern.search('EN 301 489')
+        # ブロックの外では予算なし
+        assert pattern.search('EN 301 489')
+    
+    def test_finditer_budget_exceeded(self):
+        """finditerも時間予算を確認するテスト"""
+        pattern = compile_guarded('EN')
+        with regex_budget(0):
+            with pytest.raises(RegexBudgetExceeded):
+                list(pattern.finditer('EN 301 489, EN 300 328'))
+        assert len(list(pattern.finditer('EN 301 489, EN 300 328'))) == 2
+    
+    def test_search_subject_length_capped(self):
+        """searchは先頭MAX_SUBJECT_LENGTH文字だけを照合するテスト"""
+        pattern = compile_guarded('EN')
+        assert pattern.search('x' * (MAX_SUBJECT_LENGTH - 2) + 'EN')
+        assert pattern.search('x' * MAX_SUBJECT_LENGTH + 'EN') is None
+    
+    def test_filter_rejects_unsafe_pattern(self):
+        """フィルターでの危険なパターンの拒否テスト"""
+        standard_filter = StandardFilter()
+        standard_filter.add_filter('number', FilterOperator.REGEX, r'(\d+\s?)+$')
+        with pytest.raises(UnsafePatternError):
+            standard_filter.apply_filters([{'number': 'EN 301 489'}])
+    
+    def test_filter_budget_exceeded(self):
+        """フィルターの評価が時間予算を超えた場合のテスト"""
+        standard_filter = StandardFilter()
+        standard_filter.add_filter('number', FilterOperator.REGEX, r'EN')
+        with regex_budget(0):
+            with pytest.raises(RegexBudgetExceeded):
+                standard_filter.apply_filters([{'number': 'EN 301 489'}])
+    
+    def test_query_rejects_unsafe_pattern(self):
+        """クエリでの危険なパターンの構文エラーテスト"""
+        with pytest.raises(QuerySyntaxError):
+            compile_query('number ~ "(a|aa)+$"')
+    
+    def test_pdf_parser_rejects_unsafe_pattern(self):
+        """PDF解析の抽出パターンの検証テスト"""
+        assert PDFParser().standard_patterns == DEFAULT_STANDARD_PATTERNS
+        with pytest.raises(UnsafePatternError):
+            PDFParser(standard_patterns=[r'EN\s+(\d+\s?)+'])
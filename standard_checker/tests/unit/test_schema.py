@@ -0,0 +1,94 @@
+"""
+フィールドスキーマモジュールの単体テスト
+"""
+
+import pytest
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.standards import schema
+from modules.standards.schema import coerce_field, coerce_datetime, coerce_year
+from modules.standards.registry import StandardEntry, StandardRegistry
+
+class TestFieldSchema:
+    """フィールドスキーマのテスト"""
+    
+    @pytest.mark.parametrize("value,expected", [
+        ("2024-01-15", datetime(2024, 1, 15)),
+        ("2024-01-15T10:30:00.123456", datetime(2024, 1, 15, 10, 30, 0, 123456)),
+        ("2024-01-15T10:30:00+09:00", datetime(2024, 1, 15, 1, 30)),
+        ("2024-01-15T10:30:00Z", datetime(2024, 1, 15, 10, 30)),
+        ("01/15/2024", datetime(2024, 1, 15)),
+        ("15.01.2024", datetime(2024, 1, 15)),
+        ("not a date", None),
+    ])
+    def test_coerce_datetime(self, value, expected):
+        """日時変換テスト（タイムゾーン付きはUTCに換算して除去）"""
+        assert coerce_datetime(value) == expected
+    
+    def test_coerce_datetime_compares_offsets(self):
+        """異なるオフセットの日時がUTC基準で比較されるテスト"""
+        tokyo = coerce_datetime("2024-01-01T09:00+09:00")
+        utc = coerce_datetime("2024-01-01T09:00Z")
+        
+        assert tokyo == datetime(2024, 1, 1, 0, 0)
+        assert tokyo < utc
+        assert coerce_datetime("2024-01-01T00:00Z") == tokyo
+        assert coerce_datetime(datetime(2024, 1, 1, 9, tzinfo=timezone.utc)) == utc
+    
+    @pytest.mark.parametrize("value,expected", [
+        ("2017", 2017),
+        (2017, 2017),
+        (" 2017 ", 2017),
+        ("V3.2.4", None),
+        (True, None),
+    ])
+    def test_coerce_year(self, value, expected):
+        """西暦年変換テスト"""
+        assert coerce_year(value) == expected
+    
+    def test_coerce_field(self):
+        """スキーマ外のフィールドは変換しないテスト"""
+        assert coerce_field('version', '2019') == 2019
+        assert coerce_field('extracted_at', None) is None
+        assert coerce_field('status', 'Active') is None
+    
+    def test_entry_get_typed(self):
+        """StandardEntryの型付き参照テスト"""
+        entry = StandardEntry({'number': 'EN 300 328', 'version': '2019', 'extracted_at': '2024-01-15T10:30:00'})
+        
+        assert entry.get('number') == 'EN 300 328'
+        assert entry.get('unknown', 'x') == 'x'
+        assert entry.get_typed('version') == 2019
+        assert entry.get_typed('extracted_at') == datetime(2024, 1, 15, 10, 30)
+        
+        # 値を変更すると変換結果も追従する
+        entry.version = '2021'
+        assert entry.get_typed('version') == 2021
+    
+    def test_entry_holds_typed_values(self, monkeypatch):
+        """型変換は生成時に1回だけ行われ、エントリに保持されるテスト"""
+        entry = StandardEntry({'number': 'EN 300 328', 'version': '2019', 'extracted_at': '2024-01-15T10:30:00'})
+        
+        calls = []
+        monkeypatch.setitem(schema.COERCERS, 'datetime', lambda value: calls.append(value))
+        assert entry.get_typed('extracted_at') == datetime(2024, 1, 15, 10, 30)
+        assert calls == []
+    
+    def test_registry_refreshes_typed_values(self):
+        """レジストリの更新で保持している変換結果が更新されるテスト"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            registry = StandardRegistry(data_file=Path(temp_dir) / 'registry.json')
+            standard_id = registry.add_standard({'number': 'EN 300 328:2019', 'type': 'EN',
+                                                 'last_updated': '2024-01-01T00:00:00'})
+            entry = registry.get_standard(standard_id)
+            assert entry.get_typed('last_updated') == datetime(2024, 1, 1)
+            
+            registry.update_standard(standard_id, {'status': 'Withdrawn'})
+            assert entry.get_typed('last_updated') == datetime.fromisoformat(entry.last_updated)
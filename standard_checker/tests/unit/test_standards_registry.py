@@ -377,6 +377,431 @@ class TestStandardRegistry:
             stats_df = pd.read_excel(excel_path, sheet_name='Statistics')
             assert len(stats_df) > 0
 
+class TestStandardRegistryChangeFeed:
+    """StandardRegistryの変更フィードのテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_file = Path(self.temp_dir) / 'registry.json'
+        self.registry = StandardRegistry(data_file=self.data_file)
+    
+    def teardown_method(self):
+        """各テストメソッドの後に実行"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_sequence_increments_on_mutation(self):
+        """変更ごとにシーケンス番号が増加するテスト"""
+        assert self.registry.sequence == 0
+        
+        standard_id = self.registry.add_standard({'number': 'EN 301 489-17:2017', 'type': 'EN'})
+        self.registry.update_standard(standard_id, {'status': 'Withdrawn'})
+        self.registry.remove_standard(standard_id)
+        
+        assert self.registry.sequence == 3
+        ops = [c['op'] for c in self.registry.get_changes(0)['changes']]
+        assert ops == ['add', 'update', 'remove']
+        assert all(c['id'] == standard_id for c in self.registry.get_changes(0)['changes'])
+    
+    def test_get_changes_since(self):
+        """指定シーケンス以降の差分取得テスト"""
+        self.registry.add_standard({'number': 'EN 301 489-17:2017', 'type': 'EN'})
+        self.registry.add_standard({'number': 'IEC 62368-1:2014', 'type': 'IEC'})
+        
+        feed = self.registry.get_changes(1)
+        
+        assert feed['sequence'] == 2
+        assert feed['reset_required'] is False
+        assert [c['seq'] for c in feed['changes']] == [2]
+        
+        # 最新まで取得済みなら空
+        assert self.registry.get_changes(2)['changes'] == []
+    
+    def test_truncated_log_requires_reset(self):
+        """変更ログが切り詰められた場合のテスト"""
+        registry = StandardRegistry(data_file=self.data_file, change_log_limit=2)
+        for i in range(5):
+            registry.add_standard({'number': f'EN 300 {i:03d}:2020', 'type': 'EN'})
+        
+        assert registry.get_changes(0)['reset_required'] is True
+        assert registry.get_changes(3)['reset_required'] is False
+        assert registry.get_changes(10)['reset_required'] is True
+    
+    def test_change_log_persisted(self):
+        """シーケンスと変更ログの永続化テスト"""
+        self.registry.add_standard({'number': 'EN 301 489-17:2017', 'type': 'EN'})
+        self.registry.save_data()
+        etag = self.registry.get_etag()
+        
+        reloaded = StandardRegistry(data_file=self.data_file)
+        
+        assert reloaded.sequence == 1
+        assert reloaded.get_etag() == etag
+        assert len(reloaded.get_changes(0)['changes']) == 1
+        
+        reloaded.add_standard({'number': 'IEC 62368-1:2014', 'type': 'IEC'})
+        assert reloaded.get_etag() != etag
+    
+    def test_reload_does_not_duplicate_change_log(self):
+        """load_dataを繰り返しても変更ログが重複しないテスト"""
+        self.registry.add_standard({'number': 'EN 301 489-17:2017', 'type': 'EN'})
+        self.registry.save_data()
+        
+        self.registry.load_data()
+        self.registry.load_data()
+        
+        assert len(self.registry.change_log) == 1
+        assert len(self.registry.get_changes(0)['changes']) == 1
+    
+    def test_subscribe_notifies_changes(self):
+        """変更通知の購読テスト"""
+        events = []
+        listener = lambda operation, standard_id: events.append((operation, standard_id))
+        self.registry.subscribe(listener)
+        
+        standard_id = self.registry.add_standard({'number': 'EN 301 489-17:2017', 'type': 'EN'})
+        self.registry.update_standard(standard_id, {'status': 'Withdrawn'})
+        self.registry.load_data()
+        
+        assert events == [('add', standard_id), ('update', standard_id), ('reload', None)]
+        
+        # 購読解除後は通知されない
+        self.registry.unsubscribe(listener)
+        self.registry.remove_standard(standard_id)
+        assert len(events) == 3
+    
+    def test_listener_error_does_not_break_mutation(self):
+        """購読者の例外が変更処理に影響しないテスト"""
+        def failing_listener(operation, standard_id):
+            raise RuntimeError("listener failure")
+        
+        self.registry.subscribe(failing_listener)
+        standard_id = self.registry.add_standard({'number': 'EN 301 489-17:2017', 'type': 'EN'})
+        
+        assert self.registry.get_standard(standard_id) is not None
+
+class TestStandardRegistryHistory:
+    """ステータス履歴のテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_file = Path(self.temp_dir) / 'registry.json'
+        self.registry = StandardRegistry(data_file=self.data_file)
+    
+    def teardown_method(self):
+        """各テストメソッドの後に実行"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_update_records_transitions(self):
+        """更新時の遷移記録テスト"""
+        standard_id = self.registry.add_standard({'number': 'EN 301 489-17:2017', 'status': 'Active'})
+        self.registry.update_standard(standard_id, {
+            'etsi_info': {'status': 'Success', 'versions': [{'identification': 'V3.2.4', 'status': 'Published'}]}
+        })
+        self.registry.update_standard(standard_id, {'status': 'Withdrawn'})
+        
+        history = self.registry.get_status_history(standard_id)
+        transitions = [(h['field'], h['old'], h['new']) for h in history]
+        
+        assert ('status', None, 'Active') in transitions
+        assert ('etsi_status', None, 'Success') in transitions
+        assert ('etsi_version', None, 'V3.2.4') in transitions
+        assert ('status', 'Active', 'Withdrawn') in transitions
+    
+    def test_history_queries(self):
+        """期間検索・時点検索テスト"""
+        history = self.registry.history
+        history.record_snapshot('a', None, {'exists': True, 'etsi_status': 'Success'}, '2024-01-01T00:00:00')
+        history.record_snapshot('b', None, {'exists': True, 'etsi_status': 'Success'}, '2024-01-01T00:00:00')
+        history.record('a', 'etsi_status', 'Success', 'Error', '2024-02-01T00:00:00')
+        history.record('b', 'etsi_status', 'Success', 'No Results', '2024-03-01T00:00:00')
+        history.record_snapshot('b', {'exists': True}, None, '2024-04-01T00:00:00')
+        
+        assert history.standards_changed_between('2024-01-15', '2024-02-15', 'etsi_status') == ['a']
+        assert history.standards_changed_between('2024-01-15', '2024-12-31', 'etsi_status') == ['a', 'b']
+        
+        state = history.state_as_of('2024-02-15')
+        assert state['a']['etsi_status'] == 'Error'
+        assert state['b']['etsi_status'] == 'Success'
+        
+        # 登録前・削除後は含まれない
+        assert history.state_as_of('2023-12-31') == {}
+        assert 'b' not in history.state_as_of('2024-05-01')
+    
+    def test_history_persisted_append_only(self):
+        """履歴ファイルへの追記テスト"""
+        standard_id = self.registry.add_standard({'number': 'EN 301 489-17:2017', 'status': 'Active'})
+        self.registry.save_data()
+        self.registry.update_standard(standard_id, {'status': 'Withdrawn'})
+        self.registry.save_data()
+        
+        history_file = Path(self.temp_dir) / 'registry.history.jsonl'
+        lines = history_file.read_text(encoding='utf-8').splitlines()
+        assert len(lines) == 3  # exists, status, status
+        
+        reloaded = StandardRegistry(data_file=self.data_file)
+        changed = reloaded.get_changed_standards('2000-01-01', '2100-01-01', field='status')
+        assert len(changed) == 1
+        assert [t['new'] for t in changed[0]['transitions']] == ['Active', 'Withdrawn']
+        
+        state = reloaded.get_state_as_of('2100-01-01')
+        assert state[standard_id]['status'] == 'Withdrawn'
+
+class TestStandardRegistryMerge:
+    """レジストリマージのテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_path = Path(self.temp_dir)
+        self.registry = StandardRegistry(data_file=self.temp_path / 'local.json')
+        self.local_id = self.registry.add_standard({
+            'number': 'EN 301 489-17:2017', 'type': 'EN', 'number_part': '301 489-17',
+            'version': '2017', 'status': 'Active', 'last_updated': '2024-01-01T00:00:00'
+        })
+    
+    def teardown_method(self):
+        """各テストメソッドの後に実行"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _write_remote(self, standards):
+        remote_path = self.temp_path / 'remote.json'
+        with open(remote_path, 'w', encoding='utf-8') as f:
+            json.dump(standards, f)
+        return remote_path
+    
+    def test_merge_newest_wins(self):
+        """newestポリシーのテスト"""
+        remote_path = self._write_remote([
+            {'id': 'remote-1', 'number': 'EN 301 489-17:2017', 'type': 'EN', 'number_part': '301 489-17',
+             'version': '2017', 'status': 'Withdrawn', 'last_updated': '2024-06-01T00:00:00'},
+            {'id': 'remote-2', 'number': 'IEC 62368-1:2014', 'type': 'IEC', 'number_part': '62368-1',
+             'version': '2014', 'status': 'Active', 'last_updated': '2024-06-01T00:00:00'},
+            {'id': 'remote-3', 'status': 'Active'}
+        ])
+        
+        summary = self.registry.merge_from(remote_path, policy='newest')
+        
+        assert summary['rows'] == 3
+        assert summary['added'] == 1
+        assert summary['updated'] == 1
+        assert summary['invalid'] == 1
+        
+        # ローカルIDを維持したまま更新される
+        assert self.registry.get_standard(self.local_id).status == 'Withdrawn'
+        assert self.registry.get_standard('remote-2') is not None
+        assert 'remote-1' not in self.registry.standards
+    
+    def test_merge_keep_local(self):
+        """localポリシーのテスト"""
+        remote_path = self._write_remote([
+            {'number': 'EN 301 489-17:2017', 'type': 'EN', 'number_part': '301 489-17',
+             'version': '2017', 'status': 'Withdrawn', 'last_updated': '2024-06-01T00:00:00'}
+        ])
+        
+        summary = self.registry.merge_from(remote_path, policy='local')
+        
+        assert summary['kept_local'] == 1
+        assert self.registry.get_standard(self.local_id).status == 'Active'
+    
+    def test_merge_older_remote_kept_local(self):
+        """古いリモートデータは採用しないテスト"""
+        remote_path = self._write_remote([
+            {'number': 'EN 301 489-17:2017', 'type': 'EN', 'number_part': '301 489-17',
+             'version': '2017', 'status': 'Withdrawn', 'last_updated': '2023-01-01T00:00:00'}
+        ])
+        
+        summary = self.registry.merge_from(remote_path)
+        
+        assert summary['kept_local'] == 1
+        assert self.registry.get_standard(self.local_id).status == 'Active'
+    
+    def test_merge_csv_export_roundtrip(self):
+        """CSVエクスポートの再取り込みテスト"""
+        self.registry.update_standard(self.local_id, {'etsi_info': {'status': 'Success', 'versions': []}})
+        csv_path = self.temp_path / 'export.csv'
+        self.registry.export_to_csv(csv_path)
+        
+        other = StandardRegistry(data_file=self.temp_path / 'other.json')
+        summary = other.merge_from(csv_path)
+        
+        assert summary['added'] == 1
+        merged = other.get_standard(self.local_id)
+        assert merged.etsi_info == {'status': 'Success', 'versions': []}
+        assert merged.directive is None
+        
+        # 同じファイルを再度マージしても変化しない
+        summary = other.merge_from(csv_path)
+        assert summary['unchanged'] == 1
+    
+    def test_merge_dry_run_and_duplicates(self):
+        """ドライランと同一ファイル内重複のテスト"""
+        row = {'number': 'ISO 9001:2015', 'type': 'ISO', 'number_part': '9001', 'version': '2015'}
+        remote_path = self._write_remote([row, dict(row)])
+        
+        summary = self.registry.merge_from(remote_path, dry_run=True)
+        
+        assert summary['added'] == 1
+        assert summary['duplicate'] == 1
+        assert len(self.registry.standards) == 1
+    
+    def test_merge_invalid_policy(self):
+        """不正なポリシーのテスト"""
+        with pytest.raises(ValueError):
+            self.registry.merge_from(self._write_remote([]), policy='unknown')
+    
+    def test_add_dedupes_spelling_variants(self):
+        """表記揺れのある同一標準規格が重複登録されないテスト"""
+        first_id = self.registry.add_standard({'number': 'ETSI EN 301 489-17:2017', 'type': 'ETSI EN'})
+        second_id = self.registry.add_standard({
+            'number': 'EN 301 489-17:2017',
+            'type': 'EN',
+            'number_part': '301 489-17',
+            'version': '2017'
+        })
+        other_id = self.registry.add_standard({'number': 'EN 301 489-17:2019', 'type': 'EN'})
+        
+        assert first_id == second_id
+        assert other_id != first_id
+        assert len(self.registry.standards) == 2
+    
+    def test_dedupe_index_follows_removal(self):
+        """削除後に同じ標準規格を再登録できるテスト"""
+        first_id = self.registry.add_standard({'number': 'EN 300 328:2019', 'type': 'EN'})
+        self.registry.remove_standard(first_id)
+        
+        second_id = self.registry.add_standard({'number': 'EN 300 328:2019', 'type': 'EN'})
+        
+        assert second_id != first_id
+        assert self.registry.add_standard({'number': 'EN 300 328:2019', 'type': 'EN'}) == second_id
+    
+    def test_unparseable_number_dedupes_on_exact_number(self):
+        """番号を解釈できない標準規格は番号の完全一致で重複判定されるテスト"""
+        count = len(self.registry.standards)
+        first_id = self.registry.add_standard({'number': 'Custom Spec ABC', 'type': 'Other'})
+        second_id = self.registry.add_standard({'number': 'Custom Spec ABC', 'type': 'Other'})
+        other_id = self.registry.add_standard({'number': 'Custom Spec XYZ', 'type': 'Other'})
+        
+        assert first_id == second_id
+        assert other_id != first_id
+        assert len(self.registry.standards) == count + 2
+        
+        # 削除も索引に反映される
+        self.registry.remove_standard(first_id)
+        assert self.registry.add_standard({'number': 'Custom Spec ABC', 'type': 'Other'}) != first_id
+
+class TestStandardRegistryFieldIndex:
+    """StandardRegistryの副索引のテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.registry = StandardRegistry(data_file=Path(self.temp_dir) / 'registry.json')
+        self.ids = [
+            self.registry.add_standard({'number': 'EN 301 489-17:2017', 'type': 'EN', 'status': 'Active'}),
+            self.registry.add_standard({'number': 'EN 300 328:2019', 'type': 'EN', 'status': 'Withdrawn'}),
+            self.registry.add_standard({'number': 'IEC 62368-1:2014', 'type': 'IEC', 'status': 'Active'}),
+        ]
+    
+    def teardown_method(self):
+        """各テストメソッドの後に実行"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_field_index(self):
+        """フィールド値 -> IDの集合の索引テスト"""
+        index = self.registry.get_field_index('status')
+        
+        assert index == {'Active': {self.ids[0], self.ids[2]}, 'Withdrawn': {self.ids[1]}}
+        # 対象外のフィールドは索引を持たない
+        assert self.registry.get_field_index('number') is None
+    
+    def test_field_index_maintained(self):
+        """変更が構築済みの索引に反映されるテスト"""
+        index = self.registry.get_field_index('status')
+        
+        self.registry.update_standard(self.ids[1], {'status': 'Active'})
+        self.registry.remove_standard(self.ids[0])
+        new_id = self.registry.add_standard({'number': 'EN 300 440:2018', 'type': 'EN', 'status': 'Draft'})
+        
+        assert self.registry.get_field_index('status') == {
+            'Active': {self.ids[1], self.ids[2]}, 'Draft': {new_id}
+        }
+        assert self.registry.get_field_index('status') is index
+    
+    def test_unhashable_values(self):
+        """ハッシュ不可能な値を含む場合は索引を作らないテスト"""
+        self.registry.update_standard(self.ids[0], {'directive': ['RED', 'EMC']})
+        
+        assert self.registry.get_field_index('directive') is None
+        assert self.registry.get_field_index('status') is not None
+    
+    def test_entries_in_order(self):
+        """指定IDを自然順で取得するテスト"""
+        entries = self.registry.entries_in_order([self.ids[2], self.ids[0], 'missing', self.ids[1]])
+        
+        assert [e.number for e in entries] == ['EN 300 328:2019', 'EN 301 489-17:2017', 'IEC 62368-1:2014']
+
+class TestStandardRegistrySuggest:
+    """StandardRegistryの番号候補検索・自然順のテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.registry = StandardRegistry(data_file=Path(self.temp_dir) / 'registry.json')
+        for part in ['17', '3', '1']:
+            self.registry.add_standard({
+                'number': f'EN 301 489-{part}',
+                'type': 'EN',
+                'number_part': f'301 489-{part}'
+            })
+    
+    def teardown_method(self):
+        """各テストメソッドの後に実行"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_suggest_natural_order(self):
+        """候補が自然順で返されるテスト"""
+        numbers = [s['number'] for s in self.registry.suggest('301 489')]
+        
+        assert numbers == ['EN 301 489-1', 'EN 301 489-3', 'EN 301 489-17']
+        assert len(self.registry.suggest('ETSI EN 301 489', limit=2)) == 2
+    
+    def test_suggest_follows_mutations(self):
+        """追加・削除が索引に反映されるテスト"""
+        self.registry.suggest('301')
+        
+        new_id = self.registry.add_standard({'number': 'EN 301 489-52', 'type': 'EN', 'number_part': '301 489-52'})
+        assert [s['id'] for s in self.registry.suggest('301 489-5')] == [new_id]
+        
+        self.registry.remove_standard(new_id)
+        assert self.registry.suggest('301 489-5') == []
+    
+    def test_listing_natural_order(self):
+        """一覧・エクスポートが番号の自然順になるテスト"""
+        self.registry.add_standard({'number': 'EN 301 489-1:2017', 'type': 'EN', 'number_part': '301 489-1', 'version': '2017'})
+        
+        numbers = [s['number'] for s in self.registry.get_all_standards()]
+        assert numbers == ['EN 301 489-1', 'EN 301 489-1:2017', 'EN 301 489-3', 'EN 301 489-17']
+        assert [s['number'] for s in self.registry.iter_standards()] == numbers
+    
+    def test_sorted_order_follows_mutations(self):
+        """変更後も並び順が維持されるテスト"""
+        self.registry.get_all_standards()
+        
+        new_id = self.registry.add_standard({'number': 'EN 301 489-10', 'type': 'EN', 'number_part': '301 489-10'})
+        first_id = self.registry.get_all_standards()[0]['id']
+        self.registry.remove_standard(first_id)
+        
+        numbers = [s['number'] for s in self.registry.get_all_standards()]
+        assert numbers == ['EN 301 489-3', 'EN 301 489-10', 'EN 301 489-17']
+        assert new_id in [s['id'] for s in self.registry.get_all_standards()]
+
 class TestStandardRegistryEdgeCases:
     """StandardRegistryのエッジケーステスト"""
     
@@ -416,7 +841,7 @@ class TestStandardRegistryEdgeCases:
             assert entry.number == 'EN 123:2020'
             assert entry.type == ''  # デフォルト値
             assert entry.status == 'Unknown'  # デフォルト値
-            
+        
         finally:
             Path(temp_file.name).unlink()
     
@@ -432,6 +857,6 @@ class TestStandardRegistryEdgeCases:
             # 存在しないフィールドで検索
             result = registry.search_standards(non_existent_field='value')
             assert len(result) == 0
-            
+        
         finally:
             Path(temp_file.name).unlink()
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""
+トライグラム索引の単体テスト
+"""
+
+import pytest
+import tempfile
+from pathlib import Path
+import sys
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.standards.trigram_index import TrigramIndex, entry_titles, number_trigrams, title_words
+from modules.standards.registry import StandardRegistry
+
+class TestTrigramIndex:
+    """トライグラム索引のテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.index = TrigramIndex()
+        self.index.add('a', 'EN 301 489-17:2017', ['Broadband data transmission systems'])
+        self.index.add('b', 'EN 301 489-1:2019', ['Common technical requirements'])
+        self.index.add('c', 'EN 300 328:2019', ['Wideband transmission systems'])
+        self.index.add('d', 'IEC 62368-1:2014')
+    
+    def ids(self, query, **kwargs):
+        """検索結果のIDリスト"""
+        return [entry_id for entry_id, _ in self.index.search(query, **kwargs)]
+    
+    def test_number_trigrams_ignore_separators(self):
+        """区切り文字の違いを無視することのテスト"""
+        assert number_trigrams('EN 301 489-17') == number_trigrams('en301489 17')
+        assert number_trigrams('ＥＮ３０１') == number_trigrams('EN 301')
+        assert number_trigrams('') == frozenset()
+    
+    def test_title_words(self):
+        """タイトルの単語分割テスト"""
+        assert title_words('Broadband data_transmission; Part 1') == {'broadband', 'data', 'transmission', 'part', '1'}
+        assert title_words(None) == frozenset()
+    
+    def test_entry_titles(self):
+        """ETSI情報からのタイトル取得テスト"""
+        etsi_info = {'versions': [{'title': 'A'}, {'version': 'V1'}, 'invalid'], 'title': 'B'}
+        assert entry_titles(etsi_info) == ['A', 'B']
+        assert entry_titles(None) == []
+    
+    def test_number_search(self):
+        """区切りの異なる番号の検索テスト"""
+        assert self.ids('489 17')[0] == 'a'
+        assert set(self.ids('EN301489')) >= {'a', 'b'}
+        assert self.ids('62368')[0] == 'd'
+        
+        # 完全一致は得点1.0
+        assert self.index.search('EN 301 489-17:2017')[0] == ('a', 1.0)
+    
+    def test_ties_prefer_shorter_numbers(self):
+        """同点では短い番号を上位にすることのテスト"""
+        results = self.index.search('EN301489')
+        assert results[0][1] == results[1][1]
+        assert self.ids('EN301489')[:2] == ['b', 'a']
+    
+    def test_title_search(self):
+        """タイトルのあいまい検索テスト"""
+        assert self.ids('broadband data transmission')[0] == 'a'
+        # 綴りの誤りを許容する
+        assert self.ids('brodband transmision')[0] == 'a'
+        assert set(self.ids('transmission systems')) == {'a', 'c'}
+        
+        # タイトルの一致は同じ割合の番号の一致より下位
+        entry_id, score = self.index.search('broadband data transmission')[0]
+        assert score < 1.0
+    
+    def test_no_match(self):
+        """一致しないクエリのテスト"""
+        assert self.index.search('zzzz qqqq') == []
+        assert self.index.search('') == []
+    
+    def test_limit(self):
+        """件数の上限テスト"""
+        assert len(self.index.search('EN', limit=1)) <= 1
+        assert self.index.search('EN 301', limit=0) == []
+    
+    def test_add_replace_remove(self):
+        """追加・置き換え・削除のテスト"""
+        self.index.add('a', 'CISPR 32:2015', ['Multimedia equipment'])
+        assert 'a' not in self.ids('489 17')
+        assert self.ids('CISPR 32')[0] == 'a'
+        assert self.ids('multimedia')[0] == 'a'
+        
+        assert self.index.remove('a') is True
+        assert self.index.remove('a') is False
+        assert self.ids('CISPR 32') == []
+        assert len(self.index) == 3
+        
+        # 削除した単語は語彙からも除かれる
+        assert 'multimedia' not in self.index._words
+        assert all('multimedia' not in words for words in self.index._vocabulary.values())
+
+
+class TestRegistryFuzzySearch:
+    """レジストリのあいまい検索のテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.registry = StandardRegistry(data_file=Path(self.temp_dir.name) / 'registry.json')
+        
+        self.id_489 = self.registry.add_standard({
+            'number': 'EN 301 489-17:2017', 'type': 'EN', 'number_part': '301 489-17', 'version': '2017',
+            'etsi_info': {'versions': [{'version': 'V3.2.4', 'title': 'Broadband data transmission systems'}]},
+        })
+        self.id_328 = self.registry.add_standard({
+            'number': 'EN 300 328:2019', 'type': 'EN', 'number_part': '300 328', 'version': '2019',
+        })
+    
+    def teardown_method(self):
+        """各テストメソッドの後に実行"""
+        self.temp_dir.cleanup()
+    
+    def test_fuzzy_search(self):
+        """あいまい検索の結果テスト"""
+        results = self.registry.fuzzy_search('489 17')
+        assert results[0]['id'] == self.id_489
+        assert results[0]['number'] == 'EN 301 489-17:2017'
+        assert 0 < results[0]['score'] <= 1.0
+        
+        assert self.registry.fuzzy_search('broadband')[0]['id'] == self.id_489
+    
+    def test_incremental_updates(self):
+        """構築後の追加・更新・削除の反映テスト"""
+        assert self.registry.fuzzy_search('300328')[0]['id'] == self.id_328
+        
+        self.registry.update_standard(self.id_328, {
+            'etsi_info': {'versions': [{'version': 'V2.2.2', 'title': 'Wideband transmission systems'}]},
+        })
+        assert self.registry.fuzzy_search('wideband')[0]['id'] == self.id_328
+        
+        new_id = self.registry.add_standard({'number': 'CISPR 32:2015', 'type': 'CISPR', 'number_part': '32'})
+        assert self.registry.fuzzy_search('CISPR32')[0]['id'] == new_id
+        
+        self.registry.remove_standard(self.id_489)
+        assert all(result['id'] != self.id_489 for result in self.registry.fuzzy_search('489 17'))
@@ -0,0 +1,133 @@
+"""
+保存フィルタービューモジュールの単体テスト
+"""
+
+import pytest
+import tempfile
+from pathlib import Path
+import sys
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.filter.filter import StandardFilter
+from modules.filter.query import QuerySyntaxError, compile_query
+from modules.standards.registry import StandardRegistry
+
+class TestViewManager:
+    """ViewManagerクラスのテスト"""
+    
+    def setup_method(self):
+        """各テストメソッドの前に実行"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_file = Path(self.temp_dir.name) / 'registry.json'
+        self.registry = StandardRegistry(data_file=self.data_file)
+        
+        self.ids = {}
+        for standard in [
+            {'number': 'EN 301 489-17:2017', 'type': 'EN', 'number_part': '301 489-17', 'version': '2017',
+             'status': 'Active', 'directive': 'RED 2014/53/EU'},
+            {'number': 'EN 300 328:2019', 'type': 'EN', 'number_part': '300 328', 'version': '2019',
+             'status': 'Withdrawn', 'directive': 'RED 2014/53/EU'},
+            {'number': 'CISPR 32:2015', 'type': 'CISPR', 'number_part': '32', 'version': '2015',
+             'status': 'Active', 'directive': 'EMC 2014/30/EU'},
+        ]:
+            self.ids[standard['number']] = self.registry.add_standard(standard)
+        
+        self.views = self.registry.get_view_manager()
+    
+    def teardown_method(self):
+        """各テストメソッドの後に実行"""
+        self.temp_dir.cleanup()
+    
+    def numbers(self, name):
+        """ビューの標準規格の番号"""
+        return [s['number'] for s in self.views.contents(name)]
+    
+    def expected(self, filters=None, query=None):
+        """全件を評価した場合の番号（自然順）"""
+        standards = StandardFilter().apply_filters(self.registry.get_all_standards(), **(filters or {}))
+        if query:
+            standards = compile_query(query).filter(standards)
+        return [s['number'] for s in standards]
+    
+    def test_define_view(self):
+        """ビュー定義テスト"""
+        view = self.views.define('red-active', {'directive': 'RED', 'status': 'Active'})
+        
+        assert len(view) == 1
+        assert self.views.count('red-active') == 1
+        assert self.numbers('red-active') == ['EN 301 489-17:2017']
+    
+    def test_define_view_with_query(self):
+        """クエリ言語の条件を持つビューのテスト"""
+        self.views.define('cispr-no-etsi', query='type = CISPR AND etsi_info in [null]')
+        assert self.numbers('cispr-no-etsi') == ['CISPR 32:2015']
+    
+    def test_incremental_updates(self):
+        """追加・更新・削除の差分反映テスト"""
+        self.views.define('red-active', {'directive': 'RED', 'status': 'Active'})
+        self.views.define('active', query='status = Active')
+        
+        self.registry.add_standard({'number': 'EN 301 489-1:2019', 'type': 'EN', 'number_part': '301 489-1',
+                                    'version': '2019', 'status': 'Active', 'directive': 'RED 2014/53/EU'})
+        self.registry.update_standard(self.ids['EN 300 328:2019'], {'status': 'Active'})
+        self.registry.update_standard(self.ids['CISPR 32:2015'], {'status': 'Withdrawn'})
+        self.registry.remove_standard(self.ids['EN 301 489-17:2017'])
+        
+        assert self.numbers('red-active') == self.expected({'directive': 'RED', 'status': 'Active'})
+        assert self.numbers('red-active') == ['EN 300 328:2019', 'EN 301 489-1:2019']
+        assert self.numbers('active') == self.expected(query='status = Active')
+    
+    def test_contents_cached(self):
+        """内容のキャッシュと、該当しない変更では破棄されないことのテスト"""
+        view = self.views.define('active', {'status': 'Active'})
+        contents = view.entries(self.registry)
+        assert view.entries(self.registry) is contents
+        
+        self.registry.update_standard(self.ids['EN 300 328:2019'], {'notes': 'unrelated'})
+        assert view.entries(self.registry) is contents
+        
+        self.registry.update_standard(self.ids['CISPR 32:2015'], {'notes': 'member'})
+        assert view.entries(self.registry) is not contents
+    
+    def test_views_persisted(self):
+        """ビュー定義の保存・読み込みテスト"""
+        self.views.define('active', {'status': 'Active'})
+        self.views.define('red', query='directive contains RED')
+        self.registry.save_data()
+        
+        reopened = StandardRegistry(data_file=self.data_file).get_view_manager()
+        assert [v['name'] for v in reopened.list_views()] == ['active', 'red']
+        assert reopened.count('active') == 2
+        assert reopened.count('red') == 2
+    
+    def test_reload_rebuilds_views(self):
+        """再読み込み後の再構築テスト"""
+        self.views.define('active', {'status': 'Active'})
+        self.registry.save_data()
+        
+        self.registry.standards.clear()
+        self.registry.load_data()
+        assert self.views.count('active') == 2
+    
+    def test_remove_view(self):
+        """ビュー削除テスト"""
+        self.views.define('active', {'status': 'Active'})
+        assert self.views.remove('active')
+        assert not self.views.remove('active')
+        assert self.views.get('active') is None
+        assert self.views.contents('active') is None
+    
+    def test_invalid_definitions(self):
+        """不正なビュー定義のテスト"""
+        with pytest.raises(ValueError):
+            self.views.define('', {'status': 'Active'})
+        with pytest.raises(ValueError):
+            self.views.define('empty', {})
+        with pytest.raises(ValueError):
+            self.views.define('unknown', {'colour': 'red'})
+        with pytest.raises(QuerySyntaxError):
+            self.views.define('broken', query='status =')
+        assert self.views.list_views() == []